@@ -1,12 +1,12 @@
 # batting_information(daily_mobile).py
 
+from functools import partial
+
 import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
-import requests
-import io
-import gdown
-#from pybaseball import statcast_batter
+
+from dashboard import cache, export, queries, search, store
+from dashboard.seasons import DEFAULT_SEASON
 
 st.set_page_config(layout="wide")
 
@@ -14,64 +14,72 @@ st.set_page_config(layout="wide")
 # 데이터 로드 함수
 # -----------------------------
 
-#import os
-
-@st.cache_data
-def load_data_from_drive():
-    url = 'https://drive.google.com/uc?id=1vZB9axWHpzUB5ixNG9Q3JtxTxQsCDMD4'
-    output = 'data.csv'
-    gdown.download(url, output, quiet=False)
-    df = pd.read_csv(output)
-    df = df[df['game_type'] == 'R']
-    df['game_date'] = pd.to_datetime(df['game_date'])
-    df = df.set_index('game_date').sort_index()
-    return df
-
-
-@st.cache_data
-def load_batter_id():
-    batter_ID = pd.read_excel('Batter_ID(2025).xlsx')
-    return batter_ID
+@cache.memoize('stores', maxsize=2)
+def load_store(season, version):
+    # version: 적재된 시즌의 내용 버전. 다시 적재되어 내용이 바뀐 시즌만 새로 연다
+    return store.PitchStore.open(store.DATA_DIR, season)
 
-#@st.cache_data
-#def load_pitcher_id():
-    #pitcher_ID = pd.read_excel('Pitcher_ID(2025).xlsx')
-    #return pitcher_ID
+@cache.memoize('divisions', maxsize=4)
+def load_divisions(season):
+    return store.load_divisions(store.DATA_DIR, season)
 
 # -----------------------------
 # 데이터 불러오기
 # -----------------------------
-df = load_data_from_drive()
-batter_ID = load_batter_id()
-#pitcher_ID = load_pitcher_id()
+season_options = store.selectable_seasons()
+selected_season = st.selectbox(
+    'Season', season_options, index=season_options.index(DEFAULT_SEASON) if DEFAULT_SEASON in season_options else len(season_options) - 1,
+    label_visibility='collapsed'
+)
 
-df = pd.merge(df, batter_ID, on='batter', how='left')
+pitch_store = load_store(selected_season, store.ensure_season(selected_season))
+divisions = load_divisions(selected_season)
 
-if df.empty:
+if pitch_store.df.empty:
     st.error("❌ 데이터셋이 비어있습니다. Google Drive 파일 ID나 파일 내용을 확인하세요.")
     st.stop()
 
 # -----------------------------
 # 대시보드 UI
 # -----------------------------
-st.title("⚾ MLB 2025 - Daily Batting Info")
+st.title(f"⚾ MLB {selected_season} - Daily Batting Info")
 st.caption("🧑🏻‍💻 Kyengwook | 📬 kyengwook8@naver.com | [GitHub](https://github.com/kyengwook/kyengwook) | [Instagram](https://instagram.com/kyengwook)")
-st.caption("📊 Data: [Baseball Savant](https://baseballsavant.mlb.com/) – MLB 2025 Regular Season")
+st.caption(f"📊 Data: [Baseball Savant](https://baseballsavant.mlb.com/) – MLB {selected_season} Regular Season")
 
 # -----------------------------
-# Division 선택
+# 🔍 선수 검색 (Division -> Team -> 선수 단계를 건너뛰고 바로 이동)
 # -----------------------------
-divisions = {
-    'NL East': ['PHI', 'NYM', 'MIA', 'WSH', 'ATL'],
-    'NL Central': ['CHC', 'MIL', 'STL', 'CIN', 'PIT'],
-    'NL West': ['LAD', 'SD', 'SF', 'AZ', 'COL'],
-    'AL East': ['NYY', 'BOS', 'TOR', 'TB', 'BAL'],
-    'AL Central': ['DET', 'KC', 'CLE', 'MIN', 'CWS'],
-    'AL West': ['TEX', 'LAA', 'HOU', 'ATH', 'SEA']
-}
 
+@cache.memoize('player_index', maxsize=2)
+def load_player_index(season, version):
+    return search.build_index(store.DATA_DIR, season, pitch_store.df)
+
+def jump_to_player(results):
+    pick = st.session_state['search_pick']
+    if pick is None:
+        return
+    result = results[pick]
+    st.session_state['division'] = search.division_of(divisions, result['team'])
+    st.session_state['team'] = result['team']
+    st.session_state['batter'] = result['player_name']
+
+search_query = st.text_input('Search', placeholder='🔍 선수 검색 (이름 또는 MLBAM ID)', label_visibility='collapsed')
+if search_query:
+    search_results = load_player_index(selected_season, pitch_store.version).search(search_query, role='batter')
+    if search_results:
+        st.selectbox(
+            'Results', [None] + list(range(len(search_results))), key='search_pick',
+            format_func=lambda i: '— Select Player —' if i is None else search.result_label(search_results[i]),
+            on_change=jump_to_player, args=(search_results,), label_visibility='collapsed',
+        )
+    else:
+        st.caption('검색 결과가 없습니다.')
+
+# -----------------------------
+# Division 선택
+# -----------------------------
 div_options = ['— Select Division —'] + list(divisions.keys())
-selected_division = st.selectbox('Division', div_options, label_visibility='collapsed')
+selected_division = st.selectbox('Division', div_options, key='division', label_visibility='collapsed')
 
 if selected_division == '— Select Division —':
     st.info('ℹ️ Division을 먼저 선택해주세요.')
@@ -82,7 +90,7 @@ if selected_division == '— Select Division —':
 # -----------------------------
 selected_teams = divisions[selected_division]
 team_options = ['— Select Team —'] + selected_teams
-selected_team = st.selectbox('Team', team_options, label_visibility='collapsed')
+selected_team = st.selectbox('Team', team_options, key='team', label_visibility='collapsed')
 
 if selected_team == '— Select Team —':
     st.info('ℹ️ 팀을 먼저 선택해주세요.')
@@ -91,42 +99,33 @@ if selected_team == '— Select Team —':
 # -----------------------------
 # 팀 소속 선수 필터링
 # -----------------------------
-team_df = df[
-    ((df['home_team'] == selected_team) & (df['inning_topbot'] == 'Bot')) |
-    ((df['away_team'] == selected_team) & (df['inning_topbot'] == 'Top'))
-]
+batters_df = queries.team_batters(pitch_store, selected_team)
 
-if team_df.empty:
+if batters_df.empty:
     st.warning(f"⚠️ {selected_team} 팀 데이터가 없습니다.")
     st.stop()
 
 # -----------------------------
 # 선수 선택
 # -----------------------------
-player_options = team_df['batter_name'].dropna().unique()
-player_options = ['— Select Batter —'] + sorted(player_options)
-selected_player = st.selectbox('Batter', player_options, label_visibility='collapsed')
+player_options = ['— Select Batter —'] + batters_df['batter_name'].tolist()
+selected_player = st.selectbox('Batter', player_options, key='batter', label_visibility='collapsed')
 
 if selected_player == '— Select Batter —':
     st.info('ℹ️ 선수를 선택해주세요.')
     st.stop()
 
-filtered_player_df = team_df[team_df['batter_name'] == selected_player]
+batter_id = batters_df.loc[batters_df['batter_name'] == selected_player, 'batter'].iloc[0]
+games_df = queries.batter_games(pitch_store, batter_id, selected_team)
 
-if filtered_player_df.empty:
+if games_df.empty:
     st.warning(f"⚠️ {selected_player} 선수 데이터가 없습니다.")
     st.stop()
 
 # -----------------------------
-# 상대팀 정보 추가 및 날짜 선택
+# 날짜 선택
 # -----------------------------
-filtered_player_df['opponent_team'] = filtered_player_df.apply(
-    lambda row: row['away_team'] if row['home_team'] == selected_team else row['home_team'], axis=1
-)
-
-filtered_player_df['date_str'] = filtered_player_df['game_date'].dt.strftime('%Y-%m-%d') + ' ' + filtered_player_df['opponent_team']
-
-date_options = ['— Select Date —'] + sorted(filtered_player_df['date_str'].unique())
+date_options = ['— Select Date —'] + sorted(games_df['date_str'].unique())
 selected_date_str = st.selectbox('Date', date_options, label_visibility='collapsed')
 
 if selected_date_str == '— Select Date —':
@@ -135,7 +134,7 @@ if selected_date_str == '— Select Date —':
 
 selected_date = pd.to_datetime(selected_date_str.split(' ')[0])
 
-filtered_df = filtered_player_df[filtered_player_df['game_date'] == selected_date]
+filtered_df = queries.batter_game_pitches(pitch_store, batter_id, selected_date, selected_team)
 
 if filtered_df.empty:
     st.warning(f"⚠️ {selected_player}의 {selected_date.strftime('%Y-%m-%d')} 날짜 데이터가 없습니다.")
@@ -144,12 +143,10 @@ if filtered_df.empty:
 # -----------------------------
 # Statcast 데이터 불러오기
 # -----------------------------
-batter_id = filtered_df['batter'].iloc[0]
-statcast_df = df[(df['batter'] == batter_id)&(df['game_date'] == selected_date)]
-
-statcast_df['release_speed'] = round(statcast_df['release_speed'] * 1.60934, 1)
-statcast_df['launch_speed'] = round(statcast_df['launch_speed'] * 1.60934, 1)
-#statcast_df = pd.merge(statcast_df, pitcher_ID, on='pitcher', how='left')
+statcast_df = filtered_df.copy()
+statcast_df['pitcher_name'] = statcast_df['player_name']
+statcast_df['release_speed'] = round(statcast_df['release_speed'] * queries.MPH_TO_KMH, 1)
+statcast_df['launch_speed'] = round(statcast_df['launch_speed'] * queries.MPH_TO_KMH, 1)
 
 batter_name = statcast_df['batter_name'].iloc[0]
 opponent_team = selected_date_str.split(' ')[1]
@@ -161,22 +158,23 @@ st.header(f"{batter_name} - {selected_date.strftime('%Y-%m-%d')} vs {opponent_te
 # -----------------------------
 st.subheader("Pitch Details")
 
-filtered_df = filtered_df.rename(columns={
-    'player_name':'Pitcher','pitch_name': 'Type','release_speed': 'Velo(km/h)',
-    'release_spin_rate': 'Spin(rpm)','inning': 'Inn', 'outs_when_up': 'Out',
-    'balls': 'B', 'strikes': 'S', 'description': 'Desc', 'events' : 'Result', 
-    'launch_speed' : 'Exit Speed(km/h)', 'launch_angle' : 'Launch Angle(°)', 'estimated_ba_using_speedangle' : 'xBA'
-    
-})
-
+filtered_df = filtered_df.rename(columns=queries.BATTER_DETAIL_RENAME)
 
 # 정렬된 데이터프레임을 표시
-filtered_df = filtered_df.drop_duplicates()
-filtered_df['Velo(km/h)'] = round(filtered_df['Velo(km/h)'] * 1.60934, 1)
-filtered_df['Exit Speed(km/h)'] = round(filtered_df['Exit Speed(km/h)'] * 1.60934, 1)
+filtered_df['Velo(km/h)'] = round(filtered_df['Velo(km/h)'] * queries.MPH_TO_KMH, 1)
+filtered_df['Exit Speed(km/h)'] = round(filtered_df['Exit Speed(km/h)'] * queries.MPH_TO_KMH, 1)
 filtered_df = filtered_df.sort_values(by=['Inn', 'B', 'S'], ascending=[True, True, True])
-st.dataframe(filtered_df[['Inn','Pitcher', 'Type', 'Velo(km/h)', 'Spin(rpm)', 'Out', 'B', 'S', 'Desc',
-                         'Result', 'Exit Speed(km/h)', 'Launch Angle(°)', 'xBA']], hide_index=True)
+st.dataframe(filtered_df[queries.BATTER_DETAIL_COLUMNS], hide_index=True)
+
+# 저장소에서 배치 단위로 바로 내보내기 (클릭 시에만 생성)
+for col, fmt in zip(st.columns(len(export.FORMATS)), export.FORMATS):
+    col.download_button(
+        f'⬇️ Pitch Details ({fmt.upper()})',
+        data=partial(export.export_file, fmt, 'batter_pitches', store.DATA_DIR, selected_season,
+                     batter=batter_id, date=selected_date, batting_team=selected_team),
+        file_name=export.export_name('batter_pitches', fmt, batter_id, selected_date.strftime('%Y%m%d')),
+        mime=export.FORMATS[fmt][0], key=f'export_details_{fmt}',
+    )
 
 # -----------------------------
 # Description 필터 (Plotly용)
@@ -190,27 +188,7 @@ selected_description = st.selectbox('Description', description_options, label_vi
 # -----------------------------
 # Plotly 시각화
 # -----------------------------
-L, R = -0.708333, 0.708333
-Bot, Top = 1.5, 3.5
-
-scatter_fig = go.Figure()
-pitch_styles = {
-    '4-Seam Fastball': {'color': '#D22D49'},
-    'Sinker': {'color': '#FE9D00'},
-    'Cutter': {'color': '#933F2C'},
-    'Knuckle Curve': {'color': 'mediumpurple'},
-    'Sweeper': {'color': 'olive'},
-    'Split-Finger': {'color': '#888888'},
-    'Changeup': {'color': '#1DBE3A'},
-    'Screwball': {'color': '#1DBE3A'},
-    'Forkball': {'color': '#888888'},
-    'Slurve': {'color': 'teal'},
-    'Knuckleball': {'color': 'lightsteelblue'},
-    'Slider': {'color': 'darkkhaki'},
-    'Curveball': {'color': 'teal'},
-    'Eephus': {'color': 'black'},
-    'Other': {'color': 'black'}
-}
+from dashboard import charts, figures  # plotly는 차트 단계에서만 로드
 
 # description 선택값으로 필터 적용 (선택 안 했으면 전체 사용)
 if selected_description == '— Select Description —':
@@ -218,44 +196,87 @@ if selected_description == '— Select Description —':
 else:
     plot_df = statcast_df[statcast_df['description'] == selected_description]
 
-for pitch_name, style in pitch_styles.items():
-    pitch_data = plot_df[plot_df['pitch_name'] == pitch_name]
-    if pitch_data.empty:
-        continue
-    pitch_data = pitch_data.copy()
-    pitch_data['custom_hover'] = pitch_data.apply(
-        lambda row: f"{row['pitcher_name']}<br>Inning {row['inning']} / Pitch #{row['pitch_number']}<br>Count {row['balls']}-{row['strikes']}<br>{row['pitch_name']}<br>{row['release_speed']} km/h<br>{row['events']}<br>xBA {row['estimated_ba_using_speedangle']}" 
-        if row['description'] == 'hit_into_play' 
-        else f"{row['pitcher_name']}<br>Inning {row['inning']} / Pitch #{row['pitch_number']}<br>Count {row['balls']}-{row['strikes']}<br>{row['pitch_name']}<br>{row['release_speed']} km/h<br>{row['description']}",
-        axis=1
-    )
-    scatter_fig.add_trace(
-        go.Scatter(
-            x=pitch_data['plate_x'], y=pitch_data['plate_z'],
-            mode='markers', marker=dict(size=13, color=style['color']),
+scatter_fig = figures.cached_figure(
+    figures.figure_key(
+        'batter/locations', batter_id, selected_date, {'team': selected_team, 'description': selected_description},
+        pitch_store.partition_version(selected_date),
+    ),
+    lambda: charts.location_figure(plot_df, hover=charts.batter_hover(plot_df)),
+)
 
-            hovertemplate="%{customdata}<extra></extra>", customdata=pitch_data['custom_hover'], name=pitch_name
-        )
-    )
+st.plotly_chart(scatter_fig, use_container_width=True)
+
+# -----------------------------
+# Season Trends (rolling windows)
+# -----------------------------
+st.subheader("Season Trends")
+
+from dashboard import rollups
+
+@cache.memoize('trends', maxsize=2)
+def load_trends(season, version):
+    partials = rollups.load_partials(store.DATA_DIR, season)
+    if partials is None:
+        # 집계 테이블이 없는 예전 저장소: 시즌 데이터에서 바로 만든다
+        partials = rollups.batter_game_partials(pitch_store.df)
+    return rollups.BatterTrends(partials, version)
+
+trends = load_trends(selected_season, pitch_store.version)
 
-scatter_fig.add_shape(type='rect', x0=L, x1=R, y0=Bot, y1=Top, line=dict(color='grey', width=1.5))
-scatter_fig.add_shape(type='path', 
-    path=f'M {R-0.1},{0} L {L+0.1},{0} L {L-0.1},{-0.6} L 0,{-1.0} L {R+0.1},{-0.6} Z',
-    line=dict(color='grey', width=1.5))
-
-scatter_fig.update_layout(
-    xaxis=dict(range=[L-2.5, R+2.5], showticklabels=False, fixedrange=True),
-    yaxis=dict(range=[Bot-3, Top+2], showticklabels=False, fixedrange=True),
-    width=550, height=600, showlegend=True,
-    margin=dict(l=5, r=5, t=80, b=5), autosize=True,
-    legend=dict(
-        x=0.02,
-        y=0.98,
-        bgcolor='rgba(255,255,255,0.7)',
-        bordercolor='black',
-        borderwidth=1,
+window_label = st.radio('Window', list(rollups.WINDOWS), horizontal=True, label_visibility='collapsed')
+window_days = rollups.WINDOWS[window_label]
+
+# 선택한 경기일까지의 구간 값
+as_of = trends.window(batter_id, selected_date, window_days)
+metric_cols = st.columns(len(as_of))
+for col, (name, value) in zip(metric_cols, as_of.items()):
+    col.metric(name, '-' if pd.isna(value) else value)
+
+trend_metric = st.selectbox('Trend', rollups.TREND_METRICS, label_visibility='collapsed')
+trend_fig = figures.cached_figure(
+    figures.figure_key(
+        'batter/trend', batter_id, selected_date, {'window': window_label, 'metric': trend_metric}, pitch_store.version,
     ),
-    dragmode=False  # 이 줄을 추가하여 zoom 비활성화
+    lambda: charts.trend_figure(trends.trend(batter_id, window_days), trend_metric, selected_date,
+                                title=f"{batter_name} - {trend_metric} ({window_label})"),
 )
+st.plotly_chart(trend_fig, use_container_width=True)
 
-st.plotly_chart(scatter_fig, use_container_width=True)
+# -----------------------------
+# Spray Chart (사전 집계된 타구 구역)
+# -----------------------------
+st.subheader("Spray Chart")
+
+from dashboard import spray
+
+@cache.memoize('spray', maxsize=2)
+def load_spray(season, version):
+    partials = spray.load_spray(store.DATA_DIR, season)
+    if partials is None:
+        partials = spray.spray_partials(pitch_store.df.reset_index())
+    return partials
+
+spray_partials = load_spray(selected_season, pitch_store.version)
+
+spray_scope = st.radio('Spray Scope', ['This game', 'Season', f'{selected_team} lineup (season)'],
+                       horizontal=True, label_visibility='collapsed')
+if spray_scope == 'This game':
+    game_pk = filtered_df['game_pk'].iloc[0]
+    spray_rows = spray.select(spray_partials, batter=batter_id, game_pk=game_pk)
+    spray_subject, spray_title = batter_id, f"{batter_name} - {selected_date.strftime('%Y-%m-%d')}"
+elif spray_scope == 'Season':
+    spray_rows = spray.select(spray_partials, batter=batter_id)
+    spray_subject, spray_title = batter_id, f"{batter_name} - {selected_season}"
+else:
+    spray_rows = spray.select(spray_partials, team=selected_team)
+    spray_subject, spray_title = selected_team, f"{selected_team} - {selected_season}"
+
+spray_fig = figures.cached_figure(
+    figures.figure_key(
+        'batter/spray', spray_subject, selected_date if spray_scope == 'This game' else None,
+        {'scope': spray_scope}, pitch_store.partition_version(selected_date) if spray_scope == 'This game' else pitch_store.version,
+    ),
+    lambda: charts.spray_figure(spray.sector_bins(spray_rows), title=spray_title),
+)
+st.plotly_chart(spray_fig, use_container_width=True)
+st.dataframe(spray.bucket_table(spray_rows))
@@ -0,0 +1,65 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from dashboard import cache
+
+st.set_page_config(layout="wide")
+
+# 설정되어 있으면 캐시 비우기에 이 토큰이 필요하다
+CACHE_ADMIN_TOKEN = os.environ.get('CACHE_ADMIN_TOKEN')
+
+
+def process_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+# ------------------------------
+# UI 구성
+# ------------------------------
+
+st.title("🧠 Cache Status")
+st.caption("이 Streamlit 프로세스에 등록된 캐시 (모든 세션이 공유). 쿼리 서버는 /metrics 에서 확인.")
+
+stats_df = pd.DataFrame(cache.stats(), columns=[
+    'cache', 'entries', 'max_entries', 'size_mb', 'budget_mb', 'ttl_s', 'hits', 'misses', 'hit_rate', 'evictions', 'expirations',
+])
+
+col1, col2, col3 = st.columns(3)
+col1.metric('Cached (MB)', round(cache.total_nbytes() / 2 ** 20, 1))
+col2.metric('Process budget (MB)', '-' if cache.CACHE_BUDGET_BYTES is None else round(cache.CACHE_BUDGET_BYTES / 2 ** 20, 1))
+col3.metric('Process RSS (MB)', process_rss_mb() or '-')
+
+if stats_df.empty:
+    st.info('ℹ️ 아직 등록된 캐시가 없습니다. 다른 페이지를 먼저 열어주세요.')
+else:
+    st.dataframe(stats_df, hide_index=True)
+
+with st.expander('Metrics dump (Prometheus text)'):
+    metrics = cache.metrics_text()
+    st.code(metrics, language='text')
+    st.download_button('⬇️ metrics.txt', metrics, file_name='cache_metrics.txt', mime='text/plain')
+
+# ------------------------------
+# 🧹 캐시 비우기
+# ------------------------------
+
+st.subheader("Clear")
+
+clear_options = ['— All caches —'] + stats_df['cache'].tolist()
+selected_cache = st.selectbox('Cache', clear_options, label_visibility='collapsed')
+token = st.text_input('Token', type='password') if CACHE_ADMIN_TOKEN else None
+
+if st.button('🧹 Clear'):
+    if CACHE_ADMIN_TOKEN and token != CACHE_ADMIN_TOKEN:
+        st.error('❌ 토큰이 맞지 않습니다.')
+    else:
+        cache.clear(None if selected_cache == '— All caches —' else selected_cache)
+        st.rerun()
@@ -0,0 +1 @@
+# 대시보드 공용 데이터 계층 (store / query / cache / server)
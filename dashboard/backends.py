@@ -0,0 +1,279 @@
+import os
+
+import pandas as pd
+
+from dashboard import queries
+from dashboard.store import DATA_DIR, PitchStore, ensure_season, partition_version, read_manifest, season_dir
+
+# pandas: 메모리 내 PitchStore (기준 구현) / duckdb, polars: Parquet 저장소를 직접 질의
+QUERY_BACKEND = os.environ.get('QUERY_BACKEND', 'pandas')
+
+# ------------------------------
+# 🐼 pandas (reference)
+# ------------------------------
+
+class PandasBackend:
+    name = 'pandas'
+
+    def __init__(self, data_dir=DATA_DIR, season=None, store=None):
+        # store: 이미 열어 둔 PitchStore (페이지끼리 시즌 DataFrame 하나를 같이 쓴다)
+        self.store = store if store is not None else PitchStore.open(data_dir, season)
+        self.manifest = self.store.manifest
+        self.version = self.store.version
+
+    def partition_version(self, date):
+        return partition_version(self.manifest, date)
+
+    def team_pitchers(self, team):
+        return queries.team_pitchers(self.store, team)
+
+    def pitcher_games(self, pitcher, team=None):
+        return queries.pitcher_games(self.store, pitcher, team)
+
+    def game_pitches(self, pitcher, game_date, team=None):
+        return queries.game_pitches(self.store, pitcher, game_date, team)
+
+    def pitch_summary(self, pitcher, game_date, team=None):
+        return queries.pitch_summary(self.store, pitcher, game_date, team)
+
+    def pitch_details(self, pitcher, game_date, team=None, batter=None, inning=None):
+        return queries.pitch_details(self.store, pitcher, game_date, team, batter, inning)
+
+    def matchup_summary(self, pitcher, game_date, team=None):
+        return queries.matchup_summary(self.store, pitcher, game_date, team)
+
+    def pitches(self, team=None, pitcher=None, columns=None):
+        if pitcher is not None:
+            rows = self.store.pitcher_rows(pitcher, team)
+        elif team is not None:
+            rows = self.store.team_rows(team)
+        else:
+            rows = self.store.df
+        return rows if columns is None else rows[columns]
+
+# ------------------------------
+# 🦆 DuckDB
+# ------------------------------
+
+def _where(**conditions):
+    clauses, params = [], []
+    for column, value in conditions.items():
+        if value is not None:
+            clauses.append(f'{column} = ?')
+            # numpy 스칼라는 DuckDB 파라미터로 바인딩되지 않는다
+            params.append(value.item() if hasattr(value, 'item') else value)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+class DuckDBBackend:
+    name = 'duckdb'
+
+    def __init__(self, data_dir=DATA_DIR, season=None, threads=None):
+        import duckdb
+
+        self.manifest = read_manifest(data_dir, season)
+        self.version = self.manifest['version']
+        self.con = duckdb.connect()
+        if threads:
+            self.con.execute(f'SET threads = {int(threads)}')
+        files = os.path.join(season_dir(data_dir, season), '*', '*.parquet').replace("'", "''")
+        self.con.execute(
+            f"CREATE VIEW pitches AS SELECT * FROM read_parquet('{files}', hive_partitioning = true)"
+        )
+
+    def partition_version(self, date):
+        return partition_version(self.manifest, date)
+
+    def _query(self, sql, params=()):
+        # 커서마다 별도 연결이라 여러 스레드(HTTP 서버)에서 동시에 써도 된다
+        return self.con.cursor().execute(sql, list(params)).df()
+
+    def team_pitchers(self, team):
+        return self._query(
+            'SELECT pitcher, arg_min(player_name, pitch_key) AS player_name FROM pitches'
+            ' WHERE pitching_team = ? AND player_name IS NOT NULL'
+            ' GROUP BY pitcher ORDER BY player_name, pitcher',
+            [team],
+        )
+
+    def pitcher_games(self, pitcher, team=None):
+        where, params = _where(pitcher=pitcher, pitching_team=team)
+        games = self._query(
+            'SELECT game_date, game_pk, arg_min(pitching_team, pitch_key) AS pitching_team,'
+            ' any_value(home_team) AS home_team, any_value(away_team) AS away_team'
+            f' FROM pitches{where} GROUP BY game_date, game_pk ORDER BY game_date, min(pitch_key)',
+            params,
+        )
+        games['game_date'] = pd.to_datetime(games['game_date'])
+        return queries.format_games(games, 'pitching_team')
+
+    def game_pitches(self, pitcher, game_date, team=None):
+        return self.pitch_details(pitcher, game_date, team, convert=False)
+
+    def pitch_summary(self, pitcher, game_date, team=None):
+        where, params = _where(pitcher=pitcher, game_date=pd.Timestamp(game_date).date(), pitching_team=team)
+        sql_aggs = {'count': 'count', 'min': 'min', 'mean': 'avg', 'max': 'max'}
+        select = ', '.join(
+            f'{sql_aggs[func]}({column}) AS {name}' for name, (column, func) in queries.SUMMARY_AGGS.items()
+        )
+        raw = self._query(
+            f'SELECT pitch_name, {select} FROM pitches{where} AND pitch_name IS NOT NULL GROUP BY pitch_name',
+            params,
+        )
+        return queries.format_summary(raw.set_index('pitch_name'))
+
+    def pitch_details(self, pitcher, game_date, team=None, batter=None, inning=None, convert=True):
+        where, params = _where(
+            pitcher=pitcher, game_date=pd.Timestamp(game_date).date(), pitching_team=team,
+            batter=batter, inning=inning,
+        )
+        pitches = self._query(f'SELECT * FROM pitches{where} ORDER BY pitch_key', params)
+        pitches['game_date'] = pd.to_datetime(pitches['game_date'])
+        pitches = pitches.set_index('pitch_key')
+        if convert:
+            pitches['release_speed'] = (pitches['release_speed'] * queries.MPH_TO_KMH).round(1)
+        return pitches
+
+    def matchup_summary(self, pitcher, game_date, team=None):
+        where, params = _where(pitcher=pitcher, game_date=pd.Timestamp(game_date).date(), pitching_team=team)
+        whiffs = ', '.join(f"'{d}'" for d in queries.WHIFF_DESCRIPTIONS)
+        raw = self._query(
+            'SELECT batter_name, count(DISTINCT at_bat_number) AS pa, count(*) AS pitches,'
+            f' count(*) FILTER (WHERE description IN ({whiffs})) AS whiffs,'
+            " count(*) FILTER (WHERE type = 'X') AS in_play,"
+            ' avg(estimated_ba_using_speedangle) AS xba'
+            f' FROM pitches{where} AND batter_name IS NOT NULL GROUP BY batter_name',
+            params,
+        )
+        return queries.format_matchups(raw.set_index('batter_name'))
+
+    def pitches(self, team=None, pitcher=None, columns=None):
+        where, params = _where(pitcher=pitcher, pitching_team=team)
+        select = ', '.join(columns) if columns else '*'
+        return self._query(f'SELECT {select} FROM pitches{where}', params)
+
+# ------------------------------
+# 🐻‍❄️ Polars
+# ------------------------------
+
+class PolarsBackend:
+    name = 'polars'
+
+    def __init__(self, data_dir=DATA_DIR, season=None):
+        import polars as pl
+
+        self.pl = pl
+        self.manifest = read_manifest(data_dir, season)
+        self.version = self.manifest['version']
+        self.lf = pl.scan_parquet(
+            os.path.join(season_dir(data_dir, season), '*', '*.parquet'),
+            hive_partitioning=True, hive_schema={'season': pl.Int32, 'game_date': pl.Date},
+        )
+
+    def partition_version(self, date):
+        return partition_version(self.manifest, date)
+
+    def _filter(self, **conditions):
+        pl = self.pl
+        lf = self.lf
+        for column, value in conditions.items():
+            if value is not None:
+                lf = lf.filter(pl.col(column) == value)
+        return lf
+
+    def team_pitchers(self, team):
+        pl = self.pl
+        pitchers = (
+            self._filter(pitching_team=team)
+            .filter(pl.col('player_name').is_not_null())
+            .group_by('pitcher')
+            .agg(pl.col('player_name').sort_by('pitch_key').first())
+            .sort(['player_name', 'pitcher'])
+        )
+        return pitchers.collect().to_pandas()
+
+    def pitcher_games(self, pitcher, team=None):
+        pl = self.pl
+        games = (
+            self._filter(pitcher=pitcher, pitching_team=team)
+            .group_by(['game_date', 'game_pk'])
+            .agg(
+                pl.col('pitching_team').sort_by('pitch_key').first(),
+                pl.col('home_team').first(), pl.col('away_team').first(),
+                pl.col('pitch_key').min().alias('first_pitch'),
+            )
+            .sort(['game_date', 'first_pitch'])
+            .collect().to_pandas()
+        )
+        games['game_date'] = pd.to_datetime(games['game_date'])
+        return queries.format_games(games, 'pitching_team')
+
+    def game_pitches(self, pitcher, game_date, team=None):
+        return self.pitch_details(pitcher, game_date, team, convert=False)
+
+    def pitch_summary(self, pitcher, game_date, team=None):
+        pl = self.pl
+        exprs = {
+            'count': lambda c: pl.col(c).count(), 'min': lambda c: pl.col(c).min(),
+            'mean': lambda c: pl.col(c).mean(), 'max': lambda c: pl.col(c).max(),
+        }
+        raw = (
+            self._filter(pitcher=pitcher, game_date=pd.Timestamp(game_date).date(), pitching_team=team)
+            .filter(pl.col('pitch_name').is_not_null())
+            .group_by('pitch_name')
+            .agg([exprs[func](column).alias(name) for name, (column, func) in queries.SUMMARY_AGGS.items()])
+            .collect().to_pandas()
+        )
+        return queries.format_summary(raw.set_index('pitch_name'))
+
+    def pitch_details(self, pitcher, game_date, team=None, batter=None, inning=None, convert=True):
+        pitches = (
+            self._filter(
+                pitcher=pitcher, game_date=pd.Timestamp(game_date).date(), pitching_team=team,
+                batter=batter, inning=inning,
+            )
+            .sort('pitch_key')
+            .collect().to_pandas()
+        )
+        pitches['game_date'] = pd.to_datetime(pitches['game_date'])
+        pitches = pitches.set_index('pitch_key')
+        if convert:
+            pitches['release_speed'] = (pitches['release_speed'] * queries.MPH_TO_KMH).round(1)
+        return pitches
+
+    def matchup_summary(self, pitcher, game_date, team=None):
+        pl = self.pl
+        raw = (
+            self._filter(pitcher=pitcher, game_date=pd.Timestamp(game_date).date(), pitching_team=team)
+            .filter(pl.col('batter_name').is_not_null())
+            .group_by('batter_name')
+            .agg(
+                pl.col('at_bat_number').n_unique().alias('pa'),
+                pl.len().alias('pitches'),
+                pl.col('description').is_in(queries.WHIFF_DESCRIPTIONS).sum().alias('whiffs'),
+                (pl.col('type') == 'X').sum().alias('in_play'),
+                pl.col('estimated_ba_using_speedangle').mean().alias('xba'),
+            )
+            .collect().to_pandas()
+        )
+        return queries.format_matchups(raw.set_index('batter_name'))
+
+    def pitches(self, team=None, pitcher=None, columns=None):
+        lf = self._filter(pitcher=pitcher, pitching_team=team)
+        if columns:
+            lf = lf.select(columns)
+        return lf.collect().to_pandas()
+
+
+BACKENDS = {'pandas': PandasBackend, 'duckdb': DuckDBBackend, 'polars': PolarsBackend}
+
+
+def open_backend(season, data_dir=DATA_DIR, name=None, store=None):
+    # store 는 pandas 백엔드만 쓴다 (duckdb / polars 는 Parquet 을 직접 읽는다)
+    name = name or QUERY_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f'알 수 없는 쿼리 백엔드: {name} (사용 가능: {", ".join(BACKENDS)})')
+    ensure_season(season, data_dir)
+    if name == 'pandas':
+        return PandasBackend(data_dir, int(season), store)
+    return BACKENDS[name](data_dir, int(season))
@@ -0,0 +1,300 @@
+import functools
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+# ------------------------------
+# 🧠 LRU cache
+# ------------------------------
+
+class LRUCache:
+    # maxsize: 항목 수 상한 / maxbytes: sizeof(value) 합계 상한 / ttl: 항목 수명(초) (None이면 제한 없음)
+    def __init__(self, maxsize=256, maxbytes=None, sizeof=len, ttl=None, name=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.ttl = ttl
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._expires = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key):
+        self._data.pop(key)
+        self.nbytes -= self._sizes.pop(key)
+        self._expires.pop(key, None)
+
+    def _expired(self, key):
+        expires = self._expires.get(key)
+        return expires is not None and expires <= time.monotonic()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data and self._expired(key):
+                self._drop(key)
+                self.expirations += 1
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value):
+        if self.sizeof is estimate_nbytes:
+            # 다른 캐시가 이미 들고 있는 객체 (예: backend 안의 공유 PitchStore) 는 그 캐시에서만 센다
+            size = estimate_nbytes(value, _seen=owned_ids(exclude=self))
+        else:
+            size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            # 만료된 항목부터 정리한 뒤 상한을 넘으면 가장 오래 안 쓴 항목부터
+            for old_key in [k for k in self._data if k != key and self._expired(k)]:
+                self._drop(old_key)
+                self.expirations += 1
+            while len(self._data) > 1 and (
+                (self.maxsize is not None and len(self._data) > self.maxsize)
+                or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+            ):
+                self.evict_oldest()
+        enforce_budget()
+
+    def evict_oldest(self):
+        # 호출하는 쪽이 _lock 을 잡고 있거나 enforce_budget 에서 잡는다
+        old_key = next(iter(self._data))
+        self._drop(old_key)
+        self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # 같은 키를 동시에 계산하지 않도록 키별 lock (첫 세션이 만드는 동안 나머지는 기다렸다가 결과를 쓴다)
+        with self._lock:
+            pending = self._pending.setdefault(key, threading.Lock())
+        try:
+            with pending:
+                with self._lock:
+                    value = self._data.get(key, _MISSING) if not self._expired(key) else _MISSING
+                    if value is not _MISSING:
+                        # 기다리는 동안 다른 스레드가 채운 값 -> 계산하지 않았으므로 적중으로 센다
+                        self.misses -= 1
+                        self.hits += 1
+                if value is _MISSING:
+                    value = compute()
+                    self.put(key, value)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+        return value
+
+    def items(self):
+        # (key, value) 스냅샷. 통계와 LRU 순서는 건드리지 않는다
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'cache': self.name,
+            'entries': len(self._data),
+            'max_entries': self.maxsize,
+            'size_mb': round(self.nbytes / 2 ** 20, 2),
+            'budget_mb': None if self.maxbytes is None else round(self.maxbytes / 2 ** 20, 2),
+            'ttl_s': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+
+_MISSING = object()
+
+# ------------------------------
+# 📏 메모리 추정
+# ------------------------------
+
+def estimate_nbytes(value, depth=4, _seen=None):
+    # DataFrame / Series / ndarray / Arrow 는 버퍼 크기, 그 밖의 객체는 속성과 컨테이너를 몇 단계까지 따라가며 합산
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (types.ModuleType, type, types.FunctionType, types.MethodType)):
+        # 모듈 / 클래스 / 함수는 캐시 항목이 아니라 참조일 뿐이라 따라가지 않는다
+        return 0
+    if hasattr(value, 'memory_usage') and hasattr(value, 'columns'):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(deep=True))
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if depth <= 0 or isinstance(value, (str, bytes)):
+        return size
+    if isinstance(value, dict):
+        items = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif hasattr(value, '__dict__'):
+        items = vars(value).values()
+    else:
+        return size
+    return size + sum(estimate_nbytes(item, depth - 1, seen) for item in items)
+
+# ------------------------------
+# 🏛️ 캐시 등록 / 전체 메모리 상한
+# ------------------------------
+
+def _megabytes(text):
+    return None if not text else int(float(text) * 2 ** 20)
+
+
+# 프로세스 전체 상한 (MB). 넘으면 항목이 둘 이상인 캐시 중 가장 큰 캐시의 오래된 항목부터 내보낸다
+CACHE_BUDGET_BYTES = _megabytes(os.environ.get('CACHE_BUDGET_MB'))
+# 캐시별 상한 덮어쓰기: CACHE_BUDGETS="figures=128,similarity=16"
+CACHE_BUDGETS = {
+    name.strip(): _megabytes(mb)
+    for name, mb in (item.split('=', 1) for item in os.environ.get('CACHE_BUDGETS', '').split(',') if '=' in item)
+}
+
+registry = {}
+_registry_lock = threading.RLock()
+
+
+def register(name, cache):
+    cache.name = name
+    if name in CACHE_BUDGETS:
+        cache.maxbytes = CACHE_BUDGETS[name]
+    with _registry_lock:
+        registry[name] = cache
+    return cache
+
+
+def owned_ids(exclude=None):
+    # 등록된 캐시(exclude 제외)가 값으로 들고 있는 객체 id
+    with _registry_lock:
+        caches = [cache for cache in registry.values() if cache is not exclude]
+    return {id(value) for cache in caches for _, value in cache.items()}
+
+
+def governed(name, maxsize=16, maxbytes=None, ttl=None, sizeof=estimate_nbytes):
+    # 같은 이름은 프로세스에서 하나 (Streamlit rerun 마다 다시 불려도 기존 캐시를 돌려준다)
+    with _registry_lock:
+        if name not in registry:
+            register(name, LRUCache(maxsize, maxbytes, sizeof, ttl))
+        return registry[name]
+
+
+def memoize(name, maxsize=16, maxbytes=None, ttl=None):
+    # st.cache_resource 대신 쓰는 데코레이터: 결과를 세션 간 공유하고 등록된 캐시의 상한 / 통계를 따른다.
+    # 키는 함수 이름 + 인자라서 페이지마다 같은 이름으로 정의된 로더(load_store 등)는 한 결과를 같이 쓴다
+    cache = governed(name, maxsize, maxbytes, ttl)
+
+    def decorator(fn):
+        origin = fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (origin, args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: fn(*args, **kwargs))
+
+        def entries():
+            # 이 함수가 캐시에 남긴 (args, 결과) 목록 (이전 버전 결과를 이어서 갱신할 때)
+            return [(key[1], value) for key, value in cache.items() if key[0] == origin]
+
+        wrapper.cache = cache
+        wrapper.entries = entries
+        return wrapper
+
+    return decorator
+
+
+def total_nbytes():
+    with _registry_lock:
+        return sum(cache.nbytes for cache in registry.values())
+
+
+def enforce_budget():
+    if CACHE_BUDGET_BYTES is None:
+        return
+    with _registry_lock:
+        while total_nbytes() > CACHE_BUDGET_BYTES:
+            # 항목 하나뿐인 캐시(시즌 저장소 등 작업 중인 데이터)는 건드리지 않는다
+            candidates = [cache for cache in registry.values() if len(cache) > 1]
+            if not candidates:
+                break
+            cache = max(candidates, key=lambda c: c.nbytes)
+            with cache._lock:
+                cache.evict_oldest()
+
+
+def clear(name=None):
+    with _registry_lock:
+        caches = list(registry.values()) if name is None else [registry[name]]
+    for cache in caches:
+        cache.clear()
+
+# ------------------------------
+# 📈 통계 / metrics dump
+# ------------------------------
+
+def stats():
+    with _registry_lock:
+        return [registry[name].stats() for name in sorted(registry)]
+
+
+METRICS = [
+    ('hits', 'counter', 'Cache lookups served from the cache'),
+    ('misses', 'counter', 'Cache lookups that had to compute'),
+    ('evictions', 'counter', 'Entries evicted by the entry / memory limit'),
+    ('expirations', 'counter', 'Entries dropped after their TTL'),
+    ('entries', 'gauge', 'Entries currently held'),
+    ('size_mb', 'gauge', 'Estimated size of the held entries (MB)'),
+    ('budget_mb', 'gauge', 'Memory budget (MB)'),
+]
+
+
+def metrics_text():
+    # Prometheus text exposition format
+    rows = stats()
+    lines = []
+    for field, kind, help_text in METRICS:
+        metric = f'dashboard_cache_{field}' + ('_total' if kind == 'counter' else '')
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        lines += [f'{metric}{{cache="{row["cache"]}"}} {row[field]}' for row in rows if row[field] is not None]
+    lines += [
+        '# HELP dashboard_cache_process_budget_mb Process-wide cache budget (MB)',
+        '# TYPE dashboard_cache_process_budget_mb gauge',
+        f'dashboard_cache_process_budget_mb {round(CACHE_BUDGET_BYTES / 2 ** 20, 2) if CACHE_BUDGET_BYTES else 0}',
+    ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,338 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from dashboard.queries import FT_TO_CM
+
+L, R = -0.708333, 0.708333
+Bot, Top = 1.5, 3.5
+
+pitch_styles = {
+    '4-Seam Fastball': {'color': '#D22D49'},
+    'Sinker': {'color': '#FE9D00'},
+    'Cutter': {'color': '#933F2C'},
+    'Knuckle Curve': {'color': 'mediumpurple'},
+    'Sweeper': {'color': 'olive'},
+    'Split-Finger': {'color': '#888888'},
+    'Changeup': {'color': '#1DBE3A'},
+    'Screwball': {'color': '#1DBE3A'},
+    'Forkball': {'color': '#888888'},
+    'Slurve': {'color': 'teal'},
+    'Knuckleball': {'color': 'lightsteelblue'},
+    'Slider': {'color': 'darkkhaki'},
+    'Curveball': {'color': 'teal'},
+    'Eephus': {'color': 'black'},
+    'Other': {'color': 'black'}
+}
+
+# 브라우저로 보내는 마커 수 상한
+POINT_BUDGET = 1500
+# 예산의 이 배수까지는 층화 샘플, 그 이상은 hexbin 집계
+SAMPLE_FACTOR = 10
+
+# ------------------------------
+# ✂️ Data reduction (frame -> Plotly)
+# ------------------------------
+
+def stratified_sample(df, budget, by='pitch_name', seed=0):
+    # 구종 비율을 유지하도록 구종별 할당량만큼만 남긴다 (구종당 최소 1개).
+    # 최소 1개씩 보장하는 몫을 예산에서 먼저 빼 두므로 합계가 예산을 넘지 않는다
+    counts = df[by].value_counts()
+    share = max(budget - len(counts), 0)
+    quota = np.maximum(1, np.floor(counts * share / len(df))).astype(int)
+
+    rng = np.random.default_rng(seed)
+    shuffled = df.iloc[rng.permutation(len(df))]
+    rank = shuffled.groupby(by, sort=False).cumcount()
+    keep = rank.to_numpy() < shuffled[by].map(quota).to_numpy()
+    return shuffled[keep].sort_index()
+
+
+def hexbin(df, x, y, gridsize, by='pitch_name'):
+    # 두 개의 직사각 격자(원점 / 반 칸 이동) 중 더 가까운 중심을 고르면 육각형 타일이 된다
+    dx = gridsize
+    dy = gridsize * np.sqrt(3)
+    px = df[x].to_numpy(dtype=float)
+    py = df[y].to_numpy(dtype=float)
+
+    ax = np.round(px / dx) * dx
+    ay = np.round(py / dy) * dy
+    bx = (np.floor(px / dx) + 0.5) * dx
+    by_ = (np.floor(py / dy) + 0.5) * dy
+    use_b = (px - bx) ** 2 + (py - by_) ** 2 < (px - ax) ** 2 + (py - ay) ** 2
+
+    bins = pd.DataFrame({
+        by: df[by].to_numpy(),
+        x: np.where(use_b, bx, ax).round(4),
+        y: np.where(use_b, by_, ay).round(4),
+    })
+    return bins.groupby([by, x, y], sort=False).size().rename('count').reset_index()
+
+
+def reduce_points(df, x, y, budget=POINT_BUDGET, mode='auto', gridsize=0.15, by='pitch_name'):
+    df = df.dropna(subset=[x, y])
+    if mode == 'auto':
+        if len(df) <= budget:
+            mode = 'raw'
+        elif len(df) <= budget * SAMPLE_FACTOR:
+            mode = 'sample'
+        else:
+            mode = 'hexbin'
+
+    if mode == 'raw':
+        return 'raw', df
+    if mode == 'sample':
+        return 'sample', stratified_sample(df, budget, by)
+    # 칸 수가 예산을 넘으면 격자를 키워 다시 집계
+    bins = hexbin(df, x, y, gridsize, by)
+    while len(bins) > budget:
+        gridsize *= 1.5
+        bins = hexbin(df, x, y, gridsize, by)
+    return 'hexbin', bins
+
+# ------------------------------
+# 🎯 Figures
+# ------------------------------
+
+def pitch_hover(df):
+    base = df['pitch_name'].astype(str) + '<br>' + df['release_speed'].astype(str) + ' km/h<br>'
+    in_play = df['description'] == 'hit_into_play'
+    return base + np.where(
+        in_play,
+        df['description'].astype(str) + '<br>' + df['events'].astype(str)
+        + '<br>xBA ' + df['estimated_ba_using_speedangle'].astype(str),
+        df['description'].astype(str),
+    )
+
+
+def batter_hover(df):
+    base = (
+        df['pitcher_name'].astype(str) + '<br>Inning ' + df['inning'].astype(str)
+        + ' / Pitch #' + df['pitch_number'].astype(str)
+        + '<br>Count ' + df['balls'].astype(str) + '-' + df['strikes'].astype(str)
+        + '<br>' + df['pitch_name'].astype(str) + '<br>' + df['release_speed'].astype(str) + ' km/h<br>'
+    )
+    in_play = df['description'] == 'hit_into_play'
+    return base + np.where(
+        in_play,
+        df['events'].astype(str) + '<br>xBA ' + df['estimated_ba_using_speedangle'].astype(str),
+        df['description'].astype(str),
+    )
+
+
+def add_strike_zone(fig):
+    fig.add_shape(type='rect', x0=L, x1=R, y0=Bot, y1=Top, line=dict(color='grey', width=1.5))
+    fig.add_shape(type='path',
+        path=f'M {R-0.1},{0} L {L+0.1},{0} L {L-0.1},{-0.6} L 0,{-1.0} L {R+0.1},{-0.6} Z',
+        line=dict(color='grey', width=1.5))
+    return fig
+
+
+def _add_traces(fig, mode, points, x, y, hover=None, text=None, marker_size=13):
+    for pitch_name, style in pitch_styles.items():
+        pitch_data = points[points['pitch_name'] == pitch_name]
+        if pitch_data.empty:
+            continue
+        if mode == 'hexbin':
+            # 집계 모드: 칸 중심에 개수 비례 크기의 마커 하나
+            size = 6 + 18 * np.sqrt(pitch_data['count'] / points['count'].max())
+            fig.add_trace(go.Scatter(
+                x=pitch_data[x], y=pitch_data[y], mode='markers',
+                marker=dict(size=size, color=style['color'], opacity=0.6),
+                customdata=pitch_data['count'], hovertemplate=f'{pitch_name}<br>%{{customdata}} pitches<extra></extra>',
+                name=pitch_name,
+            ))
+            continue
+        trace = dict(
+            x=pitch_data[x], y=pitch_data[y], mode='markers',
+            marker=dict(size=marker_size if mode == 'raw' else 7, color=style['color'],
+                        opacity=1 if mode == 'raw' else 0.6),
+            name=pitch_name,
+        )
+        if text is not None and mode == 'raw':
+            trace.update(mode='markers+text', text=text.loc[pitch_data.index], textposition='top center')
+        if hover is not None:
+            trace.update(hovertemplate='%{customdata}<extra></extra>', customdata=hover.loc[pitch_data.index])
+        fig.add_trace(go.Scatter(**trace))
+
+
+def location_figure(df, title=None, hover=None, text=None, budget=POINT_BUDGET, mode='auto'):
+    mode, points = reduce_points(df, 'plate_x', 'plate_z', budget, mode)
+    fig = go.Figure()
+    _add_traces(fig, mode, points, 'plate_x', 'plate_z', hover, text)
+    add_strike_zone(fig)
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(range=[L-2.5, R+2.5], showticklabels=False, fixedrange=True),
+        yaxis=dict(range=[Bot-3, Top+2], showticklabels=False, fixedrange=True),
+        width=550, height=600, showlegend=True,
+        margin=dict(l=5, r=5, t=80, b=5),
+        autosize=True,
+        legend=dict(
+            x=0.02, y=0.98,
+            bgcolor='rgba(255,255,255,0.7)',
+            bordercolor='black', borderwidth=1
+        ),
+        dragmode=False
+    )
+    return fig
+
+
+def movement_figure(df, title=None, budget=POINT_BUDGET, mode='auto'):
+    # 투수 시점 HB / IVB (cm)
+    moves = pd.DataFrame({
+        'pitch_name': df['pitch_name'],
+        'hb': df['pfx_x'] * FT_TO_CM * -1,
+        'ivb': df['pfx_z'] * FT_TO_CM,
+    }, index=df.index)
+    mode, points = reduce_points(moves, 'hb', 'ivb', budget, mode, gridsize=4)
+    fig = go.Figure()
+    _add_traces(fig, mode, points, 'hb', 'ivb', marker_size=8)
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title='HB(cm)', range=[-70, 70], zeroline=True, fixedrange=True),
+        yaxis=dict(title='IVB(cm)', range=[-70, 70], zeroline=True, fixedrange=True),
+        width=550, height=550, showlegend=True,
+        margin=dict(l=5, r=5, t=80, b=5),
+        autosize=True,
+        dragmode=False
+    )
+    return fig
+
+
+def trend_figure(trend, metric, marker_date=None, title=None):
+    fig = go.Figure(go.Scatter(
+        x=trend['game_date'], y=trend[metric], mode='lines+markers',
+        line=dict(color='#D22D49'), marker=dict(size=5), name=metric,
+        hovertemplate=f'%{{x|%Y-%m-%d}}<br>{metric} %{{y}}<extra></extra>',
+    ))
+    if marker_date is not None:
+        fig.add_vline(x=pd.Timestamp(marker_date), line=dict(color='grey', dash='dot'))
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title=None, fixedrange=True),
+        yaxis=dict(title=metric, fixedrange=True),
+        height=350, showlegend=False,
+        margin=dict(l=5, r=5, t=60, b=5),
+        autosize=True,
+        dragmode=False
+    )
+    return fig
+
+
+def add_field(fig, fence=330):
+    # 파울라인 + 내야 다이아몬드 + 외야 펜스 (ft, 홈플레이트 원점)
+    arc = np.radians(np.linspace(-45, 45, 46))
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([[0], fence * np.sin(arc), [0]]), y=np.concatenate([[0], fence * np.cos(arc), [0]]),
+        mode='lines', line=dict(color='grey', width=1.5), hoverinfo='skip', showlegend=False,
+    ))
+    base = 90 / np.sqrt(2)
+    fig.add_trace(go.Scatter(
+        x=[0, base, 0, -base, 0], y=[0, base, 2 * base, base, 0],
+        mode='lines', line=dict(color='grey', width=1), hoverinfo='skip', showlegend=False,
+    ))
+    return fig
+
+
+def spray_figure(bins, title=None):
+    # 사전 집계된 구역(섹터 x 거리) 당 마커 하나: 크기 = 타구 수, 색 = 평균 타구속도
+    fig = go.Figure()
+    add_field(fig)
+    if not bins.empty:
+        size = 10 + 30 * np.sqrt(bins['batted_balls'] / bins['batted_balls'].max())
+        fig.add_trace(go.Scatter(
+            x=bins['x'], y=bins['y'], mode='markers+text',
+            text=bins['batted_balls'], textfont=dict(color='white'),
+            marker=dict(size=size, color=bins['ev'], colorscale='RdBu_r', cmin=110, cmax=170,
+                        colorbar=dict(title='EV(km/h)'), opacity=0.85, line=dict(color='black', width=0.5)),
+            customdata=np.stack([bins['zone'], bins['ev'], bins['xba'], bins['hits']], axis=-1),
+            hovertemplate='%{customdata[0]}<br>%{text} BBE / %{customdata[3]} H'
+                          '<br>EV %{customdata[1]} km/h<br>xBA %{customdata[2]}<extra></extra>',
+            showlegend=False,
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(range=[-300, 300], showticklabels=False, showgrid=False, zeroline=False, fixedrange=True),
+        yaxis=dict(range=[-20, 420], showticklabels=False, showgrid=False, zeroline=False, fixedrange=True,
+                   scaleanchor='x'),
+        width=550, height=500,
+        margin=dict(l=5, r=5, t=80, b=5),
+        autosize=True,
+        dragmode=False
+    )
+    return fig
+
+
+def game_location_figure(game, pitchers, title=None, cols=3):
+    # 경기의 모든 투수를 한 figure 의 서브플롯으로: hover 는 경기 전체에 한 번만 만들고
+    # (투수, 구종) groupby 한 번으로 모든 trace 를 추가한다
+    from plotly.subplots import make_subplots
+
+    game = game.dropna(subset=['plate_x', 'plate_z'])
+    order = pitchers['pitcher'].tolist()
+    rows = max(1, -(-len(order) // cols))
+    fig = make_subplots(
+        rows=rows, cols=cols, horizontal_spacing=0.02, vertical_spacing=0.06,
+        subplot_titles=[f"{name} ({team}, {n})" for name, team, n in
+                        zip(pitchers['player_name'], pitchers['pitching_team'], pitchers['pitches'])],
+    )
+    position = {pitcher: (i // cols + 1, i % cols + 1) for i, pitcher in enumerate(order)}
+    hover = pitch_hover(game)
+    shown = set()
+    for (pitcher, pitch_name), pitch_data in game.groupby(['pitcher', 'pitch_name'], sort=False):
+        if pitcher not in position:
+            continue
+        row, col = position[pitcher]
+        color = pitch_styles.get(pitch_name, pitch_styles['Other'])['color']
+        fig.add_trace(go.Scatter(
+            x=pitch_data['plate_x'], y=pitch_data['plate_z'], mode='markers',
+            marker=dict(size=8, color=color), name=pitch_name, legendgroup=pitch_name,
+            showlegend=pitch_name not in shown,
+            hovertemplate='%{customdata}<extra></extra>', customdata=hover.loc[pitch_data.index],
+        ), row=row, col=col)
+        shown.add(pitch_name)
+
+    for row, col in position.values():
+        fig.add_shape(type='rect', x0=L, x1=R, y0=Bot, y1=Top, line=dict(color='grey', width=1.5), row=row, col=col)
+    fig.update_xaxes(range=[L-2, R+2], showticklabels=False, fixedrange=True)
+    fig.update_yaxes(range=[Bot-2, Top+1.5], showticklabels=False, fixedrange=True)
+    fig.update_layout(
+        title=title,
+        height=380 * rows, showlegend=True,
+        margin=dict(l=5, r=5, t=80, b=5),
+        autosize=True,
+        dragmode=False
+    )
+    return fig
+
+
+def live_location_figure(traces, title=None):
+    # traces: 구종 -> {'plate_x': [...], 'plate_z': [...], 'pitch_number': [...], 'hover': [...]}
+    # LiveGame 이 새 투구를 리스트에 붙여 두므로 여기서는 다시 필터 / groupby 하지 않는다
+    fig = go.Figure()
+    for pitch_name, style in pitch_styles.items():
+        trace = traces.get(pitch_name)
+        if not trace or not trace['plate_x']:
+            continue
+        fig.add_trace(go.Scatter(
+            x=trace['plate_x'], y=trace['plate_z'], mode='markers+text', text=trace['pitch_number'],
+            textposition='top center', marker=dict(size=11, color=style['color']), name=pitch_name,
+            hovertemplate='%{customdata}<extra></extra>', customdata=trace['hover'],
+        ))
+    add_strike_zone(fig)
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(range=[L-2.5, R+2.5], showticklabels=False, fixedrange=True),
+        yaxis=dict(range=[Bot-3, Top+2], showticklabels=False, fixedrange=True),
+        width=550, height=600, showlegend=True,
+        margin=dict(l=5, r=5, t=80, b=5),
+        autosize=True,
+        dragmode=False
+    )
+    return fig
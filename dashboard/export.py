@@ -0,0 +1,131 @@
+import os
+import tempfile
+
+import pandas as pd
+
+from dashboard.queries import (
+    BATTER_DETAIL_COLUMNS, BATTER_DETAIL_RENAME, DETAIL_COLUMNS, DETAIL_RENAME, FT_TO_CM, MPH_TO_KMH,
+)
+from dashboard.store import DATA_DIR, open_dataset
+
+# 한 번에 메모리에 올리는 행 수. 내보내기 크기와 상관없이 이 정도만 유지된다
+EXPORT_BATCH_ROWS = 8192
+
+# 시즌 투구 내보내기 (Summary 와 같은 열 이름)
+SEASON_RENAME = {
+    'game_date': 'Date', 'player_name': 'Pitcher', 'batter_name': 'Batter', 'inning': 'Inn',
+    'pitch_name': 'Type', 'release_speed': 'Velo(km/h)', 'release_spin_rate': 'Spin(rpm)',
+    'pfx_z': 'IVB(cm)', 'pfx_x': 'HB(cm)', 'spin_axis': 'Axis(°)',
+    'release_pos_z': 'RelZ(cm)', 'release_pos_x': 'RelX(cm)', 'release_extension': 'Ext(cm)',
+    'plate_x': 'PlateX', 'plate_z': 'PlateZ', 'description': 'Desc', 'events': 'Result',
+}
+SEASON_COLUMNS = list(SEASON_RENAME.values())
+
+VIEWS = {
+    'pitch_details': (DETAIL_RENAME, DETAIL_COLUMNS),
+    'batter_pitches': (BATTER_DETAIL_RENAME, BATTER_DETAIL_COLUMNS),
+    'season_pitches': (SEASON_RENAME, SEASON_COLUMNS),
+}
+
+# 원본 단위 -> 표시 단위 (format_summary / 페이지와 같은 변환, 소수 첫째 자리)
+UNIT_SCALES = {
+    'release_speed': MPH_TO_KMH, 'launch_speed': MPH_TO_KMH,
+    'pfx_z': FT_TO_CM, 'pfx_x': -FT_TO_CM,
+    'release_pos_z': FT_TO_CM, 'release_pos_x': -FT_TO_CM, 'release_extension': FT_TO_CM,
+}
+
+# 필터 이름 -> 저장소 열
+FILTER_COLUMNS = {
+    'team': 'pitching_team', 'batting_team': 'batting_team', 'pitcher': 'pitcher',
+    'batter': 'batter', 'date': 'game_date', 'inning': 'inning', 'game_pk': 'game_pk',
+}
+
+FORMATS = {'csv': ('text/csv', '.csv'), 'parquet': ('application/vnd.apache.parquet', '.parquet')}
+
+# ------------------------------
+# 📤 Record batch stream
+# ------------------------------
+
+def _filter_expression(filters):
+    import pyarrow.dataset as ds
+
+    expression = None
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name == 'date':
+            value = pd.Timestamp(value).date()
+        elif hasattr(value, 'item'):
+            value = value.item()
+        condition = ds.field(FILTER_COLUMNS[name]) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _display_batch(batch, view):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    rename, columns = VIEWS[view]
+    source = {display: column for column, display in rename.items()}
+    arrays = []
+    for display in columns:
+        array = batch.column(source[display])
+        scale = UNIT_SCALES.get(source[display])
+        if scale is not None:
+            array = pc.round(pc.multiply(array.cast(pa.float64()), scale), 1)
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=columns)
+
+
+def export_batches(view, data_dir=DATA_DIR, season=None, batch_size=EXPORT_BATCH_ROWS, **filters):
+    # (출력 스키마, record batch 이터레이터). 파일 조각 순서 = 날짜 순, 조각 안은 pitch_key 순
+    import pyarrow as pa
+
+    rename, columns = VIEWS[view]
+    scanner = open_dataset(data_dir, season).scanner(
+        columns=list(rename), filter=_filter_expression(filters), batch_size=batch_size, use_threads=False,
+    )
+    schema = _display_batch(pa.RecordBatch.from_pylist([], schema=scanner.projected_schema), view).schema
+    batches = (_display_batch(batch, view) for batch in scanner.to_batches() if batch.num_rows)
+    return schema, batches
+
+
+def write_export(sink, fmt, view, data_dir=DATA_DIR, season=None, **filters):
+    schema, batches = export_batches(view, data_dir, season, **filters)
+    return write_batches(sink, fmt, schema, batches)
+
+
+def write_batches(sink, fmt, schema, batches):
+    import pyarrow.csv as csv
+    import pyarrow.parquet as pq
+
+    writer = pq.ParquetWriter(sink, schema) if fmt == 'parquet' else csv.CSVWriter(sink, schema)
+    rows = 0
+    with writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export_file(fmt, view, data_dir=DATA_DIR, season=None, **filters):
+    # 임시 파일에 배치 단위로 쓰고 열린 파일을 돌려준다 (st.download_button 의 지연 data 용)
+    handle = tempfile.TemporaryFile(suffix=FORMATS[fmt][1])
+    write_export(handle, fmt, view, data_dir, season, **filters)
+    handle.seek(0)
+    return handle
+
+
+def matchup_filters(details, pitcher, game_date, team, batter_name, inning):
+    # Pitch Details (투수 vs 타자, 이닝) 내보내기 필터. 타자 ID 는 로케이션 결측으로 걸러지기 전의
+    # 경기 투구에서 찾는다 (화면의 표가 비어도 선택한 타자만 내보낸다)
+    batters = details.loc[details['batter_name'] == batter_name, 'batter']
+    if batters.empty:
+        raise KeyError(batter_name)
+    return dict(pitcher=pitcher, date=game_date, team=team, batter=batters.iloc[0], inning=int(inning))
+
+
+def export_name(view, fmt, *parts):
+    name = '_'.join(str(p) for p in (view,) + parts if p is not None)
+    return name.replace(' ', '').replace(os.sep, '-') + FORMATS[fmt][1]
@@ -0,0 +1,45 @@
+import json
+import os
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from dashboard.cache import LRUCache, register
+
+# 완성된 figure JSON 캐시 (프로세스 전체에서 세션 간 공유)
+FIGURE_CACHE_BYTES = int(os.environ.get('FIGURE_CACHE_MB', '64')) * 1024 * 1024
+
+figure_cache = register('figures', LRUCache(maxsize=None, maxbytes=FIGURE_CACHE_BYTES))
+
+
+class SerializedFigure(go.Figure):
+    # 직렬화해 둔 figure 를 st.plotly_chart 에 그대로 넘기기 위한 껍데기.
+    # plotly_chart 는 Figure 의 to_dict() 결과를 검증 없이 JSON 으로 보내므로 여기서 캐시된 dict 를 돌려준다.
+    # (dict 로 넘기면 Figure(**dict) 로 다시 검증하고, 빈 data 는 PlotlyEmptyDataError)
+    def __init__(self, spec):
+        self._spec = spec
+        self._parsed = json.loads(spec)
+        layout = self._parsed.get('layout', {})
+        # plotly_chart 가 크기를 읽는 layout 값만 실제 Figure 에 둔다
+        super().__init__(layout={key: layout[key] for key in ('width', 'height') if key in layout})
+
+    def to_dict(self):
+        return self._parsed
+
+    def to_plotly_json(self):
+        return self._parsed
+
+    def to_json(self, *args, **kwargs):
+        return self._spec
+
+
+def figure_key(page, subject, date=None, filters=None, version=None):
+    date = None if date is None else str(date)[:10]
+    filters = tuple(sorted((filters or {}).items()))
+    return (page, str(subject), date, filters, version)
+
+
+def cached_figure(key, build):
+    # 적중 시 figure 생성과 직렬화를 모두 건너뛴다: 캐시에는 JSON 문자열, 돌려주는 값은 그 JSON 을 감싼 Figure
+    spec = figure_cache.get_or_compute(key, lambda: pio.to_json(build(), validate=False))
+    return SerializedFigure(spec)
@@ -0,0 +1,193 @@
+import io
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+from dashboard.queries import (
+    MPH_TO_KMH, SUMMARY_AGGS, format_summary, merge_summary_state, summary_from_state, summary_state,
+)
+from dashboard.store import dedupe_pitches
+
+LIVE_FEED = os.environ.get('LIVE_FEED')
+POLL_SECONDS = float(os.environ.get('LIVE_POLL_SECONDS', 5))
+# 라이브 경기 객체를 공유 캐시에 두는 시간 (초). 경기가 끝난 피드는 이 시간이 지나면 정리된다
+LIVE_GAME_TTL = float(os.environ.get('LIVE_GAME_TTL', 6 * 3600))
+
+# ------------------------------
+# 📡 Pitch feed (로컬 파일 / HTTP)
+# ------------------------------
+
+class FileFeed:
+    # 계속 뒤에 행이 추가되는 CSV / JSON lines 파일. 읽은 위치를 기억해 새 줄만 파싱한다
+    # (경기를 정하지 않아도 poll 비용은 새로 붙은 줄 수에 비례)
+    all_games = True
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.header = None
+
+    def poll(self, since=None, game_pk=None):
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        # 아직 다 쓰이지 않은 마지막 줄은 다음 poll 로 미룬다
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return pd.DataFrame()
+        lines = chunk[:end].decode('utf-8')
+
+        # 파싱에 실패하면 (ValueError) offset / header 를 그대로 두고 다음 poll 에서 같은 줄부터 다시 읽는다
+        header = self.header
+        if self.path.endswith('.jsonl'):
+            new = pd.read_json(io.StringIO(lines), lines=True)
+        else:
+            if header is None:
+                header, _, lines = lines.partition('\n')
+            new = pd.read_csv(io.StringIO(header + '\n' + lines)) if lines else pd.DataFrame()
+        self.offset += end
+        self.header = header
+        return new
+
+
+class HttpFeed:
+    # GET <url>?game_pk=<game_pk>&since=<pitch_key> -> 그 경기 since 이후 투구의 JSON records.
+    # since 는 경기 하나의 위치라서 경기를 정해야 새 투구만 받는다
+    all_games = False
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def poll(self, since=None, game_pk=None):
+        params = {key: value for key, value in [('game_pk', game_pk), ('since', since)] if value is not None}
+        url = f"{self.url}{'&' if '?' in self.url else '?'}{urlencode(params)}" if params else self.url
+        with urlopen(url, timeout=self.timeout) as response:
+            body = response.read()
+        # 잘린 / 깨진 응답은 ValueError -> LiveGame 의 since 는 바뀌지 않아 다음 poll 에서 다시 받는다
+        return pd.DataFrame(json.loads(body))
+
+
+def open_feed(source):
+    if source.startswith(('http://', 'https://')):
+        return HttpFeed(source)
+    return FileFeed(source)
+
+# ------------------------------
+# 🔴 Live game
+# ------------------------------
+
+TRACE_COLUMNS = ['plate_x', 'plate_z', 'pitch_number', 'hover']
+
+
+class LiveGame:
+    def __init__(self, feed, game_pk=None):
+        if game_pk is None and not feed.all_games:
+            # 경기를 정하지 않으면 매 poll 마다 피드 전체를 받게 된다
+            raise ValueError('HTTP 피드는 game_pk 가 필요합니다.')
+        self.feed = feed
+        self.game_pk = game_pk
+        self.pitches = []
+        self.seen = set()
+        # game_pk -> 마지막으로 받은 pitch_key. pitch_key 는 경기 안에서만 증가하므로 경기마다 따로 둔다
+        self.since = {}
+        self.last_poll = 0.0
+        self.version = 0
+        self._state = None
+        # 등판 순서대로 pitcher -> [이름, 팀, 투구 수]
+        self.roster = {}
+        # (pitcher, pitch_name) -> 열 이름 -> 값 리스트. 새 투구는 리스트 뒤에 붙이기만 한다
+        self.traces = {}
+        # _poll_lock: 피드는 한 번에 한 세션만 읽는다 / _lock: 누적 상태를 바꾸거나 읽을 때
+        self._poll_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def refresh(self, min_interval=POLL_SECONDS):
+        # 여러 세션이 같은 LiveGame 을 공유: 마지막 poll 후 min_interval 이 지났을 때만 피드를 읽는다
+        with self._poll_lock:
+            if time.monotonic() - self.last_poll < min_interval:
+                return 0
+            self.last_poll = time.monotonic()
+            new = self.feed.poll(self.since.get(self.game_pk), self.game_pk)
+            with self._lock:
+                return self._append(new)
+
+    def _append(self, new):
+        if new.empty:
+            return 0
+        if self.game_pk is not None:
+            new = new[new['game_pk'] == self.game_pk]
+        new = dedupe_pitches(new)
+        new = new[~new['pitch_key'].isin(self.seen)]
+        if new.empty:
+            return 0
+
+        new = new.sort_values('pitch_key').set_index('pitch_key')
+        new['game_date'] = pd.to_datetime(new['game_date'])
+        if 'pitching_team' not in new.columns:
+            top = new['inning_topbot'] == 'Top'
+            new['pitching_team'] = np.where(top, new['home_team'], new['away_team'])
+            new['batting_team'] = np.where(top, new['away_team'], new['home_team'])
+
+        self.pitches.append(new)
+        self.seen.update(new.index.tolist())
+        for game_pk, last in new.reset_index().groupby('game_pk')['pitch_key'].max().items():
+            self.since[int(game_pk)] = max(int(last), self.since.get(int(game_pk), 0))
+        self._state = merge_summary_state(self._state, summary_state(new))
+        self._append_traces(new)
+        for pitcher, rows in new.groupby('pitcher', sort=False):
+            entry = self.roster.setdefault(pitcher, [rows['player_name'].iloc[0], rows['pitching_team'].iloc[0], 0])
+            entry[2] += len(rows)
+        self.version += 1
+        return len(new)
+
+    def _append_traces(self, new):
+        new = new.dropna(subset=['plate_x', 'plate_z'])
+        hover = (
+            new['pitch_name'].astype(str) + '<br>' + (new['release_speed'] * MPH_TO_KMH).round(1).astype(str)
+            + ' km/h<br>' + new['description'].astype(str)
+        )
+        new = new.assign(hover=hover)
+        for key, rows in new.groupby(['pitcher', 'pitch_name'], sort=False):
+            trace = self.traces.setdefault(key, {column: [] for column in TRACE_COLUMNS})
+            for column in TRACE_COLUMNS:
+                trace[column].extend(rows[column].tolist())
+
+    def frame(self):
+        with self._lock:
+            if not self.pitches:
+                return pd.DataFrame()
+            if len(self.pitches) > 1:
+                # 조각을 한 번 합쳐 두면 다음 호출부터는 복사가 없다
+                self.pitches = [pd.concat(self.pitches)]
+            return self.pitches[0]
+
+    # 아래 조회는 다른 세션의 refresh 와 겹칠 수 있으므로 lock 안에서 복사본을 만들어 돌려준다
+
+    def pitchers(self):
+        with self._lock:
+            rows = [[pitcher] + entry for pitcher, entry in self.roster.items()]
+        return pd.DataFrame(rows, columns=['pitcher', 'player_name', 'pitching_team', 'pitches'])
+
+    def summary(self, pitcher):
+        with self._lock:
+            state = self._state
+        # merge_summary_state 는 새 프레임을 만들므로 잡아 둔 state 는 더 바뀌지 않는다
+        if state is None or pitcher not in state.index.get_level_values(0):
+            return format_summary(pd.DataFrame(columns=list(SUMMARY_AGGS)).rename_axis('pitch_name'))
+        return format_summary(summary_from_state(state.loc[pitcher]))
+
+    def pitcher_traces(self, pitcher):
+        with self._lock:
+            return {
+                pitch_name: {column: list(values) for column, values in trace.items()}
+                for (p, pitch_name), trace in self.traces.items() if p == pitcher
+            }
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+MPH_TO_KMH = 1.60934
+FT_TO_CM = 30.48
+
+SUMMARY_COLUMNS = [
+    'Pitches', 'Velo Min(km/h)', 'Velo Avg(km/h)', 'Velo Max(km/h)', 'Spin(rpm)',
+    'IVB(cm)', 'HB(cm)', 'Axis(°)', 'RelZ(cm)', 'RelX(cm)', 'Ext(cm)'
+]
+
+DETAIL_RENAME = {
+    'pitch_number': 'No', 'pitch_name': 'Type', 'outs_when_up': 'Out',
+    'balls': 'B', 'strikes': 'S', 'release_speed': 'Velo(km/h)',
+    'release_spin_rate': 'Spin(rpm)', 'type': 'Result', 'description': 'Desc'
+}
+DETAIL_COLUMNS = ['No', 'Type', 'Out', 'B', 'S', 'Velo(km/h)', 'Spin(rpm)', 'Result', 'Desc']
+
+# 타자 페이지 Pitch Details
+BATTER_DETAIL_RENAME = {
+    'player_name': 'Pitcher', 'pitch_name': 'Type', 'release_speed': 'Velo(km/h)',
+    'release_spin_rate': 'Spin(rpm)', 'inning': 'Inn', 'outs_when_up': 'Out',
+    'balls': 'B', 'strikes': 'S', 'description': 'Desc', 'events': 'Result',
+    'launch_speed': 'Exit Speed(km/h)', 'launch_angle': 'Launch Angle(°)', 'estimated_ba_using_speedangle': 'xBA'
+}
+BATTER_DETAIL_COLUMNS = [
+    'Inn', 'Pitcher', 'Type', 'Velo(km/h)', 'Spin(rpm)', 'Out', 'B', 'S', 'Desc',
+    'Result', 'Exit Speed(km/h)', 'Launch Angle(°)', 'xBA'
+]
+
+# ------------------------------
+# 👥 팀 / 투수 / 경기 목록
+# ------------------------------
+
+def team_pitchers(store, team):
+    rows = store.team_rows(team)
+    pitchers = rows[['pitcher', 'player_name']].dropna().drop_duplicates('pitcher')
+    return pitchers.sort_values(['player_name', 'pitcher']).reset_index(drop=True)
+
+
+def format_games(games, team_col):
+    # games: 경기당 한 행 (game_date, game_pk, <team_col>, home_team, away_team)
+    games = games.assign(opponent_team=np.where(
+        games['home_team'] == games[team_col], games['away_team'], games['home_team']
+    ))
+    games['date_str'] = games['game_date'].dt.strftime('%Y-%m-%d') + ' ' + games['opponent_team']
+    return games[['game_date', 'game_pk', 'opponent_team', 'date_str']].reset_index(drop=True)
+
+
+def pitcher_games(store, pitcher, team=None):
+    rows = store.pitcher_rows(pitcher, team)
+    return format_games(rows.drop_duplicates('game_pk'), 'pitching_team')
+
+
+def team_batters(store, team):
+    rows = store.batting_team_rows(team)
+    batters = rows[['batter', 'batter_name']].dropna().drop_duplicates('batter')
+    return batters.sort_values(['batter_name', 'batter']).reset_index(drop=True)
+
+
+def batter_games(store, batter, team=None):
+    rows = store.batter_rows(batter, team)
+    return format_games(rows.drop_duplicates('game_pk'), 'batting_team')
+
+
+def game_pitches(store, pitcher, game_date, team=None):
+    rows = store.pitcher_rows(pitcher, team)
+    return rows[rows['game_date'] == pd.Timestamp(game_date)]
+
+
+def batter_game_pitches(store, batter, game_date, team=None):
+    rows = store.batter_rows(batter, team)
+    return rows[rows['game_date'] == pd.Timestamp(game_date)]
+
+
+def team_games(store, team):
+    rows = store.team_rows(team)
+    return format_games(rows.drop_duplicates('game_pk'), 'pitching_team')
+
+
+def game_pitchers(game):
+    # 등판 순서 (첫 투구의 pitch_key 순), 팀별로 모으지 않고 경기 흐름대로
+    pitchers = game.reset_index().groupby('pitcher', sort=False).agg(
+        player_name=('player_name', 'first'),
+        pitching_team=('pitching_team', 'first'),
+        pitches=('pitch_key', 'size'),
+        first_pitch=('pitch_key', 'min'),
+        first_inning=('inning', 'min'),
+        last_inning=('inning', 'max'),
+    )
+    pitchers['innings'] = pitchers['first_inning'].astype(str) + np.where(
+        pitchers['first_inning'] == pitchers['last_inning'], '', '-' + pitchers['last_inning'].astype(str)
+    )
+    pitchers = pitchers.sort_values('first_pitch').drop(columns=['first_pitch', 'first_inning', 'last_inning'])
+    return pitchers.reset_index()
+
+# ------------------------------
+# 📊 Pitch Summary / Details
+# ------------------------------
+
+# 구종별 원시 집계 (단위 변환 전). 다른 쿼리 백엔드도 같은 이름으로 집계한 뒤 format_summary 를 쓴다
+SUMMARY_AGGS = {
+    'pitches': ('pitch_name', 'count'),
+    'velo_min': ('release_speed', 'min'),
+    'velo_avg': ('release_speed', 'mean'),
+    'velo_max': ('release_speed', 'max'),
+    'spin': ('release_spin_rate', 'mean'),
+    'ivb': ('pfx_z', 'mean'),
+    'hb': ('pfx_x', 'mean'),
+    'spin_axis': ('spin_axis', 'mean'),
+    'rel_z': ('release_pos_z', 'mean'),
+    'rel_x': ('release_pos_x', 'mean'),
+    'ext': ('release_extension', 'mean'),
+}
+
+
+def format_summary(raw):
+    summary_df = raw.sort_index()[list(SUMMARY_AGGS)].round(1)
+
+    for col in ['velo_min', 'velo_avg', 'velo_max']:
+        summary_df[col] = (summary_df[col] * MPH_TO_KMH).round(1)
+    summary_df['hb'] = (summary_df['hb'] * FT_TO_CM * -1).round(1)
+    summary_df['ivb'] = (summary_df['ivb'] * FT_TO_CM).round(1)
+    summary_df['rel_z'] = (summary_df['rel_z'] * FT_TO_CM).round(1)
+    summary_df['rel_x'] = (summary_df['rel_x'] * FT_TO_CM * -1).round(1)
+    summary_df['ext'] = (summary_df['ext'] * FT_TO_CM).round(1)
+
+    summary_df.index.name = 'Pitch Type'
+    summary_df.columns = SUMMARY_COLUMNS
+    return summary_df.sort_values('Pitches', ascending=False, kind='stable')
+
+
+def summarize_pitches(pitches):
+    return format_summary(pitches.groupby('pitch_name').agg(**SUMMARY_AGGS))
+
+
+# SUMMARY_AGGS 의 각 항목을 더하기 / min / max 로 합칠 수 있는 상태로 쪼갠다
+_MIN_COLUMNS = [name for name, (_, func) in SUMMARY_AGGS.items() if func == 'min']
+_MAX_COLUMNS = [name for name, (_, func) in SUMMARY_AGGS.items() if func == 'max']
+
+
+def summary_state(pitches, by=('pitcher', 'pitch_name')):
+    # SUMMARY_AGGS 를 더할 수 있는 형태로 집계: 합 / 비결측 개수 / min / max
+    pitches = pitches[pitches['pitch_name'].notna()]
+    values = {}
+    for name, (column, func) in SUMMARY_AGGS.items():
+        if func == 'count':
+            values[f'n_{name}'] = pitches[column].notna()
+        elif func == 'mean':
+            values[f'sum_{name}'] = pitches[column].fillna(0)
+            values[f'n_{name}'] = pitches[column].notna()
+        else:
+            values[name] = pitches[column]
+    frame = pd.DataFrame(values).assign(**{column: pitches[column] for column in by})
+    grouped = frame.groupby(list(by))
+    return pd.concat([
+        grouped[[c for c in frame.columns if c.startswith(('sum_', 'n_'))]].sum(),
+        grouped[_MIN_COLUMNS].min(),
+        grouped[_MAX_COLUMNS].max(),
+    ], axis=1)
+
+
+def merge_summary_state(state, partial):
+    if state is None:
+        return partial
+    additive = [c for c in partial.columns if c.startswith(('sum_', 'n_'))]
+    merged = state[additive].add(partial[additive], fill_value=0)
+    lows = state[_MIN_COLUMNS].combine(partial[_MIN_COLUMNS], np.fmin)
+    highs = state[_MAX_COLUMNS].combine(partial[_MAX_COLUMNS], np.fmax)
+    return pd.concat([merged, lows, highs], axis=1)
+
+
+def rollup_summary_state(state, by=('pitcher', 'pitch_name')):
+    # 더 잘게 쪼갠 상태 (예: 날짜별) 를 by 단위로 합친다
+    grouped = state.groupby(level=list(by))
+    additive = [c for c in state.columns if c.startswith(('sum_', 'n_'))]
+    return pd.concat([grouped[additive].sum(), grouped[_MIN_COLUMNS].min(), grouped[_MAX_COLUMNS].max()], axis=1)
+
+
+def summary_from_state(state):
+    raw = pd.DataFrame(index=state.index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name, (_, func) in SUMMARY_AGGS.items():
+            if func == 'count':
+                raw[name] = state[f'n_{name}'].astype(int)
+            elif func == 'mean':
+                raw[name] = state[f'sum_{name}'] / state[f'n_{name}'].replace(0, np.nan)
+            else:
+                raw[name] = state[name]
+    return raw
+
+
+def game_summaries(game, pitchers):
+    # 경기 전체를 (투수, 구종) 으로 한 번만 집계한 뒤 투수별로 잘라 포맷
+    raw = game.groupby(['pitcher', 'pitch_name']).agg(**SUMMARY_AGGS)
+    return {pitcher: format_summary(raw.loc[pitcher]) for pitcher in pitchers if pitcher in raw.index}
+
+
+def pitch_summary(store, pitcher, game_date, team=None):
+    return summarize_pitches(game_pitches(store, pitcher, game_date, team))
+
+
+def pitch_details(store, pitcher, game_date, team=None, batter=None, inning=None):
+    pitches = game_pitches(store, pitcher, game_date, team)
+    if batter is not None:
+        pitches = pitches[pitches['batter'] == batter]
+    if inning is not None:
+        pitches = pitches[pitches['inning'] == inning]
+    # 저장소가 pitch_key 로 정렬 + 중복 제거되어 있으므로 추가 정렬 / drop_duplicates 불필요
+    return pitches.assign(release_speed=(pitches['release_speed'] * MPH_TO_KMH).round(1))
+
+
+# ------------------------------
+# 🆚 Matchup Summary (타자별)
+# ------------------------------
+
+WHIFF_DESCRIPTIONS = ['swinging_strike', 'swinging_strike_blocked', 'missed_bunt']
+MATCHUP_COLUMNS = ['PA', 'Pitches', 'Whiffs', 'In Play', 'xBA']
+
+
+def format_matchups(raw):
+    # raw: batter_name 인덱스 + pa, pitches, whiffs, in_play, xba
+    matchup_df = raw.sort_index()[['pa', 'pitches', 'whiffs', 'in_play', 'xba']].copy()
+    matchup_df[['pa', 'pitches', 'whiffs', 'in_play']] = matchup_df[['pa', 'pitches', 'whiffs', 'in_play']].astype(int)
+    matchup_df['xba'] = matchup_df['xba'].astype(float).round(3)
+    matchup_df.index.name = 'Batter'
+    matchup_df.columns = MATCHUP_COLUMNS
+    return matchup_df
+
+
+def summarize_matchups(pitches):
+    flags = pitches.assign(
+        whiff=pitches['description'].isin(WHIFF_DESCRIPTIONS),
+        in_play=pitches['type'] == 'X',
+    )
+    raw = flags.groupby('batter_name').agg(
+        pa=('at_bat_number', 'nunique'),
+        pitches=('at_bat_number', 'size'),
+        whiffs=('whiff', 'sum'),
+        in_play=('in_play', 'sum'),
+        xba=('estimated_ba_using_speedangle', 'mean'),
+    )
+    return format_matchups(raw)
+
+
+def matchup_summary(store, pitcher, game_date, team=None):
+    return summarize_matchups(game_pitches(store, pitcher, game_date, team))
+
+
+def display_details(pitches):
+    return pitches.rename(columns=DETAIL_RENAME)[DETAIL_COLUMNS]
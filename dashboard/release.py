@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.queries import FT_TO_CM
+
+# 가장 잘게 쪼갠 단위. 경기 / 시즌 / 구종 단위는 모두 이 합계를 다시 더해서 만든다
+KEYS = ['pitching_team', 'pitcher', 'game_pk', 'pitch_name', 'inning']
+GAME_KEYS = ['pitching_team', 'pitcher', 'game_pk']
+SEASON_KEYS = ['pitching_team', 'pitcher']
+
+MOMENT_COLUMNS = ['release_pos_x', 'release_pos_z', 'release_extension', 'plate_x', 'plate_z']
+INDEX_COLUMNS = KEYS + ['player_name'] + MOMENT_COLUMNS
+# 표시 단위 (Pitch Summary 와 같이 RelX 는 부호를 뒤집는다)
+SCALES = dict.fromkeys(MOMENT_COLUMNS, FT_TO_CM) | {'release_pos_x': -FT_TO_CM}
+
+# 구종 쌍 비교는 양쪽 모두 이만큼 던졌을 때만
+MIN_PAIR_PITCHES = 5
+
+DISPERSION_RENAME = {
+    'n': 'Pitches', 'mean_release_pos_x': 'RelX(cm)', 'mean_release_pos_z': 'RelZ(cm)',
+    'mean_release_extension': 'Ext(cm)', 'std_release_pos_x': 'σRelX(cm)', 'std_release_pos_z': 'σRelZ(cm)',
+    'std_release_extension': 'σExt(cm)', 'spread': 'Spread(cm)',
+}
+DRIFT_RENAME = {
+    'inning': 'Inn', 'n': 'Pitches', 'mean_release_pos_x': 'RelX(cm)', 'mean_release_pos_z': 'RelZ(cm)',
+    'mean_release_extension': 'Ext(cm)', 'step': 'Step(cm)', 'drift': 'Drift(cm)',
+}
+PAIR_RENAME = {
+    'pitch_name_a': 'Type A', 'pitch_name_b': 'Type B', 'release_sep': 'Release Sep(cm)',
+    'plate_sep': 'Plate Sep(cm)', 'tunnel_ratio': 'Plate / Release',
+}
+STAFF_RENAME = {
+    'player_name': 'Pitcher', 'n': 'Pitches', 'games': 'G', 'spread': 'Spread(cm)',
+    'game_spread': 'Game Spread(cm)', 'max_step': 'Max Step(cm)', 'drift': 'Drift(cm)',
+}
+
+# ------------------------------
+# 🧮 한 번의 집계 (n / 합 / 제곱합)
+# ------------------------------
+
+def moments(pitches, keys=KEYS):
+    # 시즌 전체를 KEYS 로 factorize 한 뒤 열마다 bincount 세 번 -> 그룹별 n / sum / sum of squares
+    rows = pitches.dropna(subset=keys)
+    codes, groups = pd.MultiIndex.from_frame(rows[keys]).factorize()
+    size = len(groups)
+    sums = {}
+    for column in MOMENT_COLUMNS:
+        values = rows[column].to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        values = np.where(present, values, 0.0)
+        sums[f'n_{column}'] = np.bincount(codes, present, size)
+        sums[f'sum_{column}'] = np.bincount(codes, values, size)
+        sums[f'sq_{column}'] = np.bincount(codes, values * values, size)
+    sums['n'] = np.bincount(codes, minlength=size).astype(float)
+    return pd.DataFrame(sums, index=groups.set_names(keys)).sort_index()
+
+
+def rollup(state, keys):
+    return state.groupby(level=keys, sort=True).sum()
+
+
+def statistics(state):
+    # 평균 / 표본 표준편차 (cm). spread = 릴리스 포인트 (x, z) 의 2차원 표준편차
+    out = pd.DataFrame({'n': state['n'].astype(int)}, index=state.index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for column in MOMENT_COLUMNS:
+            n = state[f'n_{column}']
+            mean = state[f'sum_{column}'] / n
+            var = (state[f'sq_{column}'] - n * mean * mean) / (n - 1)
+            out[f'mean_{column}'] = mean * SCALES[column]
+            out[f'var_{column}'] = np.where(n > 1, var.clip(lower=0), np.nan) * FT_TO_CM ** 2
+    for column in MOMENT_COLUMNS:
+        out[f'std_{column}'] = np.sqrt(out[f'var_{column}'])
+    out['spread'] = np.sqrt(out['var_release_pos_x'] + out['var_release_pos_z'])
+    return out
+
+
+def inning_drift(innings):
+    # 이닝별 평균 릴리스 포인트: 직전 이닝 대비 이동(step) / 첫 이닝 대비 이동(drift)
+    grouped = innings.groupby(level=GAME_KEYS, sort=False)
+    dx = grouped['mean_release_pos_x'].diff()
+    dz = grouped['mean_release_pos_z'].diff()
+    fx = innings['mean_release_pos_x'] - grouped['mean_release_pos_x'].transform('first')
+    fz = innings['mean_release_pos_z'] - grouped['mean_release_pos_z'].transform('first')
+    return innings.assign(step=np.hypot(dx, dz), drift=np.hypot(fx, fz))
+
+
+def pair_separation(types, group_keys):
+    # 같은 그룹 안 구종 쌍마다 평균 릴리스 포인트 거리와 평균 도착 위치 거리
+    flat = types[types['n'] >= MIN_PAIR_PITCHES].reset_index()
+    columns = group_keys + ['pitch_name', 'mean_release_pos_x', 'mean_release_pos_z', 'mean_plate_x', 'mean_plate_z']
+    pairs = flat[columns].merge(flat[columns], on=group_keys, suffixes=('_a', '_b'))
+    pairs = pairs[pairs['pitch_name_a'] < pairs['pitch_name_b']]
+    release = np.hypot(pairs['mean_release_pos_x_a'] - pairs['mean_release_pos_x_b'],
+                       pairs['mean_release_pos_z_a'] - pairs['mean_release_pos_z_b'])
+    plate = np.hypot(pairs['mean_plate_x_a'] - pairs['mean_plate_x_b'], pairs['mean_plate_z_a'] - pairs['mean_plate_z_b'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = plate / release
+    pairs = pairs.assign(release_sep=release, plate_sep=plate, tunnel_ratio=ratio)
+    return pairs[group_keys + ['pitch_name_a', 'pitch_name_b', 'release_sep', 'plate_sep', 'tunnel_ratio']]
+
+# ------------------------------
+# 📐 시즌 전체 릴리스 지표 (데이터 버전당 한 번 계산)
+# ------------------------------
+
+class ReleaseMetrics:
+    def __init__(self, pitches, version=None):
+        self.version = version
+        self.names = pitches.groupby('pitcher', sort=False)['player_name'].last()
+        state = moments(pitches)
+
+        # 모든 단위를 한 번에 계산해 두고 조회는 인덱스 슬라이스만
+        self.game_types = statistics(rollup(state, GAME_KEYS + ['pitch_name']))
+        self.games = statistics(rollup(state, GAME_KEYS))
+        self.innings = inning_drift(statistics(rollup(state, GAME_KEYS + ['inning'])))
+        self.season_types = statistics(rollup(state, SEASON_KEYS + ['pitch_name']))
+        self.season = statistics(rollup(state, SEASON_KEYS))
+        pair_keys = ['pitch_name_a', 'pitch_name_b']
+        self.game_pairs = pair_separation(self.game_types, GAME_KEYS).set_index(GAME_KEYS + pair_keys).sort_index()
+        self.season_pairs = pair_separation(self.season_types, SEASON_KEYS).set_index(SEASON_KEYS + pair_keys).sort_index()
+
+        # 경기별 요약 (최대 step / 마지막 이닝 drift) -> 투수별 평균
+        by_game = self.innings.groupby(level=GAME_KEYS, sort=True)
+        self.game_drift = pd.DataFrame({'max_step': by_game['step'].max(), 'drift': by_game['drift'].last()})
+
+    @staticmethod
+    def _slice(table, key):
+        # 정렬된 MultiIndex 앞쪽 level 로 이진 탐색 후 그 level 들은 떼어 낸다
+        start, stop = table.index.slice_locs(key, key)
+        return table.iloc[start:stop].droplevel(list(range(len(key))))
+
+    @staticmethod
+    def _display(table, rename, index=None):
+        table = table.reset_index() if index is None else table.reset_index().set_index(index)
+        columns = [c for c in rename if c in table.columns]
+        return table[columns].rename(columns=rename).round(2 if 'tunnel_ratio' in columns else 1)
+
+    def game_report(self, team, pitcher, game_pk):
+        key = (team, pitcher, game_pk)
+        types = self._display(self._slice(self.game_types, key), DISPERSION_RENAME, 'pitch_name')
+        types.index.name = 'Pitch Type'
+        innings = self._display(self._slice(self.innings, key), DRIFT_RENAME)
+        pairs = self._display(self._slice(self.game_pairs, key), PAIR_RENAME)
+        return types, innings, pairs
+
+    def season_report(self, team, pitcher):
+        key = (team, pitcher)
+        types = self._display(self._slice(self.season_types, key), DISPERSION_RENAME, 'pitch_name')
+        types.index.name = 'Pitch Type'
+        pairs = self._display(self._slice(self.season_pairs, key), PAIR_RENAME)
+        return types, pairs
+
+    def staff_report(self, team):
+        # 팀 투수별 시즌 일관성: 시즌 전체 spread / 경기 평균 spread / 경기당 최대 step, drift 평균
+        season = self._slice(self.season, (team,))
+        games = self._slice(self.games, (team,)).groupby(level='pitcher')
+        drift = self._slice(self.game_drift, (team,)).groupby(level='pitcher')
+        report = pd.DataFrame({
+            'player_name': self.names.reindex(season.index).to_numpy(),
+            'n': season['n'],
+            'games': games.size(),
+            'spread': season['spread'],
+            'game_spread': games['spread'].mean(),
+            'max_step': drift['max_step'].mean(),
+            'drift': drift['drift'].mean(),
+        }, index=season.index)
+        report = report.sort_values('n', ascending=False)
+        return report[list(STAFF_RENAME)].rename(columns=STAFF_RENAME).round(1).reset_index(drop=True)
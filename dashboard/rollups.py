@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard.queries import MPH_TO_KMH
+from dashboard.store import DATA_DIR, aggregates_dir
+
+SWING_DESCRIPTIONS = [
+    'swinging_strike', 'swinging_strike_blocked', 'foul', 'foul_tip',
+    'hit_into_play', 'foul_bunt', 'missed_bunt', 'bunt_foul_tip',
+]
+WHIFF_DESCRIPTIONS = ['swinging_strike', 'swinging_strike_blocked', 'missed_bunt']
+HARD_HIT_MPH = 95
+
+# (batter, game) 단위 부분 합계. 전부 더하기만 하면 되는 값이라 구간 합 = 누적합 차이
+PARTIAL_COLUMNS = [
+    'pitches', 'swings', 'whiffs', 'out_zone', 'chases',
+    'batted_balls', 'ev_sum', 'hard_hits', 'xba_count', 'xba_sum',
+]
+
+WINDOWS = {'Season': None, 'Last 30 days': 30, 'Last 15 days': 15, 'Last 7 days': 7}
+TREND_METRICS = ['xBA', 'EV(km/h)', 'Hard-Hit%', 'Whiff%', 'Chase%']
+
+# ------------------------------
+# 🧮 Partial aggregates (ingest 시 생성)
+# ------------------------------
+
+def batter_game_partials(pitches):
+    swing = pitches['description'].isin(SWING_DESCRIPTIONS)
+    out_zone = pitches['zone'] > 9
+    batted = pitches['launch_speed'].notna() & (pitches['type'] == 'X')
+    xba = pitches['estimated_ba_using_speedangle']
+
+    flags = pd.DataFrame({
+        'batter': pitches['batter'].to_numpy(),
+        'game_pk': pitches['game_pk'].to_numpy(),
+        'game_date': pitches['game_date'].to_numpy(),
+        'pitches': 1,
+        'swings': swing.to_numpy(),
+        'whiffs': pitches['description'].isin(WHIFF_DESCRIPTIONS).to_numpy(),
+        'out_zone': out_zone.to_numpy(),
+        'chases': (swing & out_zone).to_numpy(),
+        'batted_balls': batted.to_numpy(),
+        'ev_sum': pitches['launch_speed'].where(batted, 0).to_numpy(),
+        'hard_hits': (batted & (pitches['launch_speed'] >= HARD_HIT_MPH)).to_numpy(),
+        'xba_count': xba.notna().to_numpy(),
+        'xba_sum': xba.fillna(0).to_numpy(),
+    })
+    partials = flags.groupby(['batter', 'game_pk', 'game_date'], sort=False)[PARTIAL_COLUMNS].sum()
+    return partials.reset_index()
+
+
+def update_partials(existing, pitches, dates=None):
+    # 새로 들어온 경기만 다시 집계하고 나머지 경기의 부분 합계는 그대로 둔다.
+    # dates: 다시 집계할 game_date 목록 (pitches 는 그 날짜의 투구 전부). 그 날짜의 예전 합계를 통째로
+    # 버리므로 취소되거나 다른 날짜로 옮겨진 경기도 빠진다
+    fresh = batter_game_partials(pitches)
+    if existing is None or existing.empty:
+        return fresh
+    if dates is None:
+        stale = existing['game_pk'].isin(fresh['game_pk'].unique())
+    else:
+        stale = existing['game_date'].isin(pd.to_datetime(list(dates)))
+    return pd.concat([existing[~stale], fresh], ignore_index=True)
+
+
+def partials_path(data_dir, season):
+    return os.path.join(aggregates_dir(data_dir, season), 'batter_games.parquet')
+
+
+def load_partials(data_dir=DATA_DIR, season=None):
+    path = partials_path(data_dir, season)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def write_partials(pitches, season, data_dir=DATA_DIR, full_refresh=True, dates=None):
+    existing = None if full_refresh else load_partials(data_dir, season)
+    partials = update_partials(existing, pitches, dates)
+    partials = partials.sort_values(['batter', 'game_date', 'game_pk']).reset_index(drop=True)
+
+    path = partials_path(data_dir, season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partials.to_parquet(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    return path
+
+# ------------------------------
+# 📈 Rolling windows (누적합 조회)
+# ------------------------------
+
+def _rates(sums):
+    # sums: PARTIAL_COLUMNS 순서의 2차원 배열
+    s = dict(zip(PARTIAL_COLUMNS, np.atleast_2d(sums).T))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'Pitches': s['pitches'].astype(int),
+            'EV(km/h)': (s['ev_sum'] / s['batted_balls'] * MPH_TO_KMH).round(1),
+            'Hard-Hit%': (s['hard_hits'] / s['batted_balls'] * 100).round(1),
+            'xBA': (s['xba_sum'] / s['xba_count']).round(3),
+            'Whiff%': (s['whiffs'] / s['swings'] * 100).round(1),
+            'Chase%': (s['chases'] / s['out_zone'] * 100).round(1),
+        })
+
+
+class BatterTrends:
+    def __init__(self, partials, version=None):
+        partials = partials.sort_values(['batter', 'game_date', 'game_pk']).reset_index(drop=True)
+        self.version = version
+        self.dates = partials['game_date'].to_numpy(dtype='datetime64[D]')
+        # 앞에 0 행을 둔 전역 누적합: 행 구간 [a, b) 의 합 = prefix[b] - prefix[a]
+        values = partials[PARTIAL_COLUMNS].to_numpy(dtype=float)
+        self.prefix = np.vstack([np.zeros((1, len(PARTIAL_COLUMNS))), np.cumsum(values, axis=0)])
+        bounds = partials.groupby('batter', sort=False).indices
+        self._ranges = {batter: (idx[0], idx[-1] + 1) for batter, idx in bounds.items()}
+
+    def _bounds(self, batter, end_dates, days):
+        start, stop = self._ranges[batter]
+        dates = self.dates[start:stop]
+        end_dates = np.asarray(end_dates, dtype='datetime64[D]')
+        b = start + np.searchsorted(dates, end_dates, side='right')
+        if days is None:
+            a = np.full_like(b, start)
+        else:
+            a = start + np.searchsorted(dates, end_dates - np.timedelta64(days - 1, 'D'), side='left')
+        return a, b
+
+    def window(self, batter, end_date=None, days=None):
+        if batter not in self._ranges:
+            return _rates(np.zeros(len(PARTIAL_COLUMNS))).iloc[0]
+        start, stop = self._ranges[batter]
+        end_date = self.dates[stop - 1] if end_date is None else np.datetime64(pd.Timestamp(end_date).date())
+        a, b = self._bounds(batter, [end_date], days)
+        return _rates(self.prefix[b] - self.prefix[a]).iloc[0]
+
+    def trend(self, batter, days=None):
+        # 출전 경기일마다 그 날짜에서 끝나는 구간 값 (days=None 이면 시즌 누적)
+        if batter not in self._ranges:
+            return _rates(np.zeros((0, len(PARTIAL_COLUMNS)))).assign(game_date=pd.Series(dtype='datetime64[ns]'))
+        start, stop = self._ranges[batter]
+        end_dates = np.unique(self.dates[start:stop])
+        a, b = self._bounds(batter, end_dates, days)
+        trend = _rates(self.prefix[b] - self.prefix[a])
+        trend.insert(0, 'game_date', pd.to_datetime(end_dates))
+        return trend
@@ -0,0 +1,122 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+import pandas as pd
+
+# 토큰 앞부분 이 길이까지는 접두어 사전, 그보다 긴 질의는 trigram 교집합 후 확인
+PREFIX_LENGTH = 6
+MAX_RESULTS = 20
+
+ROLE_COLUMNS = {'pitcher': ('pitcher', 'pitching_team'), 'batter': ('batter', 'batting_team')}
+INDEX_COLUMNS = ['pitcher', 'pitching_team', 'batter', 'batting_team', 'game_date']
+
+
+def normalize(text):
+    # 악센트 / 구두점 제거 + 소문자: "Acuña Jr., Ronald" -> "acuna jr ronald"
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r'[^a-z0-9 ]+', ' ', text).split()
+
+
+def _trigrams(token, prefix=False):
+    # prefix=True: 검색어는 토큰의 앞부분일 수 있으므로 끝 padding ("gu ") 은 만들지 않는다
+    padded = f'  {token}' if prefix else f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    # 항목 하나 = (선수, 역할, 팀). 트레이드된 선수는 팀마다 따로 나온다
+    def __init__(self, players, pitches=None):
+        entries = players.dropna(subset=['player_name']).drop_duplicates(['player_id', 'role', 'team'])
+        self.entries = entries.reset_index(drop=True)
+        self._records = self.entries[['player_id', 'player_name', 'team', 'role']].to_dict('records')
+        self.dates = self._game_dates(pitches) if pitches is not None else {}
+
+        self._prefix = defaultdict(set)
+        self._trigram = defaultdict(set)
+        self._tokens = []
+        for i, name in enumerate(self.entries['player_name']):
+            tokens = normalize(name)
+            self._tokens.append(tokens)
+            for token in tokens:
+                for n in range(1, min(len(token), PREFIX_LENGTH) + 1):
+                    self._prefix[token[:n]].add(i)
+                for gram in _trigrams(token):
+                    self._trigram[gram].add(i)
+        # ID 로도 찾을 수 있게
+        self._by_id = defaultdict(list)
+        for i, player_id in enumerate(self.entries['player_id']):
+            self._by_id[str(int(player_id))].append(i)
+
+    @staticmethod
+    def _game_dates(pitches):
+        dates = {}
+        for role, (id_col, team_col) in ROLE_COLUMNS.items():
+            games = pitches[[id_col, team_col, 'game_date']].drop_duplicates()
+            for (player_id, team), group in games.groupby([id_col, team_col], sort=False):
+                dates[(player_id, role, team)] = pd.to_datetime(group['game_date']).sort_values().to_numpy()
+        return dates
+
+    def _token_matches(self, token):
+        if len(token) <= PREFIX_LENGTH:
+            return self._prefix.get(token, set())
+        grams = sorted((self._trigram.get(g, set()) for g in _trigrams(token, prefix=True)), key=len)
+        candidates = set.intersection(*grams) if grams else set()
+        return {i for i in candidates if any(t.startswith(token) for t in self._tokens[i])}
+
+    def search(self, query, role=None, limit=MAX_RESULTS):
+        query = str(query).strip()
+        if not query:
+            return []
+        if query.isdigit():
+            hits = set(self._by_id.get(query, []))
+        else:
+            tokens = normalize(query)
+            if not tokens:
+                return []
+            # 모든 토큰이 이름의 어떤 단어의 접두어여야 한다 (순서 무관: "ohtani sho" / "sho ohtani")
+            hits = None
+            for token in sorted(tokens, key=len, reverse=True):
+                matches = self._token_matches(token)
+                hits = set(matches) if hits is None else hits & matches
+                if not hits:
+                    return []
+
+        results = []
+        for i in hits:
+            record = self._records[i]
+            if role is not None and record['role'] != role:
+                continue
+            dates = self.dates.get((record['player_id'], record['role'], record['team']), ())
+            results.append(dict(record, games=len(dates), game_dates=dates))
+        # 출전 경기가 많은 순 -> 이름 순
+        results.sort(key=lambda r: (-r['games'], r['player_name']))
+        return results[:limit]
+
+
+def build_index(data_dir, season, pitches):
+    from dashboard.store import load_players
+
+    return PlayerIndex(load_players(data_dir, season), pitches[INDEX_COLUMNS])
+
+
+def result_label(result):
+    label = f"{result['player_name']} ({result['team']}, {result['role']})"
+    dates = result['game_dates']
+    if len(dates):
+        first, last = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+        label += f" · {result['games']} G · {first:%m-%d} ~ {last:%m-%d}"
+    return label
+
+
+def results_frame(results):
+    return pd.DataFrame([{
+        'player_id': r['player_id'], 'player_name': r['player_name'], 'team': r['team'], 'role': r['role'],
+        'games': r['games'],
+        'game_dates': [pd.Timestamp(d).strftime('%Y-%m-%d') for d in r['game_dates']],
+    } for r in results], columns=['player_id', 'player_name', 'team', 'role', 'games', 'game_dates'])
+
+
+def division_of(divisions, team):
+    return next((division for division, teams in divisions.items() if team in teams), None)
@@ -0,0 +1,35 @@
+# ------------------------------
+# 📅 시즌별 설정 (데이터 소스 / 팀 구성)
+# ------------------------------
+
+DIVISIONS_2025 = {
+    'NL East': ['PHI', 'NYM', 'MIA', 'WSH', 'ATL'],
+    'NL Central': ['CHC', 'MIL', 'STL', 'CIN', 'PIT'],
+    'NL West': ['LAD', 'SD', 'SF', 'AZ', 'COL'],
+    'AL East': ['NYY', 'BOS', 'TOR', 'TB', 'BAL'],
+    'AL Central': ['DET', 'KC', 'CLE', 'MIN', 'CWS'],
+    'AL West': ['TEX', 'LAA', 'HOU', 'ATH', 'SEA']
+}
+
+# 2024 시즌까지 Athletics 약어는 OAK
+DIVISIONS_2024 = {
+    division: ['OAK' if team == 'ATH' else team for team in teams]
+    for division, teams in DIVISIONS_2025.items()
+}
+
+SEASONS = {
+    2023: {'drive_id': None, 'batter_id_file': None, 'divisions': DIVISIONS_2024},
+    2024: {'drive_id': None, 'batter_id_file': None, 'divisions': DIVISIONS_2024},
+    2025: {
+        'drive_id': '1vZB9axWHpzUB5ixNG9Q3JtxTxQsCDMD4',
+        'batter_id_file': 'Batter_ID(2025).xlsx',
+        'divisions': DIVISIONS_2025,
+    },
+    2026: {'drive_id': None, 'batter_id_file': None, 'divisions': DIVISIONS_2025},
+}
+
+DEFAULT_SEASON = 2025
+
+
+def season_config(season):
+    return SEASONS.get(int(season), {'drive_id': None, 'batter_id_file': None, 'divisions': DIVISIONS_2025})
@@ -0,0 +1,236 @@
+import argparse
+import io
+import itertools
+import json
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from dashboard import cache, export, search
+from dashboard.backends import BACKENDS, QUERY_BACKEND
+from dashboard.seasons import DEFAULT_SEASON
+from dashboard.store import DATA_DIR, available_seasons, read_manifest
+
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+
+# ------------------------------
+# 🔎 Query service (UI 없이 사용하는 API)
+# ------------------------------
+
+class QueryService:
+    def __init__(self, data_dir=DATA_DIR, cache_size=512, backend=None):
+        self.data_dir = data_dir
+        self.backend_name = backend or QUERY_BACKEND
+        self.cache = cache.register('query_responses', cache.LRUCache(cache_size))
+        self._backends = {}
+        self._indexes = cache.register('server_player_index', cache.LRUCache(2, sizeof=cache.estimate_nbytes))
+
+    def backend(self, season=DEFAULT_SEASON):
+        # 다시 적재되어 시즌 버전이 바뀌었을 때만 새로 연다 (다른 시즌은 그대로)
+        season = int(season)
+        version = read_manifest(self.data_dir, season)['version']
+        backend = self._backends.get(season)
+        if backend is None or backend.version != version:
+            backend = self._backends[season] = BACKENDS[self.backend_name](self.data_dir, season)
+        return backend
+
+    def player_index(self, season=DEFAULT_SEASON):
+        backend = self.backend(season)
+        return self._indexes.get_or_compute(
+            (int(season), backend.version),
+            lambda: search.build_index(self.data_dir, season, backend.pitches(columns=search.INDEX_COLUMNS)),
+        )
+
+    def run(self, name, season=DEFAULT_SEASON, **params):
+        backend = self.backend(season)
+        if name == 'player_search':
+            results = self.player_index(season).search(params['q'], params.get('role'))
+            return search.results_frame(results)
+        if name == 'team_pitchers':
+            return backend.team_pitchers(params['team'])
+        if name == 'pitcher_games':
+            return backend.pitcher_games(params['pitcher'], params.get('team'))
+        if name == 'pitch_summary':
+            return backend.pitch_summary(params['pitcher'], params['date'], params.get('team')).reset_index()
+        if name == 'matchup_summary':
+            return backend.matchup_summary(params['pitcher'], params['date'], params.get('team')).reset_index()
+        if name == 'pitch_details':
+            return backend.pitch_details(
+                params['pitcher'], params['date'], params.get('team'),
+                params.get('batter'), params.get('inning'),
+            ).reset_index()
+        raise KeyError(name)
+
+    def respond(self, name, fmt='json', season=DEFAULT_SEASON, **params):
+        # 응답 캐시 키: 쿼리 + 파라미터 + 포맷 + 데이터 버전. 날짜 하나만 보는 쿼리는 그 날짜 파티션의 버전이라
+        # 다른 날짜가 추가 / 수정되어도 캐시가 유지된다
+        backend = self.backend(season)
+        version = backend.partition_version(params['date']) if 'date' in params else backend.version
+        key = (name, tuple(sorted(params.items())), fmt, version)
+        return self.cache.get_or_compute(key, lambda: encode(self.run(name, season, **params), fmt))
+
+
+def encode(df, fmt):
+    if fmt == 'arrow':
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return df.to_json(orient='records', date_format='iso', force_ascii=False).encode('utf-8')
+
+# ------------------------------
+# 🌐 HTTP
+# ------------------------------
+# GET /health
+# 모든 경로는 ?season=YYYY 를 받는다 (기본 DEFAULT_SEASON)
+# GET /teams/<team>/pitchers
+# GET /pitchers/<id>/games[?team=]
+# GET /pitchers/<id>/summary?date=YYYY-MM-DD[&team=]
+# GET /pitchers/<id>/matchups?date=YYYY-MM-DD[&team=]
+# GET /pitchers/<id>/pitches?date=YYYY-MM-DD[&team=&batter=&inning=]
+# GET /players/search?q=<이름 접두어 또는 ID>[&role=pitcher|batter]
+# GET /export/<pitch_details|batter_pitches|season_pitches>?format=csv|parquet[&team=&pitcher=&batter=&date=&inning=&game_pk=]
+#     (응답을 record batch 단위로 바로 써 보내므로 크기와 상관없이 메모리 일정)
+# format=arrow 또는 Accept: application/vnd.apache.arrow.stream 이면 Arrow IPC 응답
+
+INT_PARAMS = ('season', 'batter', 'inning')
+EXPORT_INT_PARAMS = ('season', 'pitcher', 'batter', 'inning', 'game_pk')
+
+
+def route(path, query):
+    parts = [p for p in path.split('/') if p]
+    params = {k: v[-1] for k, v in query.items() if k != 'format'}
+    for k in INT_PARAMS:
+        if k in params:
+            params[k] = int(params[k])
+
+    if parts == ['players', 'search']:
+        params['q'] = params.get('q', '')
+        return 'player_search', params
+    if len(parts) == 3 and parts[0] == 'teams' and parts[2] == 'pitchers':
+        params['team'] = parts[1]
+        return 'team_pitchers', params
+    if len(parts) == 3 and parts[0] == 'pitchers':
+        params['pitcher'] = int(parts[1])
+        name = {
+            'games': 'pitcher_games', 'summary': 'pitch_summary',
+            'matchups': 'matchup_summary', 'pitches': 'pitch_details',
+        }.get(parts[2])
+        if name is None:
+            return None, None
+        if name != 'pitcher_games':
+            params['date'] = pd.Timestamp(params['date']).strftime('%Y-%m-%d')
+        return name, params
+    return None, None
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+
+            if url.path == '/health':
+                versions = {season: read_manifest(service.data_dir, season)['version'] for season in available_seasons(service.data_dir)}
+                return self._send(200, json.dumps({'versions': versions}).encode(), 'application/json')
+
+            if url.path == '/metrics':
+                # 이 프로세스에 등록된 캐시의 적중률 / 크기 / 내보낸 수 (Prometheus text)
+                return self._send(200, cache.metrics_text().encode(), 'text/plain; version=0.0.4')
+
+            if url.path.startswith('/export/'):
+                return self._export(url.path[len('/export/'):].strip('/'), query)
+
+            try:
+                name, params = route(url.path, query)
+            except (KeyError, ValueError) as e:
+                return self._send(400, json.dumps({'error': f'bad parameter: {e}'}).encode(), 'application/json')
+            if name is None:
+                return self._send(404, b'{"error": "not found"}', 'application/json')
+
+            fmt = query.get('format', [''])[-1]
+            if not fmt:
+                fmt = 'arrow' if ARROW_MIME in self.headers.get('Accept', '') else 'json'
+            season = params.pop('season', DEFAULT_SEASON)
+            if season not in available_seasons(service.data_dir):
+                return self._send(404, json.dumps({'error': f'season {season} not stored'}).encode(), 'application/json')
+            try:
+                body = service.respond(name, fmt, season, **params)
+            except (KeyError, ValueError, TypeError) as e:
+                # 필수 파라미터 누락 / 잘못된 값
+                return self._send(400, json.dumps({'error': f'bad parameter: {e}'}).encode(), 'application/json')
+            except Exception as e:
+                traceback.print_exc()
+                return self._send(500, json.dumps({'error': f'{type(e).__name__}: {e}'}).encode(), 'application/json')
+            self._send(200, body, ARROW_MIME if fmt == 'arrow' else 'application/json')
+
+        def _export(self, view, query):
+            params = {k: v[-1] for k, v in query.items() if k != 'format'}
+            fmt = query.get('format', ['csv'])[-1]
+            if view not in export.VIEWS or fmt not in export.FORMATS:
+                return self._send(404, b'{"error": "not found"}', 'application/json')
+            try:
+                for k in EXPORT_INT_PARAMS:
+                    if k in params:
+                        params[k] = int(params[k])
+                season = params.pop('season', DEFAULT_SEASON)
+                unknown = set(params) - set(export.FILTER_COLUMNS)
+                if unknown:
+                    raise KeyError(', '.join(sorted(unknown)))
+            except (KeyError, ValueError) as e:
+                return self._send(400, json.dumps({'error': f'bad parameter: {e}'}).encode(), 'application/json')
+            if season not in available_seasons(service.data_dir):
+                return self._send(404, json.dumps({'error': f'season {season} not stored'}).encode(), 'application/json')
+
+            # 헤더를 보내면 상태 코드를 바꿀 수 없으므로 필터 해석과 첫 배치 읽기까지 먼저 끝낸다
+            # (date=garbage 같은 값이나 열 타입과 맞지 않는 값은 여기서 400)
+            try:
+                schema, batches = export.export_batches(view, service.data_dir, season, **params)
+                first = next(batches, None)
+            except (KeyError, ValueError, TypeError) as e:
+                return self._send(400, json.dumps({'error': f'bad parameter: {e}'}).encode(), 'application/json')
+            except Exception as e:
+                traceback.print_exc()
+                return self._send(500, json.dumps({'error': f'{type(e).__name__}: {e}'}).encode(), 'application/json')
+
+            # Content-Length 없이 스트리밍 (HTTP/1.0: 연결 종료가 응답 끝)
+            self.send_response(200)
+            self.send_header('Content-Type', export.FORMATS[fmt][0])
+            self.send_header('Content-Disposition', f'attachment; filename="{export.export_name(view, fmt, season)}"')
+            self.end_headers()
+            export.write_batches(self.wfile, fmt, schema, itertools.chain([] if first is None else [first], batches))
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(data_dir=DATA_DIR, host='127.0.0.1', port=8502, cache_size=512, backend=None):
+    service = QueryService(data_dir, cache_size, backend)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f'📡 serving {data_dir} (seasons {available_seasons(data_dir)}, {service.backend_name}) on http://{host}:{port}')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pitch data query service')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--cache-size', type=int, default=512)
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=QUERY_BACKEND)
+    args = parser.parse_args()
+    serve(args.data_dir, args.host, args.port, args.cache_size, args.backend)
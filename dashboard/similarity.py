@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.queries import SUMMARY_AGGS, format_summary, rollup_summary_state, summary_from_state, summary_state
+from dashboard.store import changed_partitions
+
+# 구종 프로필 = 시즌 Pitch Summary 의 평균값들 (spin axis 는 원형 값이라 sin / cos 로)
+FEATURES = ['velo_avg', 'spin', 'ivb', 'hb', 'axis_sin', 'axis_cos', 'rel_z', 'rel_x', 'ext']
+# 표준화 후 가중치. sin / cos 두 성분이 축 하나를 나눠 가진다
+FEATURE_WEIGHTS = np.array([1.0, 1.0, 1.0, 1.0, 0.7, 0.7, 0.5, 0.5, 0.5])
+MIN_PITCHES = 20
+
+# 인덱스를 만들 때 저장소에서 읽는 열
+INDEX_COLUMNS = ['game_date', 'pitcher', 'player_name', 'pitching_team', 'p_throws', 'pitch_name'] + sorted(
+    {column for column, _ in SUMMARY_AGGS.values()} - {'pitch_name'})
+
+NEIGHBOR_COLUMNS = ['Pitcher', 'Team', 'Type', 'Distance'] + ['Pitches', 'Velo Avg(km/h)', 'Spin(rpm)', 'IVB(cm)', 'HB(cm)', 'Axis(°)', 'RelZ(cm)', 'RelX(cm)', 'Ext(cm)']
+PLAYER_COLUMNS = ['player_name', 'pitching_team', 'p_throws']
+
+
+def feature_matrix(raw, hands, mirror=True):
+    # raw: summary_from_state 결과 ((pitcher, pitch_name) 인덱스, 원 단위)
+    hb = raw['hb'].to_numpy(dtype=float)
+    rel_x = raw['rel_x'].to_numpy(dtype=float)
+    axis = raw['spin_axis'].to_numpy(dtype=float)
+    if mirror:
+        # 좌투수는 좌우를 뒤집어 우투수와 같은 좌표계에서 비교
+        lefty = (hands.reindex(raw.index.get_level_values('pitcher')) == 'L').to_numpy()
+        hb = np.where(lefty, -hb, hb)
+        rel_x = np.where(lefty, -rel_x, rel_x)
+        axis = np.where(lefty, 360 - axis, axis)
+    radians = np.radians(axis)
+    return np.column_stack([
+        raw['velo_avg'], raw['spin'], raw['ivb'], hb,
+        np.sin(radians), np.cos(radians), raw['rel_z'], rel_x, raw['ext'],
+    ]).astype(float)
+
+
+def _dated_state(pitches):
+    # (game_date, pitcher, pitch_name) 단위 합계 + 날짜별 투수 정보
+    state = summary_state(pitches, by=('game_date', 'pitcher', 'pitch_name'))
+    players = pitches.groupby(['game_date', 'pitcher'])[PLAYER_COLUMNS].last()
+    return state, players
+
+
+def _drop_dates(frame, dates):
+    return frame[~frame.index.get_level_values('game_date').isin(pd.to_datetime(list(dates)))]
+
+
+class SimilarityIndex:
+    # 날짜별 부분 합계를 들고 있다가 데이터가 바뀌면 바뀐 날짜 (manifest 파티션 해시 기준) 만 다시 집계하고
+    # 시즌 프로필 -> 트리는 작은 행렬이라 통째로 다시 만든다
+    def __init__(self, version=None, mirror=True, min_pitches=MIN_PITCHES):
+        self.version = version
+        self.mirror = mirror
+        self.min_pitches = min_pitches
+        # game_date -> {'rows', 'hash'} (이 인덱스가 반영한 manifest 파티션)
+        self.partitions = {}
+        self._state = None
+        self._players = None
+        self.tree = None
+
+    @classmethod
+    def from_pitches(cls, pitches, version=None, partitions=None, **kwargs):
+        index = cls(version, **kwargs)
+        index.partitions = dict(partitions or {})
+        index._state, index._players = _dated_state(pitches)
+        index._build()
+        return index
+
+    def changed_dates(self, partitions):
+        return changed_partitions(self.partitions, partitions)
+
+    def updated(self, pitches, dates, version=None, partitions=None):
+        # pitches: dates 날짜의 투구 전부. 그 날짜의 예전 합계는 버리고 새로 더한 인덱스를 돌려준다
+        # (이 인덱스는 그대로 두므로 다른 세션이 쓰는 중이어도 된다)
+        index = SimilarityIndex(version, self.mirror, self.min_pitches)
+        index.partitions = dict(partitions or {})
+        state, players = _dated_state(pitches)
+        index._state = pd.concat([_drop_dates(self._state, dates), state]).sort_index()
+        index._players = pd.concat([_drop_dates(self._players, dates), players]).sort_index()
+        index._build()
+        return index
+
+    def _build(self):
+        # pitcher -> (이름, 팀, 투구 손). 시즌 중 팀을 옮긴 투수는 마지막 등판 값
+        self.players = self._players.groupby(level='pitcher').last()
+        raw = summary_from_state(rollup_summary_state(self._state))
+        raw = raw[raw['pitches'] >= self.min_pitches]
+        matrix = feature_matrix(raw, self.players['p_throws'], self.mirror)
+        complete = ~np.isnan(matrix).any(axis=1)
+        self.raw = raw[complete]
+        matrix = matrix[complete]
+
+        # 빈 시즌 (적재 직후 등) 은 평균 / 표준편차를 0 / 1 로 두고 빈 인덱스를 만든다
+        self.mean = matrix.mean(axis=0) if len(matrix) else np.zeros(len(FEATURES))
+        std = matrix.std(axis=0) if len(matrix) else np.zeros(len(FEATURES))
+        self.std = np.where(std > 0, std, 1.0)
+        self.vectors = (matrix - self.mean) / self.std * FEATURE_WEIGHTS
+        self.keys = list(self.raw.index)
+        self.position = {key: i for i, key in enumerate(self.keys)}
+        self.pitch_names = self.raw.index.get_level_values('pitch_name').to_numpy()
+
+        from scipy.spatial import cKDTree  # 첫 화면에서는 로드하지 않는다
+
+        self.tree = cKDTree(self.vectors) if len(self.vectors) else None
+
+    def __contains__(self, key):
+        return key in self.position
+
+    def pitch_types(self, pitcher):
+        return [name for p, name in self.keys if p == pitcher]
+
+    def _query(self, vector, k):
+        distances, positions = self.tree.query(vector, k=min(k, len(self.vectors)))
+        return np.atleast_1d(distances), np.atleast_1d(positions)
+
+    def neighbors(self, pitcher, pitch_name, k=10, same_type=False):
+        i = self.position[(pitcher, pitch_name)]
+        vector = self.vectors[i]
+        # 같은 구종만 볼 때는 충분히 모일 때까지 후보 수를 늘려 가며 질의
+        want = k + 1
+        while True:
+            distances, positions = self._query(vector, want)
+            keep = positions != i
+            if same_type:
+                keep &= self.pitch_names[positions] == pitch_name
+            if keep.sum() >= k or want >= len(self.vectors):
+                break
+            want *= 4
+        distances, positions = distances[keep][:k], positions[keep][:k]
+        return self._neighbor_frame(distances, positions)
+
+    def _neighbor_frame(self, distances, positions):
+        rows = self.raw.iloc[positions]
+        pitchers = rows.index.get_level_values('pitcher')
+        players = self.players.reindex(pitchers)
+        # 표시 단위는 Pitch Summary 와 동일 (format_summary 는 투구 수로 정렬하므로 위치로 되돌림)
+        display = format_summary(rows.reset_index(drop=True)).sort_index()
+        display.insert(0, 'Distance', np.round(distances, 2))
+        display.insert(0, 'Type', rows.index.get_level_values('pitch_name'))
+        display.insert(0, 'Team', players['pitching_team'].to_numpy())
+        display.insert(0, 'Pitcher', players['player_name'].to_numpy())
+        return display[NEIGHBOR_COLUMNS].reset_index(drop=True)
+
+
+def refresh_index(previous, version, partitions, read):
+    # previous: 같은 시즌의 이전 버전 인덱스 (없으면 None). read(dates) -> 그 날짜의 투구, dates=None 이면 시즌 전체.
+    # 파티션 해시가 없는 예전 manifest 는 바뀐 날짜를 알 수 없으므로 처음부터 만든다
+    if previous is None or not partitions or not previous.partitions:
+        return SimilarityIndex.from_pitches(read(None), version, partitions)
+    dates = previous.changed_dates(partitions)
+    return previous.updated(read(dates), dates, version, partitions)
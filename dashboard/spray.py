@@ -0,0 +1,141 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard.queries import MPH_TO_KMH
+from dashboard.store import DATA_DIR, aggregates_dir
+
+# Statcast hc_x / hc_y 는 화면 픽셀 좌표. 홈플레이트 위치와 배율로 필드 좌표(ft)로 바꾼다
+HOME_X, HOME_Y = 125.42, 198.27
+HC_TO_FT = 2.5
+
+# 중견수 방향 0°, 우측 +. 파울라인(±45°) 사이를 5개 구역으로
+SECTOR_EDGES = np.linspace(-45, 45, 6)
+SECTORS = ['LF', 'LC', 'CF', 'RC', 'RF']
+DISTANCE_EDGES = [0, 150, 250, 330, np.inf]
+BANDS = ['Infield', 'Shallow', 'Deep', 'Wall']
+BAND_CENTERS_FT = [90, 200, 290, 360]
+
+LA_EDGES = [-np.inf, 10, 25, 50, np.inf]
+LA_BUCKETS = ['GB (<10°)', 'LD (10-25°)', 'FB (25-50°)', 'PU (50°+)']
+EV_EDGES_MPH = [-np.inf, 80, 95, 105, np.inf]
+EV_BUCKETS = ['<129', '129-153', '153-169', '169+']  # km/h
+
+# 발사각 / 타구속도가 없는 타구의 구간 번호. 구역 합계에는 들어가고 구간표에서는 빠진다
+MISSING_BUCKET = -1
+
+BIN_COLUMNS = ['sector', 'band', 'la_bucket', 'ev_bucket']
+SPRAY_COLUMNS = ['batted_balls', 'ev_count', 'ev_sum', 'xba_count', 'xba_sum', 'hits']
+HIT_EVENTS = ['single', 'double', 'triple', 'home_run']
+
+# ------------------------------
+# 📐 Coordinates & bins
+# ------------------------------
+
+def field_coordinates(hc_x, hc_y):
+    x = (np.asarray(hc_x, dtype=float) - HOME_X) * HC_TO_FT
+    y = (HOME_Y - np.asarray(hc_y, dtype=float)) * HC_TO_FT
+    return x, y
+
+
+def _bucket(values, edges):
+    # 구간 번호 (0 부터). 경계 밖 값은 양 끝 구간으로, 값이 없으면 MISSING_BUCKET
+    values = np.asarray(values, dtype=float)
+    buckets = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    return np.where(np.isnan(values), MISSING_BUCKET, buckets)
+
+
+def batted_balls(pitches):
+    balls = pitches[(pitches['type'] == 'X') & pitches['hc_x'].notna() & pitches['hc_y'].notna()]
+    x, y = field_coordinates(balls['hc_x'], balls['hc_y'])
+    angle = np.degrees(np.arctan2(x, y))
+    distance = np.hypot(x, y)
+    return balls.assign(
+        field_x=x, field_y=y, spray_angle=angle, distance=distance,
+        sector=_bucket(angle, SECTOR_EDGES).astype('int8'),
+        band=_bucket(distance, DISTANCE_EDGES).astype('int8'),
+        la_bucket=_bucket(balls['launch_angle'], LA_EDGES).astype('int8'),
+        ev_bucket=_bucket(balls['launch_speed'], EV_EDGES_MPH).astype('int8'),
+    )
+
+# ------------------------------
+# 🧮 Partial aggregates (ingest 시 생성)
+# ------------------------------
+
+def spray_partials(pitches):
+    balls = batted_balls(pitches)
+    xba = balls['estimated_ba_using_speedangle']
+    flags = pd.DataFrame({
+        'batter': balls['batter'].to_numpy(),
+        'batting_team': balls['batting_team'].to_numpy(),
+        'game_pk': balls['game_pk'].to_numpy(),
+        'game_date': balls['game_date'].to_numpy(),
+        **{column: balls[column].to_numpy() for column in BIN_COLUMNS},
+        'batted_balls': 1,
+        'ev_count': balls['launch_speed'].notna().to_numpy(),
+        'ev_sum': balls['launch_speed'].fillna(0).to_numpy(),
+        'xba_count': xba.notna().to_numpy(),
+        'xba_sum': xba.fillna(0).to_numpy(),
+        'hits': balls['events'].isin(HIT_EVENTS).to_numpy(),
+    })
+    keys = ['batter', 'batting_team', 'game_pk', 'game_date'] + BIN_COLUMNS
+    return flags.groupby(keys, sort=False)[SPRAY_COLUMNS].sum().reset_index()
+
+
+def spray_path(data_dir, season):
+    return os.path.join(aggregates_dir(data_dir, season), 'batter_spray.parquet')
+
+
+def load_spray(data_dir=DATA_DIR, season=None):
+    path = spray_path(data_dir, season)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def write_spray(pitches, season, data_dir=DATA_DIR):
+    partials = spray_partials(pitches).sort_values(['batter', 'game_date', 'game_pk']).reset_index(drop=True)
+    path = spray_path(data_dir, season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partials.to_parquet(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    return path
+
+# ------------------------------
+# 🔎 Bin lookups (페이지용)
+# ------------------------------
+
+def select(partials, batter=None, team=None, game_pk=None):
+    mask = np.ones(len(partials), dtype=bool)
+    if batter is not None:
+        mask &= partials['batter'].to_numpy() == batter
+    if team is not None:
+        mask &= partials['batting_team'].to_numpy() == team
+    if game_pk is not None:
+        mask &= partials['game_pk'].to_numpy() == game_pk
+    return partials[mask]
+
+
+def sector_bins(partials):
+    bins = partials.groupby(['sector', 'band'], sort=False)[SPRAY_COLUMNS].sum().reset_index()
+    sector = bins['sector'].to_numpy()
+    band = bins['band'].to_numpy()
+    theta = np.radians((SECTOR_EDGES[:-1] + SECTOR_EDGES[1:]) / 2)[sector]
+    radius = np.asarray(BAND_CENTERS_FT, dtype=float)[band]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return bins.assign(
+            x=radius * np.sin(theta), y=radius * np.cos(theta),
+            zone=np.char.add(np.char.add(np.array(SECTORS)[sector], ' '), np.array(BANDS)[band]),
+            ev=(bins['ev_sum'] / bins['ev_count'] * MPH_TO_KMH).round(1),
+            xba=(bins['xba_sum'] / bins['xba_count']).round(3),
+        )
+
+
+def bucket_table(partials):
+    # 발사각 x 타구속도 구간별 타구 수 (둘 중 하나라도 없는 타구는 reindex 에서 빠진다)
+    counts = partials.groupby(['la_bucket', 'ev_bucket'])['batted_balls'].sum()
+    table = counts.unstack(fill_value=0).reindex(
+        index=range(len(LA_BUCKETS)), columns=range(len(EV_BUCKETS)), fill_value=0,
+    )
+    table.index = LA_BUCKETS
+    table.columns = [f'EV {label}' for label in EV_BUCKETS]
+    return table.rename_axis('Launch Angle')
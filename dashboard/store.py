@@ -0,0 +1,437 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.seasons import DEFAULT_SEASON, SEASONS, season_config
+
+DATA_DIR = os.environ.get('PITCH_DATA_DIR', 'data')
+DRIVE_URL = 'https://drive.google.com/uc?id={}'
+MANIFEST_FILE = '_manifest.json'
+VERSIONS_DIR = '.versions'
+
+logger = logging.getLogger(__name__)
+
+# 저장소 구조
+#   data/pitches/season=2025/game_date=2025-04-01/part-0.parquet
+#   data/pitches/season=2025/_manifest.json   (파티션별 내용 해시 + 시즌 버전)
+#   data/dims/season=2025/teams.parquet, players.parquet
+#   season=2025 는 .versions/season=2025.<ns> 를 가리키는 symlink (적재할 때 링크만 바꿔치기)
+
+
+def season_dir(data_dir, season):
+    return os.path.join(data_dir, 'pitches', f'season={int(season)}')
+
+
+def dims_dir(data_dir, season):
+    return os.path.join(data_dir, 'dims', f'season={int(season)}')
+
+
+def aggregates_dir(data_dir, season):
+    return os.path.join(data_dir, 'aggregates', f'season={int(season)}')
+
+
+def available_seasons(data_dir=DATA_DIR):
+    root = os.path.join(data_dir, 'pitches')
+    if not os.path.isdir(root):
+        return []
+    seasons = []
+    for name in os.listdir(root):
+        if name.startswith('season=') and name[len('season='):].isdigit() and os.path.exists(os.path.join(root, name, MANIFEST_FILE)):
+            seasons.append(int(name.split('=', 1)[1]))
+    return sorted(seasons)
+
+
+def selectable_seasons(data_dir=DATA_DIR):
+    # 이미 적재된 시즌 + Google Drive 소스가 설정된 시즌
+    configured = [season for season, config in SEASONS.items() if config['drive_id']]
+    return sorted(set(available_seasons(data_dir)) | set(configured))
+
+# ------------------------------
+# 📥 Ingest (CSV -> 시즌/날짜 파티션)
+# ------------------------------
+
+# ------------------------------
+# 🔑 Canonical pitch key (game_pk, at_bat_number, pitch_number)
+# ------------------------------
+
+PITCH_KEY = ['game_pk', 'at_bat_number', 'pitch_number']
+
+
+def pitch_key(df):
+    # 정수 하나로 합친 키: 정렬 순서가 (game_pk, at_bat_number, pitch_number) 와 같다
+    return (
+        df['game_pk'].astype('int64') * 100_000
+        + df['at_bat_number'].astype('int64') * 100
+        + df['pitch_number'].astype('int64')
+    )
+
+
+def dedupe_pitches(df):
+    # 같은 투구가 여러 번 들어오면 파일에서 나중에 나온 행(최신 수정본)을 남긴다
+    df = df.dropna(subset=PITCH_KEY)
+    key = pitch_key(df)
+    keep = ~key.duplicated(keep='last').to_numpy()
+    return df[keep].assign(pitch_key=key[keep])
+
+
+def prepare_frame(df, batter_ID=None):
+    df = dedupe_pitches(df[df['game_type'] == 'R'])
+    df['game_date'] = pd.to_datetime(df['game_date'])
+
+    # 투구팀 / 타격팀을 미리 계산해 두면 팀 필터가 단일 비교로 끝난다
+    top = df['inning_topbot'] == 'Top'
+    df['pitching_team'] = np.where(top, df['home_team'], df['away_team'])
+    df['batting_team'] = np.where(top, df['away_team'], df['home_team'])
+
+    if batter_ID is not None and 'batter_name' not in df.columns:
+        df = pd.merge(df, batter_ID[['batter', 'batter_name']], on='batter', how='left')
+    if 'batter_name' not in df.columns:
+        df['batter_name'] = np.nan
+    # 이름표에 없는 타자는 ID로 표시
+    df['batter_name'] = df['batter_name'].fillna(df['batter'].astype(str))
+
+    df = df.sort_values(['game_date', 'pitch_key'])
+    return df.reset_index(drop=True)
+
+
+def _swap_dir(tmp_path, path):
+    # path 는 .versions/ 아래 실제 디렉터리를 가리키는 symlink. 새 링크를 os.replace 로 덮어쓰므로
+    # 읽는 쪽은 언제나 예전 또는 새 디렉터리 하나를 온전히 본다 (manifest 가 없는 순간이 없다)
+    parent, name = os.path.split(path)
+    os.makedirs(os.path.join(parent, VERSIONS_DIR), exist_ok=True)
+    target = os.path.join(VERSIONS_DIR, f'{name}.{time.time_ns()}')
+    os.replace(tmp_path, os.path.join(parent, target))
+    previous = os.readlink(path) if os.path.islink(path) else None
+
+    link = path + '.link'
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(target, link)
+    if os.path.isdir(path) and previous is None:
+        # 예전 구조(실제 디렉터리)를 처음 옮길 때 한 번만 잠깐 비어 있다
+        os.replace(path, path + '.old')
+        os.replace(link, path)
+        shutil.rmtree(path + '.old', ignore_errors=True)
+    else:
+        os.replace(link, path)
+
+    # 방금 밀려난 버전은 읽던 쪽을 위해 한 세대 남기고 그보다 오래된 것만 지운다
+    keep = {os.path.basename(target), os.path.basename(previous or '')}
+    for entry in os.listdir(os.path.join(parent, VERSIONS_DIR)):
+        if entry.startswith(name + '.') and entry not in keep:
+            shutil.rmtree(os.path.join(parent, VERSIONS_DIR, entry), ignore_errors=True)
+
+
+# ------------------------------
+# 🔏 Dataset fingerprint (내용 해시 + 최대 game_date)
+# ------------------------------
+
+def partition_fingerprints(df):
+    # game_date 파티션별 행 수와 내용 해시. 적재 데이터는 (game_date, pitch_key) 로 정렬되어 있어
+    # 같은 내용이면 항상 같은 해시가 나온다
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    dates = df['game_date'].dt.strftime('%Y-%m-%d').to_numpy()
+    partitions = {}
+    for date, positions in pd.Series(dates).groupby(dates, sort=True).indices.items():
+        digest = hashlib.blake2b(row_hashes[positions].tobytes(), digest_size=8).hexdigest()
+        partitions[date] = {'rows': len(positions), 'hash': digest}
+    return partitions
+
+
+def content_hash(partitions):
+    digest = hashlib.blake2b(digest_size=8)
+    for date in sorted(partitions):
+        digest.update(f"{date}:{partitions[date]['hash']};".encode())
+    return digest.hexdigest()
+
+
+def dataset_version(season, partitions):
+    # 같은 내용 -> 같은 버전: 다시 적재해도 내용이 그대로면 버전에 묶인 캐시가 그대로 살아 있다
+    max_game_date = max(partitions) if partitions else None
+    return f'{int(season)}@{max_game_date}-{content_hash(partitions)}'
+
+
+def changed_partitions(old_partitions, new_partitions):
+    # 추가 / 변경 / 삭제된 game_date 목록
+    dates = set(old_partitions) | set(new_partitions)
+    return sorted(d for d in dates if (old_partitions.get(d) or {}).get('hash') != (new_partitions.get(d) or {}).get('hash'))
+
+
+def partition_version(manifest, date):
+    # 날짜 하나에 묶인 캐시용 버전. 해시가 없는 예전 manifest 는 시즌 버전으로 대신한다
+    date = str(date)[:10]
+    entry = manifest.get('partitions', {}).get(date)
+    return f"{date}-{entry['hash']}" if entry else manifest['version']
+
+
+def write_season(df, season, data_dir=DATA_DIR, partitions=None):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    path = season_dir(data_dir, season)
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    table = pa.Table.from_pandas(df.assign(game_date=df['game_date'].dt.date), preserve_index=False)
+    ds.write_dataset(
+        table, tmp_path, format='parquet',
+        partitioning=ds.partitioning(pa.schema([('game_date', pa.date32())]), flavor='hive'),
+        basename_template='part-{i}.parquet', preserve_order=True,
+    )
+
+    if partitions is None:
+        partitions = partition_fingerprints(df)
+    manifest = {
+        'season': int(season),
+        'rows': len(df),
+        'max_game_date': df['game_date'].max().strftime('%Y-%m-%d') if len(df) else None,
+        'content_hash': content_hash(partitions),
+        'version': dataset_version(season, partitions),
+        'written_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'partitions': partitions,
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+
+    _swap_dir(tmp_path, path)
+    return path
+
+
+def write_dims(df, season, data_dir=DATA_DIR):
+    path = dims_dir(data_dir, season)
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    teams = pd.DataFrame(
+        [(team, division) for division, teams in season_config(season)['divisions'].items() for team in teams],
+        columns=['team', 'division'],
+    )
+    teams.to_parquet(os.path.join(tmp_path, 'teams.parquet'), index=False)
+
+    pitchers = df[['pitcher', 'player_name', 'pitching_team']].dropna(subset=['pitcher'])
+    pitchers.columns = ['player_id', 'player_name', 'team']
+    batter_cols = ['batter', 'batter_name', 'batting_team'] if 'batter_name' in df.columns else ['batter', 'batting_team']
+    batters = df[batter_cols].rename(columns={'batter': 'player_id', 'batter_name': 'player_name', 'batting_team': 'team'})
+    players = pd.concat([pitchers.assign(role='pitcher'), batters.assign(role='batter')], ignore_index=True)
+    players = players.drop_duplicates(['player_id', 'role', 'team']).reset_index(drop=True)
+    players.to_parquet(os.path.join(tmp_path, 'players.parquet'), index=False)
+
+    _swap_dir(tmp_path, path)
+    return path
+
+
+def ingest_frame(df, season, data_dir=DATA_DIR):
+    # 한 시즌 분량의 원본 Statcast 행 -> 투구 데이터셋 + 차원 테이블 + 사전 집계
+    from dashboard import rollups, spray
+
+    batter_id_file = season_config(season)['batter_id_file']
+    batter_ID = pd.read_excel(batter_id_file) if batter_id_file and os.path.exists(batter_id_file) else None
+    season_df = prepare_frame(df, batter_ID)
+    partitions = partition_fingerprints(season_df)
+    path = season_dir(data_dir, season)
+
+    # 내용이 같으면 아무것도 다시 쓰지 않는다 (버전이 그대로라 캐시도 그대로)
+    old_partitions = read_manifest(data_dir, season).get('partitions', {}) if int(season) in available_seasons(data_dir) else {}
+    changed = changed_partitions(old_partitions, partitions)
+    if not changed and os.path.isdir(aggregates_dir(data_dir, season)):
+        logger.info('⏭️ %s: 변경 없음 (%s)', season, dataset_version(season, partitions))
+        return path
+    logger.info('🔄 %s: %d개 날짜 변경 -> %s', season, len(changed), dataset_version(season, partitions))
+
+    write_season(season_df, season, data_dir, partitions)
+    write_dims(season_df, season, data_dir)
+    if old_partitions and os.path.exists(rollups.partials_path(data_dir, season)):
+        # 바뀐 날짜만 다시 집계 (없어진 날짜는 투구가 0개라 예전 합계만 지워진다)
+        changed_rows = season_df[season_df['game_date'].dt.strftime('%Y-%m-%d').isin(changed)]
+        rollups.write_partials(changed_rows, season, data_dir, full_refresh=False, dates=changed)
+    else:
+        rollups.write_partials(season_df, season, data_dir)
+    spray.write_spray(season_df, season, data_dir)
+    return path
+
+
+def ingest_csv(csv_path, data_dir=DATA_DIR, season=None):
+    df = pd.read_csv(csv_path)
+    df = df[df['game_type'] == 'R']
+    years = pd.to_datetime(df['game_date']).dt.year
+
+    paths = []
+    for year in sorted(years.unique()) if season is None else [int(season)]:
+        paths.append(ingest_frame(df[years == year], int(year), data_dir))
+    return paths
+
+
+def download_from_drive(season=DEFAULT_SEASON, data_dir=DATA_DIR):
+    import gdown
+
+    drive_id = season_config(season)['drive_id']
+    if drive_id is None:
+        raise ValueError(f'{season} 시즌의 Google Drive 파일이 설정되어 있지 않습니다.')
+    os.makedirs(data_dir, exist_ok=True)
+    output = os.path.join(data_dir, f'data_{int(season)}.csv')
+    gdown.download(DRIVE_URL.format(drive_id), output, quiet=False)
+    return ingest_csv(output, data_dir, season)
+
+# ------------------------------
+# 🔍 Scan (시즌 / 날짜 필터 pushdown)
+# ------------------------------
+
+def read_manifest(data_dir, season):
+    with open(os.path.join(season_dir(data_dir, season), MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+_download_lock = threading.Lock()
+
+
+def ensure_season(season, data_dir=DATA_DIR):
+    # 저장된 시즌이면 manifest 버전만 읽고, 없으면 한 번만 받아서 적재한 뒤 버전을 돌려준다.
+    # 페이지는 rerun 마다 이 버전으로 로더를 부르므로 새로 적재된 시즌만 다시 연다
+    if int(season) not in available_seasons(data_dir):
+        with _download_lock:
+            if int(season) not in available_seasons(data_dir):
+                download_from_drive(season, data_dir)
+    return read_manifest(data_dir, season)['version']
+
+
+def open_dataset(data_dir, season):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # 해당 시즌 디렉터리만 탐색하므로 다른 시즌 파일은 열지도 나열하지도 않는다
+    return ds.dataset(
+        season_dir(data_dir, season), format='parquet',
+        partitioning=ds.partitioning(pa.schema([('game_date', pa.date32())]), flavor='hive'),
+    )
+
+
+def scan(data_dir, season, start=None, end=None, columns=None, dates=None):
+    # dates: 이 game_date 들만 (바뀐 파티션만 다시 읽을 때)
+    import pyarrow.dataset as ds
+
+    dataset = open_dataset(data_dir, season)
+    date_filter = None
+    if start is not None:
+        date_filter = ds.field('game_date') >= pd.Timestamp(start).date()
+    if end is not None:
+        end_filter = ds.field('game_date') <= pd.Timestamp(end).date()
+        date_filter = end_filter if date_filter is None else date_filter & end_filter
+    if dates is not None:
+        dates_filter = ds.field('game_date').isin([pd.Timestamp(date).date() for date in dates])
+        date_filter = dates_filter if date_filter is None else date_filter & dates_filter
+
+    df = dataset.to_table(columns=columns, filter=date_filter).to_pandas()
+    if 'game_date' in df.columns:
+        df['game_date'] = pd.to_datetime(df['game_date'])
+    if 'pitch_key' in df.columns:
+        # 적재 시 중복 제거 + 정렬이 끝났으므로 키를 그대로 인덱스로 쓴다
+        df = df.set_index('pitch_key')
+    return df
+
+
+def load_teams(data_dir, season):
+    return pd.read_parquet(os.path.join(dims_dir(data_dir, season), 'teams.parquet'))
+
+
+def load_players(data_dir, season):
+    return pd.read_parquet(os.path.join(dims_dir(data_dir, season), 'players.parquet'))
+
+
+def load_divisions(data_dir, season):
+    teams = load_teams(data_dir, season)
+    return {division: group['team'].tolist() for division, group in teams.groupby('division', sort=False)}
+
+# ------------------------------
+# 🗂️ Indexed store (시즌 단위)
+# ------------------------------
+
+class PitchStore:
+    def __init__(self, df, version, season=None, partitions=None):
+        self.df = df
+        self.version = version
+        self.season = season
+        self.manifest = {'version': version, 'partitions': partitions or {}}
+        # 팀 / 투수별 행 위치 인덱스 (game_date 정렬 순서 유지)
+        self._by_team = df.groupby('pitching_team', sort=False).indices
+        self._by_pitcher = df.groupby('pitcher', sort=False).indices
+        self._by_batting_team = df.groupby('batting_team', sort=False).indices
+        self._by_batter = df.groupby('batter', sort=False).indices
+        self._by_game = df.groupby('game_pk', sort=False).indices
+
+    @classmethod
+    def open(cls, data_dir=DATA_DIR, season=DEFAULT_SEASON, start=None, end=None):
+        manifest = read_manifest(data_dir, season)
+        version = manifest['version']
+        if start is not None or end is not None:
+            version = f'{version}:{start}:{end}'
+        return cls(scan(data_dir, season, start, end), version, int(season), manifest.get('partitions'))
+
+    def partition_version(self, date):
+        return partition_version(self.manifest, date)
+
+    def team_rows(self, team):
+        positions = self._by_team.get(team)
+        if positions is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[positions]
+
+    def pitcher_rows(self, pitcher, team=None):
+        positions = self._by_pitcher.get(pitcher)
+        if positions is None:
+            return self.df.iloc[:0]
+        rows = self.df.iloc[positions]
+        if team is not None:
+            rows = rows[rows['pitching_team'] == team]
+        return rows
+
+    def batting_team_rows(self, team):
+        positions = self._by_batting_team.get(team)
+        if positions is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[positions]
+
+    def batter_rows(self, batter, team=None):
+        positions = self._by_batter.get(batter)
+        if positions is None:
+            return self.df.iloc[:0]
+        rows = self.df.iloc[positions]
+        if team is not None:
+            rows = rows[rows['batting_team'] == team]
+        return rows
+
+    def game_rows(self, game_pk):
+        positions = self._by_game.get(game_pk)
+        if positions is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[positions]
+
+
+def open_store(season=DEFAULT_SEASON, data_dir=DATA_DIR):
+    ensure_season(season, data_dir)
+    return PitchStore.open(data_dir, season)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Refresh the local pitch store')
+    parser.add_argument('--csv', help='이미 받은 Savant CSV 경로 (없으면 Google Drive에서 다운로드)')
+    parser.add_argument('--season', type=int, help='CSV를 특정 시즌으로 적재 (기본: game_date 연도별로 분할)')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.csv:
+        paths = ingest_csv(args.csv, args.data_dir, args.season)
+    else:
+        paths = download_from_drive(args.season or DEFAULT_SEASON, args.data_dir)
+    for path in paths:
+        print(f'✅ {path}')
@@ -0,0 +1,123 @@
+import streamlit as st
+
+from dashboard import cache, queries, store
+from dashboard.seasons import DEFAULT_SEASON
+
+st.set_page_config(layout="wide")
+
+# ------------------------------
+# 📦 데이터 로드 함수
+# ------------------------------
+
+@cache.memoize('stores', maxsize=2)
+def load_store(season, version):
+    # version: 적재된 시즌의 내용 버전. 다시 적재되어 내용이 바뀐 시즌만 새로 연다
+    return store.PitchStore.open(store.DATA_DIR, season)
+
+@cache.memoize('divisions', maxsize=4)
+def load_divisions(season):
+    return store.load_divisions(store.DATA_DIR, season)
+
+# ------------------------------
+# 🔄 데이터 불러오기
+# ------------------------------
+
+season_options = store.selectable_seasons()
+selected_season = st.selectbox(
+    'Season', season_options, index=season_options.index(DEFAULT_SEASON) if DEFAULT_SEASON in season_options else len(season_options) - 1,
+    label_visibility='collapsed'
+)
+
+pitch_store = load_store(selected_season, store.ensure_season(selected_season))
+divisions = load_divisions(selected_season)
+
+if pitch_store.df.empty:
+    st.error("❌ 데이터셋이 비어있습니다. Google Drive 파일 ID나 파일 내용을 확인하세요.")
+    st.stop()
+
+# ------------------------------
+# UI 구성
+# ------------------------------
+
+st.title(f"⚾ MLB {selected_season} - Game Pitching Info")
+st.caption("🧑🏻‍💻 Kyengwook | 📬 kyengwook8@naver.com | [GitHub](https://github.com/kyengwook/kyengwook) | [Instagram](https://instagram.com/kyengwook)")
+st.caption(f"📊 Data: [Baseball Savant](https://baseballsavant.mlb.com/) – MLB {selected_season} Regular Season")
+
+div_options = ['— Select Division —'] + list(divisions.keys())
+selected_division = st.selectbox('Division', div_options, label_visibility='collapsed')
+
+if selected_division == '— Select Division —':
+    st.info('ℹ️ Division을 먼저 선택해주세요.')
+    st.stop()
+
+selected_teams = divisions[selected_division]
+team_options = ['— Select Team —'] + selected_teams
+selected_team = st.selectbox('Team', team_options, label_visibility='collapsed')
+
+if selected_team == '— Select Team —':
+    st.info('ℹ️ 팀을 먼저 선택해주세요.')
+    st.stop()
+
+games_df = queries.team_games(pitch_store, selected_team)
+
+if games_df.empty:
+    st.warning(f"⚠️ {selected_team} 팀 데이터가 없습니다.")
+    st.stop()
+
+# 더블헤더는 날짜 + 상대가 같으므로 game_pk 로 구분
+game_labels = games_df['date_str'] + ' (' + games_df['game_pk'].astype(str) + ')'
+game_options = ['— Select Game —'] + game_labels.tolist()
+selected_game = st.selectbox('Game', game_options, label_visibility='collapsed')
+
+if selected_game == '— Select Game —':
+    st.info('ℹ️ 경기를 선택해주세요.')
+    st.stop()
+
+game_pk = games_df['game_pk'].iloc[game_labels.tolist().index(selected_game)]
+
+# ------------------------------
+# ✂️ 경기 단위로 한 번만 자르기
+# ------------------------------
+
+game_df = pitch_store.game_rows(game_pk)
+game_df = game_df.assign(release_speed=(game_df['release_speed'] * queries.MPH_TO_KMH).round(1))
+
+game_date = game_df['game_date'].iloc[0]
+st.header(f"{game_df['away_team'].iloc[0]} @ {game_df['home_team'].iloc[0]} - {game_date.strftime('%Y-%m-%d')}")
+
+pitchers_df = queries.game_pitchers(game_df)
+
+st.subheader("Pitchers")
+st.dataframe(
+    pitchers_df.rename(columns={'player_name': 'Pitcher', 'pitching_team': 'Team', 'pitches': 'Pitches', 'innings': 'Inn'})
+    [['Pitcher', 'Team', 'Inn', 'Pitches']],
+    hide_index=True,
+)
+
+# ------------------------------
+# 📊 Pitch Summary (모든 투수, 한 번의 groupby)
+# ------------------------------
+
+st.subheader("Pitch Summary")
+
+# game_df 는 km/h 로 변환되어 있으므로 원 단위(mph) 행으로 집계
+summaries = queries.game_summaries(pitch_store.game_rows(game_pk), pitchers_df['pitcher'])
+for team, team_pitchers in pitchers_df.groupby('pitching_team', sort=False):
+    st.markdown(f"**{team}**")
+    for pitcher, name in zip(team_pitchers['pitcher'], team_pitchers['player_name']):
+        with st.expander(name):
+            st.dataframe(summaries.get(pitcher))
+
+# ------------------------------
+# 🎯 Locations (모든 투수, 한 figure)
+# ------------------------------
+
+st.subheader("Locations")
+
+from dashboard import charts, figures  # plotly는 차트 단계에서만 로드
+
+game_fig = figures.cached_figure(
+    figures.figure_key('game/locations', game_pk, game_date, version=pitch_store.partition_version(game_date)),
+    lambda: charts.game_location_figure(game_df, pitchers_df),
+)
+st.plotly_chart(game_fig, use_container_width=True)
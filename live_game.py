@@ -0,0 +1,70 @@
+import streamlit as st
+
+from dashboard import cache, live
+
+st.set_page_config(layout="wide")
+
+# ------------------------------
+# 📦 라이브 경기 (세션 간 공유)
+# ------------------------------
+
+@cache.memoize('live_games', maxsize=8, ttl=live.LIVE_GAME_TTL)
+def open_live_game(source, game_pk):
+    # 같은 피드를 보는 모든 세션이 LiveGame 하나를 공유 -> 피드 poll 과 집계는 한 번만
+    return live.LiveGame(live.open_feed(source), game_pk)
+
+# ------------------------------
+# UI 구성
+# ------------------------------
+
+st.title("🔴 MLB Live Pitch Info")
+st.caption("🧑🏻‍💻 Kyengwook | 📬 kyengwook8@naver.com | [GitHub](https://github.com/kyengwook/kyengwook) | [Instagram](https://instagram.com/kyengwook)")
+
+source = st.text_input('Feed', value=live.LIVE_FEED or '', placeholder='feed.csv / http://host:port/feed')
+game_pk_text = st.text_input('game_pk', placeholder='game_pk (파일 피드는 비우면 모든 경기)')
+
+if not source:
+    st.info('ℹ️ 피드(파일 경로 또는 URL)를 입력해주세요.')
+    st.stop()
+
+game_pk = int(game_pk_text) if game_pk_text.strip().isdigit() else None
+
+if game_pk is None and not live.open_feed(source).all_games:
+    st.info('ℹ️ HTTP 피드는 game_pk 를 입력해주세요.')
+    st.stop()
+live_game = open_live_game(source, game_pk)
+
+
+@st.fragment(run_every=live.POLL_SECONDS)
+def live_view():
+    # 새 투구만 읽어 누적 합계 / trace 리스트에 붙인다
+    try:
+        live_game.refresh()
+    except (OSError, ValueError) as e:
+        # 연결 실패 / 깨진 행: 읽은 위치는 그대로라 다음 poll 에서 다시 시도한다
+        st.warning(f"⚠️ 피드를 읽지 못했습니다: {e}")
+
+    pitchers_df = live_game.pitchers()
+    if pitchers_df.empty:
+        st.info('ℹ️ 아직 들어온 투구가 없습니다.')
+        return
+
+    st.caption(f"{int(pitchers_df['pitches'].sum())} pitches · update #{live_game.version}")
+
+    labels = (pitchers_df['player_name'] + ' (' + pitchers_df['pitching_team'] + ')').tolist()
+    selected = st.selectbox('Pitcher', labels, index=len(labels) - 1, label_visibility='collapsed')
+    pitcher_id = pitchers_df['pitcher'].iloc[labels.index(selected)]
+
+    st.subheader("Pitch Summary")
+    st.dataframe(live_game.summary(pitcher_id))
+
+    from dashboard import charts, figures  # plotly는 차트 단계에서만 로드
+
+    live_fig = figures.cached_figure(
+        figures.figure_key('live/locations', pitcher_id, version=(source, game_pk, live_game.version)),
+        lambda: charts.live_location_figure(live_game.pitcher_traces(pitcher_id), title=selected),
+    )
+    st.plotly_chart(live_fig, use_container_width=True)
+
+
+live_view()
@@ -1,15 +1,14 @@
 import streamlit as st
-import requests
-import io
-from pybaseball import statcast_pitcher
 import pandas as pd
-import plotly.graph_objects as go
 
 st.set_page_config(layout="wide")
 
 #데이터 로드
-@st.cache_data
+# Drive 파일이 갱신되면 반영되도록 6시간마다 다시 받는다 (이전 DataFrame 은 하나만 유지)
+@st.cache_data(ttl=6 * 3600, max_entries=1)
 def load_data_from_drive():
+    import gdown
+
     url = 'https://drive.google.com/uc?id=1vZB9axWHpzUB5ixNG9Q3JtxTxQsCDMD4'
     output = 'data.csv'
     gdown.download(url, output, quiet=False)
@@ -19,7 +18,7 @@ def load_data_from_drive():
     df = df.set_index('game_date').sort_index()
     return df
 
-@st.cache_data
+@st.cache_data(max_entries=1)
 def load_batter_id():
     batter_ID = pd.read_excel('Batter_ID(2025).xlsx')
     return batter_ID
@@ -122,6 +121,8 @@ if filtered_df.empty:
 pitcher_id = filtered_df['pitcher'].iloc[0]
 
 
+from pybaseball import statcast_pitcher  # 무거운 의존성: 날짜 선택 이후에만 로드
+
 statcast_df = statcast_pitcher(selected_date.strftime('%Y-%m-%d'), selected_date.strftime('%Y-%m-%d'), pitcher_id)
 
 #단위 변환 + Batter_ID merge
@@ -201,6 +202,8 @@ filtered_df = filtered_df.drop_duplicates(subset=['pitch_number', 'inning', 'bat
 L, R = -0.708333, 0.708333
 Bot, Top = 1.5, 3.5
 
+import plotly.graph_objects as go
+
 scatter_fig = go.Figure()
 
 pitch_styles = {
@@ -1,8 +1,10 @@
+from functools import partial
+
 import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
-import gdown
-from pybaseball import statcast_pitcher
+
+from dashboard import backends, cache, export, queries, release, search, similarity, store
+from dashboard.seasons import DEFAULT_SEASON
 
 st.set_page_config(layout="wide")
 
@@ -10,30 +12,37 @@ st.set_page_config(layout="wide")
 # 📦 데이터 로드 함수
 # ------------------------------
 
-@st.cache_data
-def load_data_from_drive():
-    url = 'https://drive.google.com/uc?id=1vZB9axWHpzUB5ixNG9Q3JtxTxQsCDMD4'
-    output = 'data.csv'
-    gdown.download(url, output, quiet=False)
-    df = pd.read_csv(output)
-    df = df[df['game_type'] == 'R']
-    df['game_date'] = pd.to_datetime(df['game_date'])
-    df = df.set_index('game_date').sort_index()
-    return df
+@cache.memoize('stores', maxsize=2)
+def load_store(season, version):
+    # game_info / batter_game_info 의 load_store 와 같은 캐시 항목 (시즌 DataFrame 은 프로세스에 하나)
+    return store.PitchStore.open(store.DATA_DIR, season)
+
+@cache.memoize('backends', maxsize=2)
+def load_backend(season, version):
+    # version: 적재된 시즌의 내용 버전. 다시 적재되어 내용이 바뀐 시즌만 새로 연다
+    # QUERY_BACKEND=pandas|duckdb|polars (기본 pandas)
+    if backends.QUERY_BACKEND == 'pandas':
+        return backends.open_backend(season, store=load_store(season, version))
+    return backends.open_backend(season)
 
-@st.cache_data
-def load_batter_id():
-    batter_ID = pd.read_excel('Batter_ID(2025).xlsx')
-    return batter_ID
+@cache.memoize('divisions', maxsize=4)
+def load_divisions(season):
+    return store.load_divisions(store.DATA_DIR, season)
 
 # ------------------------------
 # 🔄 데이터 불러오기
 # ------------------------------
 
-df = load_data_from_drive()
-batter_ID = load_batter_id()
+season_options = store.selectable_seasons()
+selected_season = st.selectbox(
+    'Season', season_options, index=season_options.index(DEFAULT_SEASON) if DEFAULT_SEASON in season_options else len(season_options) - 1,
+    label_visibility='collapsed'
+)
+
+backend = load_backend(selected_season, store.ensure_season(selected_season))
+divisions = load_divisions(selected_season)
 
-if df.empty:
+if store.read_manifest(store.DATA_DIR, selected_season)['rows'] == 0:
     st.error("❌ 데이터셋이 비어있습니다. Google Drive 파일 ID나 파일 내용을 확인하세요.")
     st.stop()
 
@@ -41,21 +50,41 @@ if df.empty:
 # UI 구성
 # ------------------------------
 
-st.title("⚾ MLB 2025 - Daily Pitch Info")
+st.title(f"⚾ MLB {selected_season} - Daily Pitch Info")
 st.caption("🧑🏻‍💻 Kyengwook | 📬 kyengwook8@naver.com | [GitHub](https://github.com/kyengwook/kyengwook) | [Instagram](https://instagram.com/kyengwook)")
-st.caption("📊 Data: [Baseball Savant](https://baseballsavant.mlb.com/) – MLB 2025 Regular Season")
+st.caption(f"📊 Data: [Baseball Savant](https://baseballsavant.mlb.com/) – MLB {selected_season} Regular Season")
 
-divisions = {
-    'NL East': ['PHI', 'NYM', 'MIA', 'WSH', 'ATL'],
-    'NL Central': ['CHC', 'MIL', 'STL', 'CIN', 'PIT'],
-    'NL West': ['LAD', 'SD', 'SF', 'AZ', 'COL'],
-    'AL East': ['NYY', 'BOS', 'TOR', 'TB', 'BAL'],
-    'AL Central': ['DET', 'KC', 'CLE', 'MIN', 'CWS'],
-    'AL West': ['TEX', 'LAA', 'HOU', 'ATH', 'SEA']
-}
+# ------------------------------
+# 🔍 선수 검색 (Division -> Team -> 선수 단계를 건너뛰고 바로 이동)
+# ------------------------------
+
+@cache.memoize('player_index', maxsize=2)
+def load_player_index(season, version):
+    return search.build_index(store.DATA_DIR, season, backend.pitches(columns=search.INDEX_COLUMNS))
+
+def jump_to_player(results):
+    pick = st.session_state['search_pick']
+    if pick is None:
+        return
+    result = results[pick]
+    st.session_state['division'] = search.division_of(divisions, result['team'])
+    st.session_state['team'] = result['team']
+    st.session_state['pitcher'] = result['player_name']
+
+search_query = st.text_input('Search', placeholder='🔍 선수 검색 (이름 또는 MLBAM ID)', label_visibility='collapsed')
+if search_query:
+    search_results = load_player_index(selected_season, backend.version).search(search_query, role='pitcher')
+    if search_results:
+        st.selectbox(
+            'Results', [None] + list(range(len(search_results))), key='search_pick',
+            format_func=lambda i: '— Select Player —' if i is None else search.result_label(search_results[i]),
+            on_change=jump_to_player, args=(search_results,), label_visibility='collapsed',
+        )
+    else:
+        st.caption('검색 결과가 없습니다.')
 
 div_options = ['— Select Division —'] + list(divisions.keys())
-selected_division = st.selectbox('Division', div_options, label_visibility='collapsed')
+selected_division = st.selectbox('Division', div_options, key='division', label_visibility='collapsed')
 
 if selected_division == '— Select Division —':
     st.info('ℹ️ Division을 먼저 선택해주세요.')
@@ -63,42 +92,33 @@ if selected_division == '— Select Division —':
 
 selected_teams = divisions[selected_division]
 team_options = ['— Select Team —'] + selected_teams
-selected_team = st.selectbox('Team', team_options, label_visibility='collapsed')
+selected_team = st.selectbox('Team', team_options, key='team', label_visibility='collapsed')
 
 if selected_team == '— Select Team —':
     st.info('ℹ️ 팀을 먼저 선택해주세요.')
     st.stop()
 
-team_df = df[
-    ((df['home_team'] == selected_team) & (df['inning_topbot'] == 'Top')) |
-    ((df['away_team'] == selected_team) & (df['inning_topbot'] == 'Bot'))
-]
+pitchers_df = backend.team_pitchers(selected_team)
 
-if team_df.empty:
+if pitchers_df.empty:
     st.warning(f"⚠️ {selected_team} 팀 데이터가 없습니다.")
     st.stop()
 
-player_options = team_df['player_name'].dropna().unique()
-player_options = ['— Select Pitcher —'] + sorted(player_options)
-selected_player = st.selectbox('Pitcher', player_options, label_visibility='collapsed')
+player_options = ['— Select Pitcher —'] + pitchers_df['player_name'].tolist()
+selected_player = st.selectbox('Pitcher', player_options, key='pitcher', label_visibility='collapsed')
 
 if selected_player == '— Select Pitcher —':
     st.info('ℹ️ 선수를 선택해주세요.')
     st.stop()
 
-filtered_player_df = team_df[team_df['player_name'] == selected_player]
+pitcher_id = pitchers_df.loc[pitchers_df['player_name'] == selected_player, 'pitcher'].iloc[0]
+games_df = backend.pitcher_games(pitcher_id, selected_team)
 
-if filtered_player_df.empty:
+if games_df.empty:
     st.warning(f"⚠️ {selected_player} 선수 데이터가 없습니다.")
     st.stop()
 
-filtered_player_df = filtered_player_df.copy()
-filtered_player_df['opponent_team'] = filtered_player_df.apply(
-    lambda row: row['away_team'] if row['home_team'] == selected_team else row['home_team'], axis=1
-)
-filtered_player_df['date_str'] = filtered_player_df.index.to_series().dt.strftime('%Y-%m-%d') + ' ' + filtered_player_df['opponent_team']
-
-date_options = ['— Select Date —'] + sorted(filtered_player_df['date_str'].unique())
+date_options = ['— Select Date —'] + sorted(games_df['date_str'].unique())
 selected_date_str = st.selectbox('Date', date_options, label_visibility='collapsed')
 
 if selected_date_str == '— Select Date —':
@@ -106,18 +126,12 @@ if selected_date_str == '— Select Date —':
     st.stop()
 
 selected_date = pd.to_datetime(selected_date_str.split(' ')[0])
-filtered_df = filtered_player_df[filtered_player_df.index.normalize() == selected_date]
+statcast_df = backend.pitch_details(pitcher_id, selected_date, selected_team)
 
-if filtered_df.empty:
+if statcast_df.empty:
     st.warning(f"⚠️ {selected_player}의 {selected_date} 날짜 데이터가 없습니다.")
     st.stop()
 
-pitcher_id = filtered_df['pitcher'].iloc[0]
-statcast_df = statcast_pitcher(selected_date.strftime('%Y-%m-%d'), selected_date.strftime('%Y-%m-%d'), pitcher_id)
-
-statcast_df['release_speed'] = round(statcast_df['release_speed'] * 1.60934, 1)
-statcast_df = pd.merge(statcast_df, batter_ID, on='batter', how='left')
-
 pitcher_name = statcast_df['player_name'].iloc[0]
 opponent_team = selected_date_str.split(' ')[1]
 st.header(f"{pitcher_name} - {selected_date.strftime('%Y-%m-%d')} vs {opponent_team}")
@@ -128,40 +142,49 @@ st.header(f"{pitcher_name} - {selected_date.strftime('%Y-%m-%d')} vs {opponent_t
 
 st.subheader("Pitch Summary")
 
-summary_df = filtered_df.groupby('pitch_name').agg({
-    'pitch_name': 'count',
-    'release_speed': ['min', 'mean', 'max'],
-    'release_spin_rate': 'mean',
-    'pfx_z': 'mean',
-    'pfx_x': 'mean',
-    'spin_axis': 'mean',
-    'release_pos_z': 'mean',
-    'release_pos_x': 'mean',
-    'release_extension': 'mean',
-}).round(1)
-
-summary_df['release_speed'] = (summary_df['release_speed'] * 1.60934).round(1)
-summary_df['pfx_x'] = (summary_df['pfx_x'] * 30.48 * -1).round(1)
-summary_df['pfx_z'] = (summary_df['pfx_z'] * 30.48).round(1)
-summary_df['release_pos_z'] = (summary_df['release_pos_z'] * 30.48).round(1)
-summary_df['release_pos_x'] = (summary_df['release_pos_x'] * 30.48 * (-1)).round(1)
-summary_df['release_extension'] = (summary_df['release_extension'] * 30.48).round(1)
-
-summary_df.index.name = 'Pitch Type'
-summary_df.columns = [
-    'Pitches', 'Velo Min(km/h)', 'Velo Avg(km/h)', 'Velo Max(km/h)', 'Spin(rpm)',
-     'IVB(cm)', 'HB(cm)', 'Axis(°)', 'RelZ(cm)', 'RelX(cm)', 'Ext(cm)'
-]
-
-summary_df = summary_df.sort_values('Pitches', ascending=False)
+summary_df = backend.pitch_summary(pitcher_id, selected_date, selected_team)
 st.dataframe(summary_df)
 
+# ------------------------------
+# 📍 Release Consistency (시즌 전체를 한 번에 집계, 데이터 버전별 캐시)
+# ------------------------------
+
+@cache.memoize('release_metrics', maxsize=2)
+def load_release_metrics(season, version):
+    return release.ReleaseMetrics(backend.pitches(columns=release.INDEX_COLUMNS), version)
+
+st.subheader("Release Consistency")
+
+release_metrics = load_release_metrics(selected_season, backend.version)
+release_scope = st.radio('Release Scope', ['This game', 'Season', f'{selected_team} staff'], horizontal=True, label_visibility='collapsed')
+
+if release_scope == 'This game':
+    game_pk = games_df.loc[games_df['date_str'] == selected_date_str, 'game_pk'].iloc[0]
+    release_types, release_innings, release_pairs = release_metrics.game_report(selected_team, pitcher_id, game_pk)
+    st.dataframe(release_types)
+    col1, col2 = st.columns(2)
+    col1.caption('Inning drift')
+    col1.dataframe(release_innings, hide_index=True)
+    col2.caption('Pitch type separation')
+    col2.dataframe(release_pairs, hide_index=True)
+elif release_scope == 'Season':
+    release_types, release_pairs = release_metrics.season_report(selected_team, pitcher_id)
+    st.dataframe(release_types)
+    st.caption('Pitch type separation')
+    st.dataframe(release_pairs, hide_index=True)
+else:
+    st.dataframe(release_metrics.staff_report(selected_team), hide_index=True)
+
 # ------------------------------
 # 🎯 Matchups 시각화
 # ------------------------------
 
 st.subheader("Matchups")
 
+st.dataframe(backend.matchup_summary(pitcher_id, selected_date, selected_team))
+
+from dashboard import charts, figures  # plotly는 차트 단계에서만 로드
+
 batter_options = statcast_df['batter_name'].dropna().unique()
 selected_batter = st.selectbox('Batter', batter_options, label_visibility='collapsed')
 
@@ -169,86 +192,108 @@ filtered_df = statcast_df[statcast_df['batter_name'] == selected_batter]
 inning_options = filtered_df['inning'].unique()
 selected_inning = st.selectbox('Inning', inning_options, label_visibility='collapsed')
 
-filtered_df = filtered_df[(filtered_df['inning'] == selected_inning)].sort_values('pitch_number')
-filtered_df = filtered_df.drop_duplicates(subset=['pitch_number', 'inning', 'batter'])
+filtered_df = filtered_df[(filtered_df['inning'] == selected_inning)]
 filtered_df = filtered_df.dropna(subset=['plate_x', 'plate_z'])
 
-L, R = -0.708333, 0.708333
-Bot, Top = 1.5, 3.5
-
-scatter_fig = go.Figure()
-pitch_styles = {
-    '4-Seam Fastball': {'color': '#D22D49'},
-    'Sinker': {'color': '#FE9D00'},
-    'Cutter': {'color': '#933F2C'},
-    'Knuckle Curve': {'color': 'mediumpurple'},
-    'Sweeper': {'color': 'olive'},
-    'Split-Finger': {'color': '#888888'},
-    'Changeup': {'color': '#1DBE3A'},
-    'Screwball': {'color': '#1DBE3A'},
-    'Forkball': {'color': '#888888'},
-    'Slurve': {'color': 'teal'},
-    'Knuckleball': {'color': 'lightsteelblue'},
-    'Slider': {'color': 'darkkhaki'},
-    'Curveball': {'color': 'teal'},
-    'Eephus': {'color': 'black'},
-    'Other': {'color': 'black'}
-}
-
-for pitch_name, style in pitch_styles.items():
-    pitch_data = filtered_df[filtered_df['pitch_name'] == pitch_name]
-    if pitch_data.empty:
-        continue
-    pitch_data = pitch_data.copy()
-    pitch_data['custom_hover'] = pitch_data.apply(
-        lambda row: f"{row['pitch_name']}<br>{row['release_speed']} km/h<br>{row['description']}<br>{row['events']}<br>xBA {row['estimated_ba_using_speedangle']}" 
-        if row['description'] == 'hit_into_play' 
-        else f"{row['pitch_name']}<br>{row['release_speed']} km/h<br>{row['description']}",
-        axis=1
+if filtered_df.empty:
+    st.info('ℹ️ 로케이션 데이터가 없습니다.')
+else:
+    scatter_fig = figures.cached_figure(
+        figures.figure_key(
+            'pitchinfo/matchup', pitcher_id, selected_date,
+            {'team': selected_team, 'batter': selected_batter, 'inning': int(selected_inning)},
+            backend.partition_version(selected_date),
+        ),
+        lambda: charts.location_figure(
+            filtered_df, title=f'{pitcher_name} vs {selected_batter} (Inning {selected_inning})',
+            hover=charts.pitch_hover(filtered_df), text=filtered_df['pitch_number'],
+        ),
     )
-    scatter_fig.add_trace(
-        go.Scatter(
-            x=pitch_data['plate_x'], y=pitch_data['plate_z'],
-            mode='markers+text', marker=dict(size=13, color=style['color']),
-            text=pitch_data['pitch_number'], textposition='top center',
-            hoverinfo='text',
-            hovertext=pitch_data['custom_hover'],
-            name=pitch_name
-        )
+    st.plotly_chart(scatter_fig, use_container_width=True)
+
+# ------------------------------
+# 📝 Pitch Details
+# ------------------------------
+
+st.subheader("Pitch Details")
+
+st.dataframe(queries.display_details(filtered_df), hide_index=True)
+
+# 저장소에서 배치 단위로 바로 내보내기 (클릭 시에만 생성)
+detail_filters = export.matchup_filters(statcast_df, pitcher_id, selected_date, selected_team, selected_batter, selected_inning)
+for col, fmt in zip(st.columns(len(export.FORMATS)), export.FORMATS):
+    col.download_button(
+        f'⬇️ Pitch Details ({fmt.upper()})',
+        data=partial(export.export_file, fmt, 'pitch_details', store.DATA_DIR, selected_season, **detail_filters),
+        file_name=export.export_name('pitch_details', fmt, pitcher_id, selected_date.strftime('%Y%m%d'), selected_inning),
+        mime=export.FORMATS[fmt][0], key=f'export_details_{fmt}',
     )
 
-scatter_fig.add_shape(type='rect', x0=L, x1=R, y0=Bot, y1=Top, line=dict(color='grey', width=1.5))
-scatter_fig.add_shape(type='path', 
-    path=f'M {R-0.1},{0} L {L+0.1},{0} L {L-0.1},{-0.6} L 0,{-1.0} L {R+0.1},{-0.6} Z',
-    line=dict(color='grey', width=1.5))
-
-scatter_fig.update_layout(
-    title=f'{pitcher_name} vs {selected_batter} (Inning {selected_inning})',
-    xaxis=dict(range=[L-2.5, R+2.5], showticklabels=False, fixedrange=True),
-    yaxis=dict(range=[Bot-3, Top+2], showticklabels=False, fixedrange=True),
-    width=550, height=600, showlegend=True,
-    margin=dict(l=5, r=5, t=80, b=5),
-    autosize=True,
-    legend=dict(
-        x=0.02, y=0.98,
-        bgcolor='rgba(255,255,255,0.7)',
-        bordercolor='black', borderwidth=1
-    ),
-    dragmode=False
-)
+# ------------------------------
+# 🗺️ Season View (팀 / 리그 단위는 서버에서 샘플링 또는 hexbin 집계 후 전송)
+# ------------------------------
 
-st.plotly_chart(scatter_fig, use_container_width=True)
+st.subheader("Season View")
+
+scope_options = [selected_player, selected_team, 'MLB']
+selected_scope = st.radio('Scope', scope_options, horizontal=True, label_visibility='collapsed')
+
+if selected_scope == selected_player:
+    scope_key, scope = pitcher_id, {'pitcher': pitcher_id, 'team': selected_team}
+elif selected_scope == selected_team:
+    scope_key, scope = selected_team, {'team': selected_team}
+else:
+    scope_key, scope = 'MLB', {}
+
+# 캐시에 없을 때만 필요한 열만 읽어 온다
+season_columns = ['pitch_name', 'plate_x', 'plate_z', 'pfx_x', 'pfx_z']
+
+col1, col2 = st.columns(2)
+with col1:
+    st.plotly_chart(figures.cached_figure(
+        figures.figure_key('pitchinfo/season_locations', scope_key, filters=scope, version=backend.version),
+        lambda: charts.location_figure(backend.pitches(columns=season_columns, **scope), title=f'{selected_scope} {selected_season} Locations'),
+    ), use_container_width=True)
+with col2:
+    st.plotly_chart(figures.cached_figure(
+        figures.figure_key('pitchinfo/season_movement', scope_key, filters=scope, version=backend.version),
+        lambda: charts.movement_figure(backend.pitches(columns=season_columns, **scope), title=f'{selected_scope} {selected_season} Movement'),
+    ), use_container_width=True)
+
+for col, fmt in zip(st.columns(len(export.FORMATS)), export.FORMATS):
+    col.download_button(
+        f'⬇️ {selected_scope} {selected_season} Pitches ({fmt.upper()})',
+        data=partial(export.export_file, fmt, 'season_pitches', store.DATA_DIR, selected_season, **scope),
+        file_name=export.export_name('season_pitches', fmt, scope_key, selected_season),
+        mime=export.FORMATS[fmt][0], key=f'export_season_{fmt}',
+    )
 
 # ------------------------------
-# 📝 Pitch Details
+# 🧬 Similar Pitches (리그 전체 구종 프로필 kNN)
 # ------------------------------
 
-st.subheader("Pitch Details")
+def read_similarity_pitches(season, dates):
+    if dates is None:
+        return backend.pitches(columns=similarity.INDEX_COLUMNS)
+    return store.scan(store.DATA_DIR, season, columns=similarity.INDEX_COLUMNS, dates=dates)
+
+@cache.memoize('similarity', maxsize=2)
+def load_similarity(season, version):
+    # 같은 시즌의 이전 버전 인덱스가 캐시에 남아 있으면 바뀐 날짜만 다시 집계한다
+    previous = next((index for (s, _), index in load_similarity.entries() if s == season), None)
+    return similarity.refresh_index(
+        previous, version, backend.manifest.get('partitions', {}), partial(read_similarity_pitches, season),
+    )
+
+st.subheader("Similar Pitches")
 
-filtered_df = filtered_df.rename(columns={
-    'pitch_number': 'No', 'pitch_name': 'Type', 'outs_when_up': 'Out',
-    'balls': 'B', 'strikes': 'S', 'release_speed': 'Velo(km/h)',
-    'release_spin_rate': 'Spin(rpm)', 'type': 'Result', 'description': 'Desc'
-})
+similarity_index = load_similarity(selected_season, backend.version)
+pitch_type_options = similarity_index.pitch_types(pitcher_id)
 
-st.dataframe(filtered_df[['No', 'Type', 'Out', 'B', 'S', 'Velo(km/h)', 'Spin(rpm)', 'Result', 'Desc']], hide_index=True)
+if not pitch_type_options:
+    st.caption(f'시즌 {similarity.MIN_PITCHES}구 이상 던진 구종이 없습니다.')
+else:
+    col1, col2 = st.columns([3, 1])
+    selected_pitch_type = col1.selectbox('Pitch Type', pitch_type_options, label_visibility='collapsed')
+    same_type = col2.checkbox('Same pitch type', value=True)
+    st.dataframe(similarity_index.neighbors(pitcher_id, selected_pitch_type, k=10, same_type=same_type), hide_index=True)
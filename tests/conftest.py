@@ -0,0 +1,35 @@
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+SEASON = 2025
+
+
+@pytest.fixture(scope='session')
+def data_dir(tmp_path_factory):
+    # 작은 합성 시즌 하나 (모든 테스트가 공유, 읽기 전용으로 쓴다)
+    from synthetic_season import build_store
+
+    path = str(tmp_path_factory.mktemp('store'))
+    build_store(path, games=30, season=SEASON)
+    return path
+
+
+@pytest.fixture
+def server(data_dir):
+    from dashboard.server import QueryService, make_handler
+
+    service = QueryService(data_dir, backend='pandas')
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(service))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
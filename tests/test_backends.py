@@ -0,0 +1,45 @@
+import pytest
+from backend_equivalence import frames_equal, run_queries, sample_cases
+
+from dashboard import backends
+from dashboard.store import PitchStore
+
+from conftest import SEASON
+
+
+@pytest.fixture(scope='module')
+def reference(data_dir):
+    return backends.PandasBackend(data_dir, SEASON)
+
+
+def test_pandas_backend_reuses_open_store(data_dir):
+    pitch_store = PitchStore.open(data_dir, SEASON)
+    backend = backends.open_backend(SEASON, data_dir, name='pandas', store=pitch_store)
+    assert backend.store is pitch_store
+    assert backend.version == pitch_store.version
+
+
+@pytest.mark.parametrize('name', ['duckdb', 'polars'])
+def test_backend_matches_pandas(data_dir, reference, name):
+    pytest.importorskip(name)
+    backend = backends.open_backend(SEASON, data_dir, name=name)
+    assert backend.version == reference.version
+
+    for team, pitcher, game_date in sample_cases(reference, samples=10, seed=0):
+        expected = run_queries(reference, team, pitcher, game_date)
+        actual = run_queries(backend, team, pitcher, game_date)
+        for query, frame in expected.items():
+            diff = frames_equal(frame, actual[query])
+            assert diff is None, f'{name} {query} team={team} pitcher={pitcher} date={game_date:%Y-%m-%d}\n{diff}'
+
+
+@pytest.mark.parametrize('name', ['duckdb', 'polars'])
+def test_backend_pitches_match_pandas(data_dir, reference, name):
+    pytest.importorskip(name)
+    backend = backends.open_backend(SEASON, data_dir, name=name)
+    team = reference.store.df['pitching_team'].iloc[0]
+    columns = ['pitch_name', 'plate_x', 'plate_z']
+    expected = reference.pitches(team=team, columns=columns)
+    actual = backend.pitches(team=team, columns=columns)
+    # 파생 집계는 행 순서와 값만 쓴다 (pandas 는 pitch_key 인덱스, 나머지는 RangeIndex)
+    assert frames_equal(expected.reset_index(drop=True), actual.reset_index(drop=True)) is None
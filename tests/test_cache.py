@@ -0,0 +1,165 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import cache
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    # 페이지 모듈이 등록한 캐시와 섞이지 않도록 테스트마다 빈 registry
+    monkeypatch.setattr(cache, 'registry', {})
+    monkeypatch.setattr(cache, 'CACHE_BUDGET_BYTES', None)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def frame(rows):
+    return pd.DataFrame({'x': np.arange(rows, dtype='float64')})
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'monotonic', clock)
+    lru = cache.LRUCache(ttl=10)
+    lru.put('a', 'x')
+    clock.now += 9
+    assert lru.get('a') == 'x'
+    clock.now += 2
+    assert lru.get('a') is None
+    assert (len(lru), lru.expirations, lru.nbytes) == (0, 1, 0)
+
+
+def test_expired_entries_are_swept_on_put(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'monotonic', clock)
+    lru = cache.LRUCache(ttl=10)
+    lru.put('a', 'x')
+    clock.now += 11
+    lru.put('b', 'y')
+    assert [key for key, _ in lru.items()] == ['b']
+    assert lru.expirations == 1
+
+
+def test_maxbytes_evicts_least_recently_used():
+    lru = cache.LRUCache(maxsize=None, maxbytes=10, sizeof=len)
+    lru.put('a', 'xxxx')
+    lru.put('b', 'xxxx')
+    lru.get('a')
+    lru.put('c', 'xxxx')
+    assert [key for key, _ in lru.items()] == ['a', 'c']
+    assert (lru.nbytes, lru.evictions) == (8, 1)
+
+
+def test_oversized_entry_is_kept_alone():
+    lru = cache.LRUCache(maxsize=None, maxbytes=10, sizeof=len)
+    lru.put('a', 'xx')
+    lru.put('big', 'x' * 50)
+    assert [key for key, _ in lru.items()] == ['big']
+
+
+def test_pending_lock_computes_once():
+    lru = cache.LRUCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(lru.get_or_compute('k', compute)))
+    first.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(lru.get_or_compute('k', compute))) for _ in range(4)]
+    for thread in waiters:
+        thread.start()
+    release.set()
+    for thread in [first] + waiters:
+        thread.join(5)
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+    # 기다린 스레드는 계산하지 않았으므로 적중
+    assert (lru.misses, lru.hits) == (1, 4)
+    assert lru._pending == {}
+
+
+def test_enforce_budget_evicts_from_largest_cache(monkeypatch):
+    small = cache.register('small', cache.LRUCache(sizeof=len))
+    large = cache.register('large', cache.LRUCache(sizeof=len))
+    small.put('a', 'x' * 10)
+    small.put('b', 'x' * 10)
+    large.put('a', 'x' * 40)
+    large.put('b', 'x' * 40)
+    monkeypatch.setattr(cache, 'CACHE_BUDGET_BYTES', 70)
+    cache.enforce_budget()
+    assert cache.total_nbytes() <= 70
+    assert [key for key, _ in large.items()] == ['b']
+    assert len(small) == 2
+
+
+def test_enforce_budget_keeps_single_entry_caches(monkeypatch):
+    store = cache.register('store', cache.LRUCache(sizeof=len))
+    store.put('season', 'x' * 100)
+    monkeypatch.setattr(cache, 'CACHE_BUDGET_BYTES', 10)
+    cache.enforce_budget()
+    assert len(store) == 1
+
+
+def test_memoize_shares_results_by_name():
+    calls = []
+
+    def make_loader():
+        @cache.memoize('loaders')
+        def load(season, scale=1):
+            calls.append(season)
+            return season * scale
+        return load
+
+    # 페이지마다 같은 이름으로 정의된 로더는 한 결과를 같이 쓴다
+    page_a, page_b = make_loader(), make_loader()
+    assert page_a(2025) == page_b(2025) == 2025
+    assert calls == [2025]
+    assert page_a(2025, scale=2) == 4050
+    assert calls == [2025, 2025]
+    assert sorted(page_b.entries()) == [((2025,), 2025), ((2025,), 4050)]
+
+    @cache.memoize('loaders')
+    def other(season):
+        return -season
+
+    assert other(2025) == -2025
+    assert other.entries() == [((2025,), -2025)]
+
+
+def test_shared_object_is_counted_once():
+    class Backend:
+        def __init__(self, store):
+            self.store = store
+
+    @cache.memoize('stores')
+    def load_store(season):
+        return frame(100_000)
+
+    @cache.memoize('backends')
+    def load_backend(season):
+        return Backend(load_store(season))
+
+    backend = load_backend(2025)
+    store_bytes = cache.registry['stores'].nbytes
+    assert backend.store is load_store(2025)
+    assert store_bytes >= 800_000
+    # backend 안의 PitchStore 는 stores 캐시에서만 센다
+    assert cache.registry['backends'].nbytes < 10_000
+    assert cache.total_nbytes() < store_bytes + 10_000
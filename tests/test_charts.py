@@ -0,0 +1,42 @@
+import pytest
+from synthetic_season import make_season
+
+from dashboard import charts
+
+from conftest import SEASON
+
+RARE = {'Eephus': 5, 'Knuckleball': 5, 'Screwball': 3}
+
+
+@pytest.fixture(scope='module')
+def pitches():
+    df = make_season(60, SEASON, seed=3).reset_index(drop=True)
+    start = 0
+    for name, n in RARE.items():
+        df.loc[start:start + n - 1, 'pitch_name'] = name
+        start += n
+    return df
+
+
+@pytest.mark.parametrize('budget', [50, 100, 500, 1500])
+def test_sample_stays_within_budget_and_keeps_pitch_types(pitches, budget):
+    sample = charts.stratified_sample(pitches, budget)
+    assert len(sample) <= budget
+    assert set(sample['pitch_name']) == set(pitches['pitch_name'])
+    assert sample.index.is_monotonic_increasing
+
+
+@pytest.mark.parametrize('budget', [50, 300, 1500])
+def test_hexbin_never_exceeds_budget(pitches, budget):
+    mode, bins = charts.reduce_points(pitches, 'plate_x', 'plate_z', budget, mode='hexbin')
+    assert mode == 'hexbin'
+    assert len(bins) <= budget
+    assert bins['count'].sum() == pitches[['plate_x', 'plate_z']].notna().all(axis=1).sum()
+
+
+def test_auto_mode_thresholds(pitches):
+    located = pitches.dropna(subset=['plate_x', 'plate_z'])
+    assert charts.reduce_points(pitches, 'plate_x', 'plate_z', budget=len(located))[0] == 'raw'
+    mode, sample = charts.reduce_points(pitches, 'plate_x', 'plate_z', budget=len(located) // 5)
+    assert mode == 'sample' and len(sample) <= len(located) // 5
+    assert charts.reduce_points(pitches, 'plate_x', 'plate_z', budget=len(located) // (charts.SAMPLE_FACTOR + 1))[0] == 'hexbin'
@@ -0,0 +1,43 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import export
+from dashboard.backends import PandasBackend
+
+from conftest import SEASON
+
+
+@pytest.fixture(scope='module')
+def matchup(data_dir):
+    backend = PandasBackend(data_dir, SEASON)
+    df = backend.store.df
+    row = df.iloc[len(df) // 2]
+    details = backend.pitch_details(row['pitcher'], row['game_date'], row['pitching_team'])
+    inning = details[details['inning'] == row['inning']]
+    assert inning['batter'].nunique() > 1
+    return row, details
+
+
+def test_matchup_filters_keep_batter_without_locations(data_dir, matchup):
+    row, details = matchup
+    # 선택한 타석의 로케이션이 모두 빠져 화면의 표가 비는 경우
+    hidden = details['batter'] == row['batter']
+    details = details.assign(plate_x=np.where(hidden, np.nan, details['plate_x']))
+    located = details[(details['batter_name'] == row['batter_name']) & (details['inning'] == row['inning'])]
+    assert located.dropna(subset=['plate_x', 'plate_z']).empty
+
+    filters = export.matchup_filters(details, row['pitcher'], row['game_date'], row['pitching_team'], row['batter_name'], row['inning'])
+    assert filters['batter'] == row['batter']
+
+    handle = export.export_file('csv', 'pitch_details', data_dir, SEASON, **filters)
+    exported = pd.read_csv(io.BytesIO(handle.read()))
+    assert len(exported) == len(located)
+
+
+def test_matchup_filters_unknown_batter(matchup):
+    row, details = matchup
+    with pytest.raises(KeyError):
+        export.matchup_filters(details, row['pitcher'], row['game_date'], row['pitching_team'], 'Nobody, Ever', row['inning'])
@@ -0,0 +1,41 @@
+import json
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import plotly.tools
+
+from dashboard import charts, figures
+
+
+def streamlit_spec(fig):
+    # st.plotly_chart 가 figure 를 proto 에 담는 방식 그대로
+    return pio.to_json(plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True), validate=False)
+
+
+def test_cached_figure_stores_spec_and_builds_once():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return go.Figure(go.Scatter(x=[1, 2], y=[3, 4]), layout=dict(width=550, height=600))
+
+    key = figures.figure_key('test/hit', 1, '2025-04-01', {'team': 'PHI'}, 'v1')
+    first = figures.cached_figure(key, build)
+    second = figures.cached_figure(key, build)
+    assert len(calls) == 1
+    assert isinstance(figures.figure_cache.get(key), str)
+    assert json.loads(streamlit_spec(second)) == json.loads(pio.to_json(build(), validate=False))
+    # plotly_chart 가 크기를 읽는 값
+    assert (first.layout.width, first.layout.height) == (550, 600)
+
+
+def test_filters_change_key():
+    assert figures.figure_key('p', 1, filters={'team': 'PHI'}) != figures.figure_key('p', 1, filters={'team': 'NYM'})
+
+
+def test_empty_figure_is_accepted_by_streamlit():
+    empty = pd.DataFrame(columns=['pitch_name', 'plate_x', 'plate_z', 'pfx_x', 'pfx_z'])
+    fig = figures.cached_figure(figures.figure_key('test/empty', 1), lambda: charts.location_figure(empty))
+    # dict 로 넘기면 빈 data 에서 PlotlyEmptyDataError
+    assert json.loads(streamlit_spec(fig))['data'] == []
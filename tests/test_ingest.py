@@ -0,0 +1,123 @@
+import logging
+import os
+
+import pandas as pd
+from synthetic_season import make_season
+
+from dashboard import figures, rollups, store
+from dashboard.store import (
+    available_seasons, changed_partitions, dedupe_pitches, ingest_frame, partition_version, pitch_key, read_manifest,
+    scan, season_dir,
+)
+
+from conftest import SEASON
+
+
+def test_reingest_updates_only_changed_dates(tmp_path):
+    raw = make_season(30, SEASON, seed=1, games_per_day=3)
+    ingest_frame(raw, SEASON, str(tmp_path))
+
+    # 한 경기는 취소, 다른 날짜 한 경기는 기록 정정
+    dates = sorted(raw['game_date'].unique())
+    dropped = raw.loc[raw['game_date'] == dates[0], 'game_pk'].iloc[0]
+    corrected = raw.loc[raw['game_date'] == dates[-1], 'game_pk'].iloc[0]
+    changed = raw[raw['game_pk'] != dropped].copy()
+    fix = changed['game_pk'] == corrected
+    changed.loc[fix, 'launch_speed'] = changed.loc[fix, 'launch_speed'] + 1
+
+    ingest_frame(changed, SEASON, str(tmp_path))
+    incremental = rollups.load_partials(str(tmp_path), SEASON)
+
+    full_dir = tmp_path / 'full'
+    ingest_frame(changed, SEASON, str(full_dir))
+    full = rollups.load_partials(str(full_dir), SEASON)
+
+    assert dropped not in set(incremental['game_pk'])
+    pd.testing.assert_frame_equal(incremental, full)
+
+
+def test_dedupe_keeps_last_corrected_pitch():
+    raw = make_season(2, SEASON, seed=4).reset_index(drop=True)
+    corrected = raw.iloc[[10]].assign(release_speed=raw['release_speed'].iloc[10] + 5)
+    deduped = dedupe_pitches(pd.concat([raw, corrected], ignore_index=True))
+
+    assert len(deduped) == len(raw)
+    key = pitch_key(raw.iloc[[10]]).iloc[0]
+    assert deduped.loc[deduped['pitch_key'] == key, 'release_speed'].item() == corrected['release_speed'].item()
+
+
+def test_stored_order_follows_pitch_key(tmp_path):
+    raw = make_season(6, SEASON, seed=5, games_per_day=2)
+    corrected = raw.iloc[[0]].assign(release_speed=raw['release_speed'].iloc[0] + 5)
+    # 파일 순서를 섞고, 정정된 투구는 맨 뒤에 다시 보낸다
+    sent = pd.concat([raw.sample(frac=1, random_state=0), corrected], ignore_index=True)
+    ingest_frame(sent, SEASON, str(tmp_path))
+
+    stored = scan(str(tmp_path), SEASON, columns=['pitch_key', 'game_date', 'game_pk', 'at_bat_number', 'pitch_number', 'release_speed'])
+    assert len(stored) == len(raw)
+    assert stored.loc[pitch_key(corrected).iloc[0], 'release_speed'] == corrected['release_speed'].item()
+    for _, day in stored.groupby('game_date'):
+        expected = day.sort_values(['game_pk', 'at_bat_number', 'pitch_number'])
+        assert day.index.tolist() == expected.index.tolist()
+
+
+def test_identical_reingest_keeps_version_and_files(tmp_path, caplog):
+    raw = make_season(6, SEASON, seed=2, games_per_day=2)
+    ingest_frame(raw, SEASON, str(tmp_path))
+    manifest = read_manifest(str(tmp_path), SEASON)
+    target = os.readlink(season_dir(str(tmp_path), SEASON))
+    partials_mtime = os.path.getmtime(rollups.partials_path(str(tmp_path), SEASON))
+
+    # 같은 내용을 순서만 바꿔 다시 보내도 아무것도 다시 쓰지 않는다
+    with caplog.at_level(logging.INFO, logger='dashboard.store'):
+        ingest_frame(raw.sample(frac=1, random_state=1), SEASON, str(tmp_path))
+    assert read_manifest(str(tmp_path), SEASON) == manifest
+    assert os.readlink(season_dir(str(tmp_path), SEASON)) == target
+    assert os.path.getmtime(rollups.partials_path(str(tmp_path), SEASON)) == partials_mtime
+    assert '변경 없음' in caplog.text
+
+
+def test_changed_partitions():
+    old = {'2025-04-01': {'rows': 3, 'hash': 'a'}, '2025-04-02': {'rows': 3, 'hash': 'b'}, '2025-04-03': {'rows': 1, 'hash': 'c'}}
+    new = {'2025-04-01': {'rows': 3, 'hash': 'a'}, '2025-04-02': {'rows': 4, 'hash': 'x'}, '2025-04-04': {'rows': 2, 'hash': 'd'}}
+    assert changed_partitions(old, new) == ['2025-04-02', '2025-04-03', '2025-04-04']
+    assert changed_partitions(old, old) == []
+    assert changed_partitions({}, new) == sorted(new)
+
+
+def test_cache_keys_follow_partition_version(tmp_path):
+    raw = make_season(6, SEASON, seed=3, games_per_day=2)
+    ingest_frame(raw, SEASON, str(tmp_path))
+    before = read_manifest(str(tmp_path), SEASON)
+
+    dates = sorted(raw['game_date'].unique())
+    fix = raw['game_date'] == dates[1]
+    changed = raw.assign(release_speed=raw['release_speed'].where(~fix, raw['release_speed'] + 1))
+    ingest_frame(changed, SEASON, str(tmp_path))
+    after = read_manifest(str(tmp_path), SEASON)
+
+    assert before['version'] != after['version']
+    for date in before['partitions']:
+        key_before = figures.figure_key('pitchinfo/location', 1, date, {'team': 'PHI'}, partition_version(before, date))
+        key_after = figures.figure_key('pitchinfo/location', 1, date, {'team': 'PHI'}, partition_version(after, date))
+        # 바뀐 날짜의 캐시만 새로 만든다
+        assert (key_before != key_after) == (date == str(dates[1])[:10])
+
+
+def test_swap_never_hides_the_manifest(tmp_path, monkeypatch):
+    raw = make_season(4, SEASON, seed=6, games_per_day=2)
+    ingest_frame(raw, SEASON, str(tmp_path))
+    replace = os.replace
+    checks = []
+
+    def checked_replace(src, dst):
+        replace(src, dst)
+        # 디렉터리를 바꾸는 매 단계 뒤에도 시즌은 보이고 manifest 를 읽을 수 있다
+        checks.append(SEASON in available_seasons(str(tmp_path)) and bool(read_manifest(str(tmp_path), SEASON)))
+
+    monkeypatch.setattr(store.os, 'replace', checked_replace)
+    ingest_frame(raw.assign(release_speed=raw['release_speed'] + 1), SEASON, str(tmp_path))
+    assert checks and all(checks)
+    # 밀려난 버전은 한 세대만 남는다
+    versions = os.listdir(os.path.join(str(tmp_path), 'pitches', store.VERSIONS_DIR))
+    assert len(versions) == 2
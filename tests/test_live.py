@@ -0,0 +1,111 @@
+import pytest
+from synthetic_season import make_season
+
+from dashboard import live
+from dashboard.store import pitch_key
+
+from conftest import SEASON
+
+
+class ReplayFeed:
+    # tools/live_feed.py 처럼 since / game_pk 로 걸러 주는 피드. thrown 에 행을 붙여 가며 "던진다"
+    all_games = True
+
+    def __init__(self, pitches):
+        self.requests = []
+        self.pitches = pitches.reset_index(drop=True)
+        self.thrown = 0
+
+    def poll(self, since=None, game_pk=None):
+        self.requests.append((since, game_pk))
+        rows = self.pitches.iloc[:self.thrown]
+        if since is not None:
+            rows = rows[pitch_key(rows) > since]
+        if game_pk is not None:
+            rows = rows[rows['game_pk'] == game_pk]
+        return rows
+
+
+@pytest.fixture(scope='module')
+def two_games():
+    raw = make_season(2, SEASON, seed=2, games_per_day=2)
+    low, high = sorted(raw['game_pk'].unique())
+    # 번호가 큰 경기가 먼저 시작하고 작은 경기가 나중에 들어온다
+    return raw[raw['game_pk'] == high], raw[raw['game_pk'] == low]
+
+
+def test_all_games_keeps_lower_game_pk(two_games):
+    import pandas as pd
+
+    high, low = two_games
+    feed = ReplayFeed(pd.concat([high, low]))
+    game = live.LiveGame(feed)
+
+    feed.thrown = len(high)
+    game.refresh(min_interval=0)
+    feed.thrown = len(high) + len(low)
+    game.refresh(min_interval=0)
+
+    assert int(game.pitchers()['pitches'].sum()) == len(high) + len(low)
+    assert set(game.since) == {int(high['game_pk'].iloc[0]), int(low['game_pk'].iloc[0])}
+
+
+def test_single_game_polls_since(two_games):
+    high, _ = two_games
+    feed = ReplayFeed(high)
+    game = live.LiveGame(feed, int(high['game_pk'].iloc[0]))
+
+    feed.thrown = 10
+    assert game.refresh(min_interval=0) == 10
+    feed.thrown = 25
+    assert game.refresh(min_interval=0) == 15
+    assert game.since[game.game_pk] == int(pitch_key(high.iloc[:25]).max())
+    # 두 번째 poll 은 첫 poll 에서 받은 마지막 투구 이후만 요청
+    assert feed.requests == [(None, game.game_pk), (int(pitch_key(high.iloc[:10]).max()), game.game_pk)]
+
+
+def test_http_feed_requires_game_pk():
+    with pytest.raises(ValueError):
+        live.LiveGame(live.HttpFeed('http://127.0.0.1:1/feed'))
+    assert live.LiveGame(live.HttpFeed('http://127.0.0.1:1/feed'), 1).game_pk == 1
+
+
+def test_readers_get_copies(two_games):
+    high, _ = two_games
+    feed = ReplayFeed(high)
+    feed.thrown = len(high)
+    game = live.LiveGame(feed)
+    game.refresh(min_interval=0)
+
+    pitcher = game.pitchers()['pitcher'].iloc[0]
+    traces = game.pitcher_traces(pitcher)
+    for trace in traces.values():
+        trace['plate_x'].clear()
+    assert all(trace['plate_x'] for trace in game.pitcher_traces(pitcher).values())
+
+
+def test_file_feed_keeps_offset_on_parse_error(tmp_path):
+    path = tmp_path / 'feed.jsonl'
+    path.write_text('{"game_pk": 1, "at_bat_number": 1, "pitch_number": 1}\n')
+    feed = live.FileFeed(str(path))
+    assert len(feed.poll()) == 1
+    offset = feed.offset
+
+    with open(path, 'a') as f:
+        f.write('{"game_pk": 1, "at_bat_number":\n')
+    with pytest.raises(ValueError):
+        feed.poll()
+    assert feed.offset == offset
+
+
+def test_file_feed_csv_header_survives_parse_error(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text('game_pk,at_bat_number,pitch_number\n1,1,1\n')
+    feed = live.FileFeed(str(path))
+    assert len(feed.poll()) == 1
+
+    with open(path, 'a') as f:
+        f.write('1,1,"2\n')
+    with pytest.raises(ValueError):
+        feed.poll()
+    assert feed.header == 'game_pk,at_bat_number,pitch_number'
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import release
+from dashboard.store import scan
+
+from conftest import SEASON
+
+
+@pytest.fixture(scope='module')
+def pitches(data_dir):
+    return scan(data_dir, SEASON, columns=release.INDEX_COLUMNS)
+
+
+@pytest.fixture(scope='module')
+def metrics(pitches):
+    return release.ReleaseMetrics(pitches)
+
+
+def test_moment_statistics_match_groupby(pitches):
+    keys = release.SEASON_KEYS + ['pitch_name']
+    stats = release.statistics(release.rollup(release.moments(pitches), keys))
+    grouped = pitches.dropna(subset=release.KEYS).groupby(keys)
+    for column in release.MOMENT_COLUMNS:
+        scale = release.SCALES[column]
+        expected_mean = (grouped[column].mean() * scale).rename(None)
+        expected_std = (grouped[column].std() * abs(scale)).rename(None)
+        pd.testing.assert_series_equal(stats[f'mean_{column}'].rename(None), expected_mean, check_index_type=False, rtol=1e-9)
+        pd.testing.assert_series_equal(stats[f'std_{column}'].rename(None), expected_std, check_index_type=False, rtol=1e-6)
+
+
+def test_single_pitch_has_no_spread():
+    one = pd.DataFrame([{
+        'pitching_team': 'PHI', 'pitcher': 1, 'game_pk': 1, 'pitch_name': 'Sinker', 'inning': 1,
+        'player_name': 'A', 'release_pos_x': -2.0, 'release_pos_z': 6.0, 'release_extension': 6.5,
+        'plate_x': 0.0, 'plate_z': 2.5,
+    }])
+    stats = release.statistics(release.moments(one))
+    assert stats['n'].iloc[0] == 1
+    assert np.isnan(stats['spread'].iloc[0])
+
+
+def test_inning_drift(metrics, pitches):
+    row = pitches.iloc[0]
+    _, innings, _ = metrics.game_report(row['pitching_team'], row['pitcher'], row['game_pk'])
+
+    game = pitches[(pitches['pitcher'] == row['pitcher']) & (pitches['game_pk'] == row['game_pk'])]
+    means = game.groupby('inning')[['release_pos_x', 'release_pos_z']].mean()
+    x = means['release_pos_x'] * release.SCALES['release_pos_x']
+    z = means['release_pos_z'] * release.SCALES['release_pos_z']
+    step = np.hypot(x.diff(), z.diff())
+    drift = np.hypot(x - x.iloc[0], z - z.iloc[0])
+
+    assert innings['Inn'].tolist() == means.index.tolist()
+    assert np.isnan(innings['Step(cm)'].iloc[0]) and innings['Drift(cm)'].iloc[0] == 0
+    np.testing.assert_allclose(innings['Step(cm)'].iloc[1:], step.iloc[1:].round(1), atol=0.051)
+    np.testing.assert_allclose(innings['Drift(cm)'], drift.round(1), atol=0.051)
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from dashboard.search import PlayerIndex
+
+
+@pytest.fixture(scope='module')
+def index():
+    players = pd.DataFrame({
+        'player_id': [1, 2, 3],
+        'player_name': ['Rodriguez, Eduardo', 'Rodón, Carlos', 'Acuña Jr., Ronald'],
+        'team': ['ARI', 'NYY', 'ATL'],
+        'role': ['pitcher', 'pitcher', 'batter'],
+    })
+    return PlayerIndex(players)
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('rod', {1, 2}),
+    ('rodrigu', {1}),
+    ('rodriguez', {1}),
+    ('eduardo rodriguez', {1}),
+    ('acuna', {3}),
+    ('ronal', {3}),
+    ('rodriguex', set()),
+    ('2', {2}),
+])
+def test_prefix_queries(index, query, expected):
+    assert {r['player_id'] for r in index.search(query)} == expected
+
+
+def test_role_filter(index):
+    assert index.search('acuna', role='pitcher') == []
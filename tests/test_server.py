@@ -0,0 +1,57 @@
+import json
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from conftest import SEASON
+
+
+def get(url):
+    try:
+        with urlopen(url, timeout=10) as response:
+            return response.status, response.read()
+    except HTTPError as e:
+        return e.code, e.read()
+
+
+def test_query_ok(server, data_dir):
+    from dashboard.store import scan
+
+    _, base = server
+    pitcher = int(scan(data_dir, SEASON, columns=['pitcher'])['pitcher'].iloc[0])
+    status, body = get(f'{base}/pitchers/{pitcher}/games?season={SEASON}')
+    assert status == 200
+    assert json.loads(body)
+
+
+@pytest.mark.parametrize('error, status', [(ValueError('bad date'), 400), (KeyError('team'), 400), (RuntimeError('boom'), 500)])
+def test_query_errors_return_json_status(server, monkeypatch, error, status):
+    service, base = server
+
+    def fail(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(service, 'respond', fail)
+    code, body = get(f'{base}/teams/PHI/pitchers?season={SEASON}')
+    assert code == status
+    assert 'error' in json.loads(body)
+
+
+def test_export_streams_filtered_rows(server, data_dir):
+    from dashboard.store import scan
+
+    _, base = server
+    row = scan(data_dir, SEASON, columns=['pitcher', 'game_date']).iloc[0]
+    date = row['game_date'].strftime('%Y-%m-%d')
+    status, body = get(f'{base}/export/pitch_details?season={SEASON}&pitcher={row["pitcher"]}&date={date}')
+    assert status == 200
+    assert len(body.decode().splitlines()) > 1
+
+
+@pytest.mark.parametrize('query', ['date=garbage', 'date=2025-13-40', 'inning=abc', 'color=red'])
+def test_export_rejects_bad_filters_before_streaming(server, query):
+    _, base = server
+    status, body = get(f'{base}/export/pitch_details?season={SEASON}&{query}')
+    assert status == 400
+    assert 'error' in json.loads(body)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from synthetic_season import make_season
+
+from dashboard.similarity import INDEX_COLUMNS, NEIGHBOR_COLUMNS, SimilarityIndex, refresh_index
+from dashboard.store import ingest_frame, read_manifest, scan
+
+from conftest import SEASON
+
+
+def test_neighbors_exclude_query_pitch(data_dir):
+    pitches = scan(data_dir, SEASON, columns=INDEX_COLUMNS)
+    index = SimilarityIndex.from_pitches(pitches, 'v1', min_pitches=5)
+    pitcher, pitch_name = index.keys[0]
+
+    neighbors = index.neighbors(pitcher, pitch_name, k=5, same_type=True)
+    assert list(neighbors.columns) == NEIGHBOR_COLUMNS
+    assert 0 < len(neighbors) <= 5
+    assert (neighbors['Type'] == pitch_name).all()
+    assert neighbors['Distance'].is_monotonic_increasing
+
+
+def test_empty_season(data_dir):
+    pitches = scan(data_dir, SEASON, columns=INDEX_COLUMNS).iloc[:0]
+    index = SimilarityIndex.from_pitches(pitches)
+    assert index.pitch_types(1) == []
+
+
+def test_incremental_update_matches_full_rebuild(tmp_path):
+    data_dir = str(tmp_path)
+    raw = make_season(40, SEASON, seed=6, games_per_day=4)
+    ingest_frame(raw, SEASON, data_dir)
+    manifest = read_manifest(data_dir, SEASON)
+
+    def read(dates):
+        return scan(data_dir, SEASON, columns=INDEX_COLUMNS, dates=dates)
+
+    before = refresh_index(None, manifest['version'], manifest['partitions'], read)
+
+    # 한 경기 취소, 한 경기 구속 정정, 새 날짜 추가
+    dates = sorted(raw['game_date'].unique())
+    dropped = raw.loc[raw['game_date'] == dates[0], 'game_pk'].iloc[0]
+    corrected = raw.loc[raw['game_date'] == dates[3], 'game_pk'].iloc[0]
+    extra = make_season(4, SEASON, seed=7, games_per_day=4)
+    extra = extra.assign(game_date=pd.Timestamp(dates[-1]) + pd.Timedelta(days=1), game_pk=extra['game_pk'] + 1000)
+    changed = pd.concat([raw[raw['game_pk'] != dropped], extra], ignore_index=True)
+    fix = changed['game_pk'] == corrected
+    changed.loc[fix, 'release_speed'] += 3
+    ingest_frame(changed, SEASON, data_dir)
+    manifest = read_manifest(data_dir, SEASON)
+
+    assert len(before.changed_dates(manifest['partitions'])) == 3
+    incremental = refresh_index(before, manifest['version'], manifest['partitions'], read)
+    full = SimilarityIndex.from_pitches(read(None), manifest['version'], manifest['partitions'])
+
+    assert incremental.version == manifest['version']
+    assert incremental.keys == full.keys
+    np.testing.assert_allclose(incremental.vectors, full.vectors)
+    pd.testing.assert_frame_equal(incremental.players, full.players)
+    # 이전 인덱스는 그대로 (다른 세션이 계속 쓸 수 있다)
+    assert before.version != incremental.version and len(before.partitions) != len(incremental.partitions)
+
+
+def test_refresh_without_partition_hashes_rebuilds(data_dir):
+    calls = []
+
+    def read(dates):
+        calls.append(dates)
+        return scan(data_dir, SEASON, columns=INDEX_COLUMNS)
+
+    previous = refresh_index(None, 'v1', {}, read)
+    refresh_index(previous, 'v2', {}, read)
+    assert calls == [None, None]
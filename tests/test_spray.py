@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import spray
+
+
+def test_field_coordinates():
+    x, y = spray.field_coordinates([spray.HOME_X, spray.HOME_X, spray.HOME_X + 40], [spray.HOME_Y, spray.HOME_Y - 100, spray.HOME_Y])
+    np.testing.assert_allclose(x, [0, 0, 40 * spray.HC_TO_FT])
+    np.testing.assert_allclose(y, [0, 100 * spray.HC_TO_FT, 0])
+
+
+def ball(angle, distance, launch_angle, launch_speed, events='field_out'):
+    # 중견수 방향 0°, 우측 + 인 필드 좌표 -> Statcast hc_x / hc_y
+    x = distance * np.sin(np.radians(angle))
+    y = distance * np.cos(np.radians(angle))
+    return {
+        'type': 'X', 'hc_x': spray.HOME_X + x / spray.HC_TO_FT, 'hc_y': spray.HOME_Y - y / spray.HC_TO_FT,
+        'launch_angle': launch_angle, 'launch_speed': launch_speed, 'events': events,
+        'estimated_ba_using_speedangle': 0.3, 'batter': 1, 'batting_team': 'PHI', 'game_pk': 1,
+        'game_date': pd.Timestamp('2025-04-01'),
+    }
+
+
+@pytest.fixture
+def balls():
+    return pd.DataFrame([
+        ball(-40, 100, 5, 70),           # LF Infield, GB, <129
+        ball(0, 300, 30, 100, 'double'),  # CF Deep, FB, 153-169
+        ball(40, 400, 20, 110, 'home_run'),  # RF Wall, LD, 169+
+        ball(10, 200, np.nan, np.nan),  # RC Shallow, 발사각 / 타구속도 없음
+        ball(-10, 200, 12, np.nan),     # LC Shallow, 타구속도만 없음
+    ])
+
+
+def test_sector_band_and_buckets(balls):
+    binned = spray.batted_balls(balls)
+    assert [spray.SECTORS[i] for i in binned['sector']] == ['LF', 'CF', 'RF', 'RC', 'LC']
+    assert [spray.BANDS[i] for i in binned['band']] == ['Infield', 'Deep', 'Wall', 'Shallow', 'Shallow']
+    assert binned['la_bucket'].tolist() == [0, 2, 1, spray.MISSING_BUCKET, 1]
+    assert binned['ev_bucket'].tolist() == [0, 2, 3, spray.MISSING_BUCKET, spray.MISSING_BUCKET]
+
+
+def test_missing_launch_data_left_out_of_bucket_table(balls):
+    partials = spray.spray_partials(balls)
+    # 구역 합계에는 모든 타구
+    assert spray.sector_bins(partials)['batted_balls'].sum() == len(balls)
+    table = spray.bucket_table(partials)
+    assert table.to_numpy().sum() == 3
+    assert table.loc['GB (<10°)', 'EV <129'] == 1
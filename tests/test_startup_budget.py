@@ -0,0 +1,9 @@
+import pytest
+import startup_budget
+
+
+@pytest.mark.parametrize('entry_point', startup_budget.ENTRY_POINTS)
+def test_first_screen_import_budget(entry_point):
+    report = startup_budget.profile(entry_point)
+    assert report['heavy'] == []
+    assert report['total_ms'] < startup_budget.DEFAULT_BUDGET_MS
@@ -0,0 +1,104 @@
+# 쿼리 백엔드 동등성 점검 (pandas 기준 구현 vs duckdb / polars)
+#
+#   python tools/backend_equivalence.py --season 2025 --samples 30
+#   python -m pytest tests/test_backends.py          # 합성 시즌으로 같은 비교
+#
+# 임의로 고른 팀 / 투수 / 경기에 대해 같은 페이지 쿼리를 각 백엔드로 실행하고
+# 결과가 다르면 내용을 출력한 뒤 exit 1. 설치되지 않은 백엔드는 건너뛴다.
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.backends import BACKENDS  # noqa: E402
+from dashboard.seasons import DEFAULT_SEASON  # noqa: E402
+from dashboard.store import DATA_DIR  # noqa: E402
+
+DETAIL_CHECK_COLUMNS = [
+    'game_pk', 'at_bat_number', 'pitch_number', 'batter', 'pitch_name',
+    'release_speed', 'plate_x', 'plate_z', 'description',
+]
+
+
+def frames_equal(expected, actual):
+    try:
+        pd.testing.assert_frame_equal(
+            expected.reset_index(), actual.reset_index(),
+            check_dtype=False, check_index_type=False, check_exact=False, atol=0.11,
+        )
+    except AssertionError as e:
+        return str(e)
+    return None
+
+
+def sample_cases(reference, samples, seed):
+    rng = np.random.default_rng(seed)
+    teams = reference.store.df['pitching_team'].dropna().unique()
+    cases = []
+    for team in rng.choice(teams, size=min(samples, len(teams)), replace=False):
+        pitchers = reference.team_pitchers(team)
+        pitcher = int(pitchers['pitcher'].iloc[rng.integers(len(pitchers))])
+        games = reference.pitcher_games(pitcher, team)
+        game_date = games['game_date'].iloc[rng.integers(len(games))]
+        cases.append((str(team), pitcher, game_date))
+    return cases
+
+
+def run_queries(backend, team, pitcher, game_date):
+    details = backend.pitch_details(pitcher, game_date, team)
+    return {
+        'team_pitchers': backend.team_pitchers(team),
+        'pitcher_games': backend.pitcher_games(pitcher, team),
+        'pitch_summary': backend.pitch_summary(pitcher, game_date, team),
+        'matchup_summary': backend.matchup_summary(pitcher, game_date, team),
+        'pitch_details': details[DETAIL_CHECK_COLUMNS],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check query backends against the pandas reference')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--season', type=int, default=DEFAULT_SEASON)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    reference = BACKENDS['pandas'](args.data_dir, args.season)
+    cases = sample_cases(reference, args.samples, args.seed)
+
+    failures = 0
+    for name, backend_cls in BACKENDS.items():
+        if name == 'pandas':
+            continue
+        try:
+            backend = backend_cls(args.data_dir, args.season)
+        except ImportError as e:
+            print(f'⏭️  {name}: 건너뜀 ({e})')
+            continue
+
+        started = time.perf_counter()
+        mismatches = 0
+        for team, pitcher, game_date in cases:
+            expected = run_queries(reference, team, pitcher, game_date)
+            actual = run_queries(backend, team, pitcher, game_date)
+            for query, frame in expected.items():
+                diff = frames_equal(frame, actual[query])
+                if diff:
+                    mismatches += 1
+                    print(f'❌ {name} {query} team={team} pitcher={pitcher} date={game_date:%Y-%m-%d}\n{diff}\n')
+        elapsed = time.perf_counter() - started
+        status = '✅' if not mismatches else '❌'
+        print(f'{status} {name}: {len(cases)} cases x {len(expected)} queries, {mismatches} mismatches ({elapsed:.2f}s)')
+        failures += mismatches
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# 라이브 모드 테스트용 투구 피드 (저장된 경기를 실시간처럼 재생)
+#
+#   python tools/live_feed.py --game-pk 745001 --rate 2 --out /tmp/feed.csv     # 파일 뒤에 행 추가
+#   python tools/live_feed.py --game-pk 745001 --rate 2 --port 8765             # GET /feed?game_pk=<game_pk>&since=<pitch_key>
+#
+# 대시보드는 LIVE_FEED=/tmp/feed.csv 또는 LIVE_FEED=http://127.0.0.1:8765/feed 로 live_game.py 를 실행.
+
+import argparse
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.seasons import DEFAULT_SEASON  # noqa: E402
+from dashboard.store import DATA_DIR, PitchStore, pitch_key  # noqa: E402
+
+
+def game_pitches(data_dir, season, game_pk):
+    pitch_store = PitchStore.open(data_dir, season)
+    game = pitch_store.game_rows(game_pk)
+    if game.empty:
+        raise SystemExit(f'{season} 시즌에 game_pk={game_pk} 경기가 없습니다.')
+    # 피드는 원본 Statcast 형식: 저장소에서 계산해 둔 열은 빼고 보낸다
+    return game.reset_index(drop=True).drop(columns=['pitching_team', 'batting_team'], errors='ignore')
+
+
+def replay_to_file(game, path, rate, batch):
+    game.iloc[:0].to_csv(path, index=False)
+    for start in range(0, len(game), batch):
+        game.iloc[start:start + batch].to_csv(path, mode='a', header=False, index=False)
+        print(f'{min(start + batch, len(game))}/{len(game)} pitches', flush=True)
+        time.sleep(batch / rate)
+
+
+def serve(game, host, port, rate):
+    started = time.monotonic()
+    keys = pitch_key(game).to_numpy()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/feed':
+                self.send_error(404)
+                return
+            query = parse_qs(url.query)
+            since = query.get('since', [None])[0]
+            game_pk = query.get('game_pk', [None])[0]
+            # 경과 시간만큼만 "던져진" 투구
+            thrown = game.iloc[:int((time.monotonic() - started) * rate)]
+            if since is not None:
+                thrown = thrown[keys[:len(thrown)] > int(since)]
+            if game_pk is not None:
+                thrown = thrown[thrown['game_pk'] == int(game_pk)]
+            body = thrown.to_json(orient='records', date_format='iso').encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    print(f'🔴 replaying {len(game)} pitches at http://{host}:{port}/feed ({rate}/s)')
+    ThreadingHTTPServer((host, port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a stored game as a live pitch feed')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--season', type=int, default=DEFAULT_SEASON)
+    parser.add_argument('--game-pk', type=int, required=True)
+    parser.add_argument('--rate', type=float, default=1.0, help='초당 투구 수')
+    parser.add_argument('--batch', type=int, default=1, help='파일 모드에서 한 번에 추가할 행 수')
+    parser.add_argument('--out', help='이 파일(CSV / .jsonl 아님)에 행을 추가')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    game = game_pitches(args.data_dir, args.season, args.game_pk)
+    if args.out:
+        replay_to_file(game, args.out, args.rate, args.batch)
+    else:
+        serve(game, args.host, args.port, args.rate)
+
+
+if __name__ == '__main__':
+    main()
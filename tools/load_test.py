@@ -0,0 +1,176 @@
+# Streamlit 페이지 동시 세션 부하 테스트 (AppTest 로 headless 실행)
+#
+#   python tools/load_test.py                                   # 합성 데이터, 기본 설정
+#   python tools/load_test.py --pages pitchinfo.py --sessions 1,8,32 --iterations 3
+#   python tools/load_test.py --data-dir data --max-p95-ms 800   # p95 가 넘으면 exit 1
+#
+# 세션마다 division -> team -> player -> date -> matchup 선택을 무작위로 진행하고 rerun 시간을 잰다.
+# 설정(페이지 x 동시 세션 수)마다 새 프로세스에서 실행하므로 peak RSS 가 설정별 값이다.
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 페이지별 selectbox 선택 순서 (label 기준)
+CASCADES = {
+    'pitchinfo.py': ['Division', 'Team', 'Pitcher', 'Date', 'Batter', 'Inning'],
+    'batter_game_info.py': ['Division', 'Team', 'Batter', 'Date', 'Description'],
+    'game_info.py': ['Division', 'Team', 'Game'],
+}
+
+# ------------------------------
+# 🏃 Worker (한 설정 = 한 프로세스)
+# ------------------------------
+
+def peak_rss_mb():
+    # ru_maxrss 는 exec 후에도 부모(합성 데이터 생성) 값이 남으므로 가능하면 VmHWM 을 쓴다
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run_session(page, iterations, seed, latencies, errors):
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(seed)
+    for _ in range(iterations):
+        at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=120)
+        steps = [None] + CASCADES[page]
+        for label in steps:
+            if label is not None:
+                boxes = [box for box in at.selectbox if box.label == label]
+                if not boxes:
+                    # 앞 단계에서 데이터가 없어 멈춘 경우
+                    break
+                options = boxes[0].options
+                start = 1 if options and str(options[0]).startswith('—') else 0
+                if start >= len(options):
+                    break
+                boxes[0].select_index(int(rng.integers(start, len(options))))
+            started = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - started)
+            if at.exception:
+                errors.append(f'{page} {label}: {at.exception[0].message}')
+                break
+
+
+def worker(page, sessions, iterations, seed, warmup=True):
+    # 워밍업: 캐시(cache_resource / figure 캐시)가 빈 첫 cascade 는 따로 재고 통계에서 뺀다
+    cold = []
+    if warmup:
+        run_session(page, 1, seed + sessions, cold, [])
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=run_session, args=(page, iterations, seed + i, latencies, errors))
+        for i in range(sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ms = np.array(latencies) * 1000
+    return {
+        'page': page,
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'cold_s': round(sum(cold), 2) if cold else None,
+        'elapsed_s': round(elapsed, 2),
+        'throughput': round(len(latencies) / elapsed, 2) if elapsed else 0,
+        'p50_ms': round(float(np.percentile(ms, 50)), 1) if len(ms) else None,
+        'p95_ms': round(float(np.percentile(ms, 95)), 1) if len(ms) else None,
+        'p99_ms': round(float(np.percentile(ms, 99)), 1) if len(ms) else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+# ------------------------------
+# 📋 Driver
+# ------------------------------
+
+def run_config(page, sessions, iterations, seed, data_dir, warmup=True):
+    env = dict(os.environ, PITCH_DATA_DIR=data_dir)
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', page,
+         '--sessions', str(sessions), '--iterations', str(iterations), '--seed', str(seed)]
+        + ([] if warmup else ['--no-warmup']),
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f'{page} x {sessions}: worker 실패\n{result.stderr[-2000:]}')
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent-session load test for the Streamlit pages')
+    parser.add_argument('--pages', default=','.join(CASCADES), help='쉼표로 구분한 페이지 목록')
+    parser.add_argument('--sessions', default='1,4,16', help='동시 세션 수 목록')
+    parser.add_argument('--iterations', type=int, default=2, help='세션당 cascade 반복 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='기존 저장소 (없으면 합성 시즌을 임시 디렉터리에 생성)')
+    parser.add_argument('--games', type=int, default=600, help='합성 시즌 경기 수')
+    parser.add_argument('--max-p95-ms', type=float, help='어떤 설정이라도 p95 가 넘으면 exit 1')
+    parser.add_argument('--no-warmup', action='store_true', help='캐시가 빈 상태의 rerun 도 통계에 포함')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, int(args.sessions), args.iterations, args.seed, not args.no_warmup)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        if data_dir is None:
+            from synthetic_season import build_store
+
+            data_dir = tmp
+            started = time.perf_counter()
+            build_store(data_dir, args.games)
+            print(f'🧪 synthetic season: {args.games} games ({time.perf_counter() - started:.1f}s)')
+
+        results = []
+        print(f"{'page':<22}{'sessions':>9}{'reruns':>8}{'err':>5}{'rerun/s':>9}{'p50':>8}{'p95':>8}{'p99':>8}{'RSS MB':>8}{'cold s':>8}")
+        for page in args.pages.split(','):
+            for sessions in [int(s) for s in args.sessions.split(',')]:
+                r = run_config(page, sessions, args.iterations, args.seed, data_dir, not args.no_warmup)
+                results.append(r)
+                print(f"{page:<22}{sessions:>9}{r['reruns']:>8}{r['errors']:>5}{r['throughput']:>9}"
+                      f"{r['p50_ms']:>8}{r['p95_ms']:>8}{r['p99_ms']:>8}{r['peak_rss_mb']:>8}{r['cold_s'] or '-':>8}")
+                if r['first_error']:
+                    print(f"    ❌ {r['first_error']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = any(r['errors'] for r in results)
+    if args.max_p95_ms is not None:
+        failed = failed or any(r['p95_ms'] is not None and r['p95_ms'] > args.max_p95_ms for r in results)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# 대시보드 진입점 cold-start import 시간 점검
+#
+#   python tools/startup_budget.py              # 리포트 + 예산 초과 시 exit 1
+#   python tools/startup_budget.py --budget 1500 --top 15
+#   python -m pytest tests/test_startup_budget.py   # 같은 검사 (진입점별 예산 / 무거운 모듈)
+#
+# 각 진입점에서 첫 번째 st.stop() 이전에 실행되는 import 문만 새 인터프리터에서
+# `python -X importtime` 으로 실행해, "— Select Division —" 에서 멈추는 경로의 비용을 잰다.
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    'pitchinfo.py',
+    'batter_game_info.py',
+    'game_info.py',
+    'live_game.py',
+    'cache_admin.py',
+    'pitch_information(daily).py',
+    'pitch_information(daily_mobile).py',
+]
+
+# 첫 화면에서 로드되면 안 되는 모듈
+# (plotly.graph_objects 는 streamlit 자체가 테마 등록을 위해 불러오므로 제외)
+HEAVY_MODULES = ['pybaseball', 'gdown', 'requests', 'matplotlib', 'scipy']
+
+DEFAULT_BUDGET_MS = 1500
+
+
+def _is_st_stop(node):
+    return (
+        isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+        and isinstance(node.value.func, ast.Attribute) and node.value.func.attr == 'stop'
+    )
+
+
+def first_screen_imports(path):
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    stop_line = min(
+        (node.lineno for node in ast.walk(tree) if _is_st_stop(node)),
+        default=float('inf'),
+    )
+    return [
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and node.lineno < stop_line
+    ]
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # 패키지 이름 앞의 공백 수가 중첩 깊이 (최상위 import = 1)
+        depth = (len(name) - len(name.lstrip()) + 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def profile(entry_point):
+    imports = first_screen_imports(os.path.join(ROOT, entry_point))
+    code = '\n'.join(imports + [
+        'import json, sys',
+        f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))',
+    ])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'{entry_point}: import 실패\n{result.stderr[-2000:]}')
+
+    modules = parse_importtime(result.stderr)
+    total_ms = sum(cumulative for _, _, cumulative, depth in modules if depth == 1) / 1000
+    top = sorted((m for m in modules if m[3] == 1), key=lambda m: m[2], reverse=True)
+    heavy = json.loads(result.stdout.strip().splitlines()[-1])
+    return {'entry_point': entry_point, 'imports': imports, 'total_ms': total_ms, 'top': top, 'heavy': heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start import time report for the dashboard entry points')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS, help='진입점별 import 시간 예산 (ms)')
+    parser.add_argument('--top', type=int, default=10, help='리포트에 표시할 상위 패키지 수')
+    parser.add_argument('entry_points', nargs='*', default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    failed = False
+    for entry_point in args.entry_points:
+        report = profile(entry_point)
+        over = report['total_ms'] > args.budget
+        status = '❌' if over or report['heavy'] else '✅'
+        print(f"{status} {entry_point}: {report['total_ms']:.0f} ms (budget {args.budget:.0f} ms)")
+        for name, _, cumulative, _ in report['top'][:args.top]:
+            print(f'    {cumulative / 1000:8.1f} ms  {name}')
+        if report['heavy']:
+            print(f"    첫 화면에서 무거운 모듈 로드: {', '.join(report['heavy'])}")
+        failed = failed or over or bool(report['heavy'])
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
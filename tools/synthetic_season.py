@@ -0,0 +1,138 @@
+# 합성 Statcast 시즌 데이터 (부하 테스트 / 백엔드 점검용)
+#
+#   python tools/synthetic_season.py --data-dir /tmp/synthetic --games 600
+#   python tools/synthetic_season.py --csv synthetic.csv --games 300
+#
+# 실제 팀 / Division 구성과 Batter_ID 파일의 타자 ID 를 사용하고, 나머지 값은 난수.
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.seasons import DEFAULT_SEASON, season_config  # noqa: E402
+from dashboard.store import DATA_DIR, ingest_frame  # noqa: E402
+
+PITCH_TYPES = {
+    '4-Seam Fastball': 'FF', 'Sinker': 'SI', 'Slider': 'SL', 'Changeup': 'CH',
+    'Curveball': 'CU', 'Sweeper': 'ST', 'Cutter': 'FC',
+}
+DESCRIPTIONS = ['ball', 'called_strike', 'swinging_strike', 'foul', 'blocked_ball']
+EVENTS = ['single', 'field_out', 'double', 'home_run', 'grounded_into_double_play', 'triple']
+PITCHERS_PER_TEAM = 13
+BATTERS_PER_TEAM = 13
+AT_BATS_PER_HALF = 4
+
+
+def make_season(games=300, season=DEFAULT_SEASON, seed=0, games_per_day=15):
+    rng = np.random.default_rng(seed)
+    config = season_config(season)
+    teams = np.array([team for division in config['divisions'].values() for team in division])
+
+    batter_ids = None
+    if config['batter_id_file'] and os.path.exists(config['batter_id_file']):
+        batter_ids = pd.read_excel(config['batter_id_file'])['batter'].to_numpy()
+    if batter_ids is None or len(batter_ids) < len(teams) * BATTERS_PER_TEAM:
+        batter_ids = 500000 + np.arange(len(teams) * BATTERS_PER_TEAM)
+    pitcher_ids = 600000 + np.arange(len(teams) * PITCHERS_PER_TEAM)
+
+    # 경기 -> 이닝 반쪽 -> 타석 순으로 펼친 타석 테이블
+    matchups = np.array([rng.choice(len(teams), 2, replace=False) for _ in range(games)])
+    halves = 18
+    at_bats = games * halves * AT_BATS_PER_HALF
+    game = np.repeat(np.arange(games), halves * AT_BATS_PER_HALF)
+    half = np.tile(np.repeat(np.arange(halves), AT_BATS_PER_HALF), games)
+    inning = half // 2 + 1
+    top = half % 2 == 0
+    home, away = matchups[game, 0], matchups[game, 1]
+    pitching = np.where(top, home, away)
+    batting = np.where(top, away, home)
+    at_bat_number = np.tile(np.arange(1, halves * AT_BATS_PER_HALF + 1), games)
+    pitcher = pitcher_ids[pitching * PITCHERS_PER_TEAM + np.minimum(inning // 3, PITCHERS_PER_TEAM - 1)]
+    batter = batter_ids[batting * BATTERS_PER_TEAM + at_bat_number % BATTERS_PER_TEAM]
+
+    # 타석당 1~6 구
+    per_at_bat = rng.integers(1, 7, at_bats)
+    rows = np.repeat(np.arange(at_bats), per_at_bat)
+    n = len(rows)
+    pitch_number = np.arange(n) - np.repeat(np.cumsum(per_at_bat) - per_at_bat, per_at_bat) + 1
+    # 마지막 공에서만 인플레이가 나온다
+    last = pitch_number == per_at_bat[rows]
+    in_play = last & (rng.random(n) < 0.6)
+
+    dates = pd.Timestamp(f'{int(season)}-04-01') + pd.to_timedelta(game[rows] // games_per_day, unit='D')
+    pitch_name = rng.choice(list(PITCH_TYPES), n)
+
+    def batted(values):
+        return np.where(in_play, values, np.nan)
+
+    return pd.DataFrame({
+        'game_type': 'R',
+        'game_date': dates.strftime('%Y-%m-%d'),
+        'game_pk': 770000 + game[rows],
+        'home_team': teams[home[rows]],
+        'away_team': teams[away[rows]],
+        'inning_topbot': np.where(top[rows], 'Top', 'Bot'),
+        'inning': inning[rows],
+        'at_bat_number': at_bat_number[rows],
+        'pitch_number': pitch_number,
+        'player_name': np.char.add(np.char.add('P', pitcher[rows].astype(str)), ', X'),
+        'pitcher': pitcher[rows],
+        'batter': batter[rows],
+        'stand': rng.choice(['R', 'L'], n),
+        'p_throws': 'R',
+        'pitch_name': pitch_name,
+        'pitch_type': pd.Series(pitch_name).map(PITCH_TYPES).to_numpy(),
+        'release_speed': rng.normal(92, 3, n),
+        'release_spin_rate': rng.normal(2300, 150, n),
+        'pfx_x': rng.normal(-0.5, 0.4, n),
+        'pfx_z': rng.normal(1.0, 0.4, n),
+        'spin_axis': rng.normal(200, 20, n),
+        'release_pos_x': rng.normal(-2, 0.1, n),
+        'release_pos_z': rng.normal(5.8, 0.1, n),
+        'release_extension': rng.normal(6.3, 0.2, n),
+        'plate_x': rng.normal(0, 0.8, n),
+        'plate_z': rng.normal(2.4, 0.8, n),
+        'zone': rng.integers(1, 15, n),
+        'description': np.where(in_play, 'hit_into_play', rng.choice(DESCRIPTIONS, n)),
+        'events': np.where(in_play, rng.choice(EVENTS, n), None),
+        'type': np.where(in_play, 'X', rng.choice(['B', 'S'], n)),
+        'balls': np.minimum(pitch_number - 1, 3),
+        'strikes': np.minimum(pitch_number - 1, 2),
+        'outs_when_up': (at_bat_number[rows] - 1) % 3,
+        'launch_speed': batted(rng.normal(90, 10, n)),
+        'launch_angle': batted(rng.normal(12, 20, n)),
+        'estimated_ba_using_speedangle': batted(rng.random(n)),
+        'hc_x': batted(rng.normal(125, 40, n)),
+        'hc_y': batted(rng.normal(120, 40, n)),
+        'bb_type': np.where(in_play, rng.choice(['ground_ball', 'line_drive', 'fly_ball'], n), None),
+    })
+
+
+def build_store(data_dir, games=300, season=DEFAULT_SEASON, seed=0):
+    return ingest_frame(make_season(games, season, seed), int(season), data_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Statcast season')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='이 저장소에 바로 적재')
+    parser.add_argument('--csv', help='적재 대신 CSV 로 저장')
+    parser.add_argument('--season', type=int, default=DEFAULT_SEASON)
+    parser.add_argument('--games', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.csv:
+        df = make_season(args.games, args.season, args.seed)
+        df.to_csv(args.csv, index=False)
+        print(f'✅ {args.csv}: {len(df)} pitches')
+    else:
+        print(f'✅ {build_store(args.data_dir, args.games, args.season, args.seed)}')
+
+
+if __name__ == '__main__':
+    main()